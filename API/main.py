@@ -2,11 +2,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_utils.tasks import repeat_every
 
-from app.utils.cache import product_cache
 from app.routes.products import router as product_router
 from app.routes.recommend import router as recommend_router
-from app.routes.search import router as search_router, load_products  # 🔥 여기에 load_products 가져오기
+from app.routes.search import router as search_router, load_products, refresh_products  # 🔥 여기에 load_products 가져오기
 from app.routes.categorical import router as categorical_router
+from app.utils.refresh import REFRESH_SECONDS
 
 import os
 
@@ -31,7 +31,16 @@ def startup_event():
     load_products()
     print("🚀 [Startup] load_products() 호출 완료")
 
+# 🔁 metadata 변경 감지 → 증분 갱신 (첫 실행은 한 주기 뒤)
+if REFRESH_SECONDS > 0:
+    @app.on_event("startup")
+    @repeat_every(seconds=REFRESH_SECONDS, wait_first=REFRESH_SECONDS)
+    def refresh_event():
+        refresh_products()
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 10000))
-    uvicorn.run("main:app", host="0.0.0.0", port=port)
\ No newline at end of file
+    # WEB_CONCURRENCY > 1 이면 다중 워커 (PRODUCT_SNAPSHOT_DIR 설정 시 제품 저장소를 mmap 스냅샷으로 공유)
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    uvicorn.run("main:app", host="0.0.0.0", port=port, workers=workers)
\ No newline at end of file
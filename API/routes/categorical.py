@@ -1,6 +1,11 @@
-from fastapi import APIRouter, Query
+import numpy as np
+from fastapi import APIRouter, Query, Request
 from fastapi.responses import JSONResponse
-from app.utils.cache import product_cache
+from app.utils.indexes import current_indexes
+from app.utils.category_index import CursorExpired, encode_cursor, decode_cursor
+from app.utils.snapshot import parse_version
+from app.utils.projection import resolve_view
+from app.utils.response_cache import response_cache, dumps, join_rows, json_bytes_response, wants_ndjson, ndjson_response
 
 # ---------------------------------------------------------------
 # 📌 카테고리별 제품 리스트 API
@@ -39,15 +44,113 @@ router = APIRouter(tags=["Category"])
 
 @router.get("/category")
 def get_products_by_category(
+    request: Request,
     big_category: str = Query(..., description="예: 음료류, 과자류 등"),
-    limit: int = Query(500, ge=1, le=1000, description="최대 반환 개수 (기본: 500)")
+    limit: int = Query(500, ge=1, le=1000, description="최대 반환 개수 (기본: 500)"),
+    offset: int = Query(0, ge=0, description="건너뛸 개수 (기본: 0)"),
+    profile: str | None = Query(None, description="응답 필드 묶음: list(목록용) / detail(전체, 기본)"),
+    fields: str | None = Query(None, description="쉼표로 구분한 반환 필드 (profile 보다 우선)"),
+    stream: bool = Query(False, description="true 면 NDJSON 스트리밍 (Accept: application/x-ndjson 과 동일)")
 ):
-    keyword = big_category.lower()
-    results = [
-        p for p in product_cache
-        if keyword in p.get("big_category", "").lower()
-    ]
-    return JSONResponse(
-        content=results[:limit],
-        media_type="application/json; charset=utf-8"
-    )
\ No newline at end of file
+    current = current_indexes()
+    try:
+        view_key, view = resolve_view(current, profile, fields)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)}, media_type="application/json; charset=utf-8")
+
+    if wants_ndjson(request, stream):
+        rows = current.category_index.rows("big_category", big_category)
+        return ndjson_response(view, rows[offset:offset + limit])
+
+    cache_key = (current.generation, "category", big_category.lower(), limit, offset, view_key)
+    body = response_cache.get(cache_key)
+    if body is None:
+        rows = current.category_index.rows("big_category", big_category)
+        body = join_rows(view, rows[offset:offset + limit])
+        response_cache.put(cache_key, body)
+    return json_bytes_response(body)
+
+# ---------------------------------------------------------------
+# 📌 카테고리 페이지 API
+# 한 페이지는 최대 1,000개로 제한하되, next_cursor 를 따라가면 카테고리 전체를 조회할 수 있습니다.
+# big_category(대분류) 또는 category(소분류) 중 하나 이상을 지정하며, 둘 다 지정하면 교집합입니다.
+#
+# 커서에는 발급 당시의 데이터 버전과 필터가 들어 있습니다.
+# - 다른 필터의 커서: 400
+# - 제품 데이터가 갱신되어 저장소가 교체된 뒤의 커서: 410 (처음 페이지부터 다시 조회)
+# ---------------------------------------------------------------
+
+# 커서에 넣을 데이터 버전 (워커가 달라도 같은 데이터면 같은 값, 기준 시점이 없으면 이 프로세스의 세대)
+def cursor_version(current) -> str:
+    version = parse_version(current.data_version)
+    return version.isoformat() if version is not None else f"generation-{current.generation}"
+
+@router.get("/category/page")
+def get_category_page(
+    big_category: str | None = Query(None, description="예: 음료류, 과자류 등"),
+    category: str | None = Query(None, description="예: 탄산음료, 스낵 등"),
+    limit: int = Query(500, ge=1, le=1000, description="페이지 크기 (기본: 500)"),
+    offset: int = Query(0, ge=0, description="시작 위치 (cursor 가 있으면 무시)"),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor"),
+    profile: str | None = Query(None, description="응답 필드 묶음: list(목록용) / detail(전체, 기본)"),
+    fields: str | None = Query(None, description="쉼표로 구분한 반환 필드 (profile 보다 우선)")
+):
+    if big_category is None and category is None:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "big_category 또는 category 중 하나는 필요합니다"},
+            media_type="application/json; charset=utf-8"
+        )
+
+    current = current_indexes()
+    filters = (
+        big_category.lower() if big_category is not None else None,
+        category.lower() if category is not None else None,
+    )
+    version = cursor_version(current)
+    if cursor is not None:
+        try:
+            offset = decode_cursor(cursor, version, filters)
+        except CursorExpired:
+            return JSONResponse(
+                status_code=410,
+                content={"error": "Cursor expired: product data was updated, restart from the first page"},
+                media_type="application/json; charset=utf-8"
+            )
+        except Exception:
+            return JSONResponse(
+                status_code=400,
+                content={"error": "Invalid cursor"},
+                media_type="application/json; charset=utf-8"
+            )
+
+    try:
+        view_key, view = resolve_view(current, profile, fields)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)}, media_type="application/json; charset=utf-8")
+
+    cache_key = (current.generation, "category_page", *filters, limit, offset, view_key)
+    body = response_cache.get(cache_key)
+    if body is not None:
+        return json_bytes_response(body)
+
+    index = current.category_index
+    rows = None
+    for field, keyword in (("big_category", big_category), ("category", category)):
+        if keyword is not None:
+            matched = index.rows(field, keyword)
+            rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+
+    total = len(rows)
+    page = rows[offset:offset + limit]
+    next_offset = offset + len(page)
+
+    # items 는 미리 직렬화된 제품 조각을 이어 붙이고 나머지 필드만 인코딩
+    meta = dumps({
+        "total": total,
+        "offset": offset,
+        "next_cursor": encode_cursor(next_offset, version, filters) if next_offset < total else None
+    })
+    body = b'{"items":' + join_rows(view, page) + b"," + meta[1:]
+    response_cache.put(cache_key, body)
+    return json_bytes_response(body)
@@ -1,11 +1,15 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 import firebase_admin
 import os
 import json
-from firebase_admin import credentials, firestore, storage
-from fastapi import APIRouter
+from firebase_admin import credentials, firestore_async, storage
 from fastapi.responses import JSONResponse
 
+from app.utils.indexes import current_indexes
+from app.utils.detail_cache import detail_cache
+from app.utils.ttl_cache import MISS
+from app.utils.response_cache import response_cache, dumps, json_bytes_response
+
 router = APIRouter()
 
 # Firebase 환경변수 기반 초기화
@@ -15,18 +19,103 @@ if not firebase_admin._apps:
     cred = credentials.Certificate(key_dict)
     firebase_admin.initialize_app(cred)
 
-db = firestore.client()
+# 비동기 클라이언트: Firestore 왕복 동안 이벤트 루프를 막지 않음
+db = firestore_async.client()
 
-@router.get("/products/{product_id}")
-def get_product_detail(product_id: str):
-    doc = db.collection("products").document(product_id).get()
+# ---------------------------------------------------------------
+# 📌 제품 상세 조회
+# 1) 메모리 저장소 (product_id → 행 번호 인덱스)
+# 2) 없으면 TTL/LRU read-through 캐시 → Firestore
+# /products?ids=... 는 메모리·캐시에 없는 ID 들만 get_all() 한 번으로 조회합니다.
+# ---------------------------------------------------------------
+
+# 캐시 적재 시 추가한 필드 (Firestore 문서에는 없음) / 응답에서 제외할 내부 필드
+DERIVED_FIELDS = ("product_id", "brand_name_kor", "brand_name_eng")
+INTERNAL_FIELDS = ("updated_at",)
+MAX_BULK_IDS = 100
+
+# 메모리 저장소의 행 → Firestore 문서와 같은 형태의 dict
+def to_detail(store, row: int) -> dict:
+    product = store.row(row)
+    for field in DERIVED_FIELDS:
+        product.pop(field, None)
+    return product
+
+def from_firestore(doc):
     if not doc.exists:
+        return None
+    data = doc.to_dict()
+    for field in INTERNAL_FIELDS:
+        data.pop(field, None)
+    return data
+
+@router.get("/products/{product_id}")
+async def get_product_detail(product_id: str):
+    current = current_indexes()
+    row = current.id_to_row.get(product_id)
+    if row is not None:
+        cache_key = (current.generation, "detail", product_id)
+        body = response_cache.get(cache_key)
+        if body is None:
+            body = dumps(to_detail(current.store, row))
+            response_cache.put(cache_key, body)
+        return json_bytes_response(body)
+
+    data = detail_cache.get(product_id)
+    if data is MISS:
+        data = from_firestore(await db.collection("products").document(product_id).get())
+        detail_cache.put(product_id, data)
+
+    if data is None:
         return JSONResponse(
             content={"error": "Product not found"},
             media_type="application/json; charset=utf-8"
         )
 
     return JSONResponse(
-        content=doc.to_dict(),
+        content=data,
         media_type="application/json; charset=utf-8"  # ✅ 인코딩 명시
-    )
\ No newline at end of file
+    )
+
+# 여러 제품 상세 일괄 조회 (ids=product_1,product_2,...)
+@router.get("/products")
+async def get_products_bulk(ids: str = Query(..., description=f"쉼표로 구분한 product_id (최대 {MAX_BULK_IDS}개)")):
+    requested = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if not requested or len(requested) > MAX_BULK_IDS:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"ids 는 1~{MAX_BULK_IDS}개여야 합니다"},
+            media_type="application/json; charset=utf-8"
+        )
+
+    current = current_indexes()
+    found = {}
+    to_fetch = []
+    for product_id in requested:
+        row = current.id_to_row.get(product_id)
+        if row is not None:
+            found[product_id] = to_detail(current.store, row)
+            continue
+        data = detail_cache.get(product_id)
+        if data is MISS:
+            to_fetch.append(product_id)
+        elif data is not None:
+            found[product_id] = data
+
+    # 메모리·캐시에 없는 ID 는 한 번의 get_all 로 조회
+    if to_fetch:
+        col = db.collection("products")
+        fetched = {doc.id: from_firestore(doc) async for doc in db.get_all([col.document(i) for i in to_fetch])}
+        for product_id in to_fetch:
+            data = fetched.get(product_id)
+            detail_cache.put(product_id, data)
+            if data is not None:
+                found[product_id] = data
+
+    return JSONResponse(
+        content={
+            "items": [{"product_id": i, **found[i]} for i in requested if i in found],
+            "missing": [i for i in requested if i not in found]
+        },
+        media_type="application/json; charset=utf-8"
+    )
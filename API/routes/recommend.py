@@ -1,113 +1,83 @@
-import pandas as pd
 from fastapi import APIRouter, Query
 from fastapi.responses import JSONResponse
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from rapidfuzz import fuzz
 
-from app.utils.cache import product_cache
+from app.utils.indexes import current_indexes
+from app.utils.response_cache import response_cache, dumps, join_rows, json_bytes_response
+from app.utils.projection import resolve_view
+from app.utils.compute import run_compute, recommend_rows
 
 router = APIRouter()
 
+# 추천 응답에 포함할 필드
+RECOMMENDED_FIELDS = ("product_id", "manufacturer", "product_name", "image_url")
+
+def to_recommended(store, row: int) -> dict:
+    product = store.row(row, fields=RECOMMENDED_FIELDS)
+    return {k: product.get(k) for k in RECOMMENDED_FIELDS}
+
 @router.get("/recommend/{product_id}")
-def recommend(product_id: str, limit: int = Query(default=4, ge=1, le=10)):
-    if not product_cache:
+async def recommend(
+    product_id: str,
+    limit: int = Query(default=4, ge=1, le=10),
+    profile: str | None = Query(None, description="응답 필드 묶음: list(목록용) / detail(전체), 미지정 시 기존 추천 필드"),
+    fields: str | None = Query(None, description="쉼표로 구분한 반환 필드 (profile 보다 우선)")
+):
+    current = current_indexes()
+    store = current.store
+    if not len(store):
         return JSONResponse(
             status_code=503,
             content={"error": "추천 캐시가 비어 있습니다"},
             media_type="application/json; charset=utf-8"
         )
 
-    df = pd.DataFrame(product_cache)
-    df = df[df["product_id"].notna()]
-    df["product_id"] = df["product_id"].astype(str)
-
-    if product_id not in df["product_id"].values:
+    # profile / fields 미지정 시 기존 추천 필드 (RECOMMENDED_FIELDS)
+    view_key, view = None, None
+    if profile or fields:
+        try:
+            view_key, view = resolve_view(current, profile, fields)
+        except ValueError as e:
+            return JSONResponse(
+                status_code=400,
+                content={"error": str(e)},
+                media_type="application/json; charset=utf-8"
+            )
+
+    cache_key = (current.generation, "recommend", product_id, limit, view_key)
+    body = response_cache.get(cache_key)
+    if body is not None:
+        return json_bytes_response(body)
+
+    model = current.recommend_model
+    if product_id not in model.id_to_row:
         return JSONResponse(
             status_code=404,
             content={"error": "Invalid product ID"},
             media_type="application/json; charset=utf-8"
         )
 
-    base_idx = df.index[df["product_id"] == product_id][0]
-    base_category = df.iloc[base_idx]["category"]
-    base_big_category = df.iloc[base_idx]["big_category"]
-    base_name = df.iloc[base_idx]["product_name"]
-
-    df_filtered = df[df["category"] == base_category].reset_index(drop=True)
-    if len(df_filtered) < 5:
-        df_filtered = df[df["big_category"] == base_big_category].reset_index(drop=True)
-
-    def get_combined(row):
-        rm = row.get("raw_materials", {})
-        return " ".join([
-            row.get("product_name", ""),
-            row.get("category", ""),
-            rm.get("safe", ""),
-            rm.get("caution", ""),
-            rm.get("warning", ""),
-            rm.get("etc", "")
-        ])
-
-    df_filtered["combined"] = df_filtered.apply(get_combined, axis=1)
-
-    vectorizer = TfidfVectorizer()
-    tfidf_matrix = vectorizer.fit_transform(df_filtered["combined"])
-
-    if product_id not in df_filtered["product_id"].values:
+    # 오프라인 추천 테이블이 있으면 배열 조회로 응답
+    table = current.recommend_table
+    if table is not None:
+        recommended_ids = table.lookup(product_id, limit)
+        if recommended_ids is not None and all(pid in model.id_to_row for pid in recommended_ids):
+            rows = [model.id_to_row[pid] for pid in recommended_ids]
+            body = join_rows(view, rows) if view is not None else dumps([to_recommended(store, row) for row in rows])
+            response_cache.put(cache_key, body)
+            return json_bytes_response(body)
+
+    # TF-IDF 점수 계산은 이벤트 루프 밖 (프로세스 풀 또는 스레드 풀) 에서 수행
+    rows = await run_compute(current, recommend_rows, product_id, limit)
+    if rows is None:
         return JSONResponse(
             status_code=404,
             content={"error": "Product not found in filtered set"},
             media_type="application/json; charset=utf-8"
         )
 
-    idx = df_filtered.index[df_filtered["product_id"] == product_id][0]
-    cosine_scores = cosine_similarity(tfidf_matrix[idx], tfidf_matrix).flatten()
-
-    def position_penalty(row):
-        rm = row.get("raw_materials", {})
-        ingredients = rm.get("ingredients_raw", "")
-        warning_list = [w.strip() for w in rm.get("warning", "").split(",") if w.strip()]
-        ingredients_list = [i.strip() for i in ingredients.split(",") if i.strip()]
-        total_len = len(ingredients_list)
-        if total_len == 0:
-            return 0
-        score = 0
-        for warning in warning_list:
-            if warning in ingredients_list:
-                i = ingredients_list.index(warning)
-                ratio = i / total_len
-                if ratio <= 0.5:
-                    score -= 0.5
-                elif ratio >= 0.9:
-                    score += 0.5
-        return score
-
-    top_indices = cosine_scores.argsort()[::-1]
-    top_indices = [i for i in top_indices if i != idx]
-
-    scored_candidates = [
-        (i, cosine_scores[i] + position_penalty(df_filtered.iloc[i]))
-        for i in top_indices
-    ]
-
-    # 1차 필터링: 제품명 유사도
-    primary = []
-    for i, score in scored_candidates[:200]:
-        name = df_filtered.iloc[i]["product_name"]
-        if fuzz.partial_ratio(base_name, name) >= 40:
-            primary.append((i, score))
-
-    # 부족 시 보충
-    selected = set(i for i, _ in primary)
-    if len(primary) < limit:
-        additional = [(i, score) for i, score in scored_candidates if i not in selected][:limit - len(primary)]
-        primary += additional
-
-    final_top = [i for i, _ in sorted(primary, key=lambda x: x[1], reverse=True)[:limit]]
-    recommended = df_filtered.iloc[final_top][["product_id", "manufacturer", "product_name", "image_url"]]
-
-    return JSONResponse(
-        content=recommended.to_dict(orient="records"),
-        media_type="application/json; charset=utf-8"
-    )
+    if view is not None:
+        body = join_rows(view, rows)
+    else:
+        body = dumps([to_recommended(store, row) for row in rows])
+    response_cache.put(cache_key, body)
+    return json_bytes_response(body)
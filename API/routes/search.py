@@ -1,15 +1,24 @@
 import os
 import json
-import re
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
 from fastapi.responses import JSONResponse
 from firebase_admin import credentials, firestore, initialize_app
 from firebase_admin import _apps as firebase_apps
-from rapidfuzz import fuzz
-from jamo import h2j, hangul_to_jamo
-from pympler import asizeof
-from app.utils.cache import product_cache
-from app.utils.brandlabel import brand_label_map_kor_to_eng, brand_label_map_eng_to_kor
+from app.utils.product_store import build_product_store
+from app.utils.indexes import install_product_store, current_indexes
+from app.utils.snapshot import (
+    SNAPSHOT_DIR, read_manifest, is_fresh, load_snapshot, snapshot_path, save_snapshot, parse_version
+)
+from app.utils.workers import snapshot_lock, is_leader
+from app.utils.refresh import is_newer, merge_products
+from app.utils.firestore_loader import load_all_products
+from app.utils.response_cache import response_cache, join_rows, json_bytes_response, wants_ndjson, ndjson_response
+from app.utils.compute import run_compute, search_rows
+from app.utils.projection import resolve_view
+from app.utils.search_memo import search_memo, memo_key
+from app.utils.text import get_clean_text
+from app.utils.brandlabel import brand_label_map_kor_to_eng
+from app.utils.brand_matcher import brand_matcher, search_keywords
 
 # Firebase 초기화
 if not firebase_apps:
@@ -22,44 +31,81 @@ if not firebase_apps:
 db = firestore.client()
 router = APIRouter()
 
-# 문자열 정제 (리스트 및 기타 타입 대응)
-def get_clean_text(text) -> str:
-    if isinstance(text, list):
-        text = " ".join(map(str, text))
-    elif not isinstance(text, str):
-        text = str(text)
-    return re.sub(r"[^\w\s\uAC00-\uD7A3]", "", text).lower().strip()
-
-# 브랜드 확장 키워드
-def expand_brand_keywords(keyword: str) -> list[str]:
-    keyword = get_clean_text(keyword)
-    expanded = {keyword}
-
-    if keyword in brand_label_map_kor_to_eng:
-        eng = brand_label_map_kor_to_eng[keyword]
-        if isinstance(eng, list):
-            expanded.update(get_clean_text(e) for e in eng)
-        else:
-            expanded.add(get_clean_text(eng))
+# Firestore 문서 → 캐시용 제품 dict (제품명에 포함된 가장 긴 브랜드 한글/영문 태깅)
+def to_product(doc) -> dict:
+    data = doc.to_dict()
+    data.pop("updated_at", None)  # 증분 갱신용 수정 시각은 응답에 포함하지 않음
+    product_name = data.get("product_name", "")
+
+    brand_kor = brand_matcher.longest(product_name) or ""
+    brand_eng_raw = brand_label_map_kor_to_eng.get(brand_kor, "")
+
+    if isinstance(brand_eng_raw, list):
+        brand_eng = brand_eng_raw[0]
+    else:
+        brand_eng = brand_eng_raw
+
+    return {
+        **data,
+        "product_id": doc.id,
+        "brand_name_kor": brand_kor,
+        "brand_name_eng": brand_eng
+    }
+
+# 순차 페이지 조회 (ID 구간 분할로 받을 수 없는 문서가 있을 때 사용)
+def page_products(total_count: int) -> list[dict]:
+    products = []
+    page_size = 1000
+    last_doc = None
+
+    while len(products) < total_count:
+        query = db.collection("products").order_by("product_name").limit(page_size)
+        if last_doc:
+            query = query.start_after(last_doc)
 
-    if keyword in brand_label_map_eng_to_kor:
-        expanded.add(get_clean_text(brand_label_map_eng_to_kor[keyword]))
+        docs = query.get()
+        if not docs:
+            break
 
-    return list(expanded)
+        for doc in docs:
+            products.append(to_product(doc))
+
+        last_doc = docs[-1]
+
+    return products
+
+# 저장된 스냅샷을 mmap 으로 열어 교체 (스냅샷이 없거나 읽지 못하면 False)
+def attach_snapshot(manifest: dict) -> bool:
+    store = load_snapshot()
+    if store is None:
+        return False
+    install_product_store(store, manifest.get("data_version"), snapshot_path(), manifest.get("snapshot_id"))
+    return True
 
 # 캐시 적재
 def load_products():
-    global product_cache
     print("📍 load_products() 함수 진입")
 
-    page_size = 1000
-    last_doc = None
-    total_loaded = 0
+    # 다중 워커: leader 만 Firestore 에서 적재하고, 나머지는 leader 가 저장한 스냅샷을 공유
+    with snapshot_lock(SNAPSHOT_DIR):
+        if not is_leader(SNAPSHOT_DIR):
+            manifest = read_manifest()
+            if manifest is not None and attach_snapshot(manifest):
+                return
+            print("⚠️ [워커] 공유 스냅샷 없음 → 직접 적재")
+        fetch_products()
+
+# Firestore 적재 (로컬 스냅샷이 최신이면 스냅샷 사용)
+def fetch_products():
+    products = []
+    last_updated = None
 
     try:
         metadata_doc = db.collection("metadata").document("products_metadata").get()
         if metadata_doc.exists:
-            total_count = metadata_doc.to_dict().get("total_count", 25000)
+            metadata = metadata_doc.to_dict()
+            total_count = metadata.get("total_count", 25000)
+            last_updated = metadata.get("last_updated")
             print(f"ℹ️ 메타데이터 기반 MAX_DOCS: {total_count}")
         else:
             print("⚠️ 메타데이터 문서 없음 → fallback 사용")
@@ -68,121 +114,148 @@ def load_products():
         print(f"❌ 메타데이터 조회 실패 → fallback 사용: {e}")
         total_count = 25000
 
-    try:
-        while total_loaded < total_count:
-            query = db.collection("products").order_by("product_name").limit(page_size)
-            if last_doc:
-                query = query.start_after(last_doc)
-
-            docs = query.get()
-            if not docs:
-                break
+    # 📦 로컬 스냅샷이 최신이면 Firestore 조회 없이 적재
+    manifest = read_manifest()
+    if manifest is not None and is_fresh(manifest, last_updated):
+        store = load_snapshot()
+        if store is not None:
+            install_product_store(
+                store, last_updated or manifest.get("data_version"), snapshot_path(), manifest.get("snapshot_id")
+            )
+            return
+    elif manifest is not None:
+        print(f"ℹ️ [스냅샷] 데이터 갱신됨 ({manifest.get('data_version')} → {last_updated}) → Firestore 재적재")
 
-            for doc in docs:
-                data = doc.to_dict()
-                product_name = data.get("product_name", "")
+    load_failed = False
 
-                brand_kor = next((b for b in brand_label_map_kor_to_eng if b in product_name), "")
-                brand_eng_raw = brand_label_map_kor_to_eng.get(brand_kor, "")
-
-                if isinstance(brand_eng_raw, list):
-                    brand_eng = brand_eng_raw[0]
-                else:
-                    brand_eng = brand_eng_raw
+    try:
+        # product_{i} ID 구간별 병렬 조회 (ID 가 연속되지 않은 경우 → 기존 순차 조회로 전체 적재)
+        products = load_all_products(db, total_count, to_product, page_products)
+        print(f"✅ [제품 캐시] 총 {len(products)}개 적재 완료")
 
-                product_cache.append({
-                    **data,
-                    "product_id": doc.id,
-                    "brand_name_kor": brand_kor,
-                    "brand_name_eng": brand_eng
-                })
+    except Exception as e:
+        print(f"❌ [제품 캐시 오류] {e}")
+        load_failed = True
+
+    # 컬럼형 저장소로 변환 후 파생 인덱스와 함께 교체 (적재된 만큼이라도 검색 가능하도록 실패 시에도 수행)
+    # 적재에 실패했으면 증분 갱신 기준점을 남기지 않아 다음 갱신 때 전체 재적재
+    store = build_product_store(products)
+    indexes = install_product_store(store, None if load_failed else last_updated)
+
+    # 전체 적재에 성공한 경우에만 스냅샷 갱신
+    if not load_failed:
+        snapshot_id = save_snapshot(store, last_updated, indexes=indexes)
+        if snapshot_id:
+            indexes.mark_saved(snapshot_path(), snapshot_id)
+
+# 증분 갱신: metadata.last_updated 가 바뀌었으면 직전 기준 이후 수정된 문서만 조회하여 병합
+def refresh_products():
+    current = current_indexes()
+
+    # leader 가 아니면 Firestore 대신 leader 가 갱신한 스냅샷으로 교체
+    if not is_leader(SNAPSHOT_DIR):
+        with snapshot_lock(SNAPSHOT_DIR, shared=True):
+            manifest = read_manifest()
+            if manifest is not None and is_newer(manifest.get("data_version"), current.data_version):
+                attach_snapshot(manifest)
+        return
 
-                total_loaded += 1
+    try:
+        metadata_doc = db.collection("metadata").document("products_metadata").get()
+    except Exception as e:
+        print(f"❌ [증분 갱신] 메타데이터 조회 실패: {e}")
+        return
+    if not metadata_doc.exists:
+        return
 
-            last_doc = docs[-1]
+    metadata = metadata_doc.to_dict()
+    last_updated = metadata.get("last_updated")
+    if not is_newer(last_updated, current.data_version):
+        return
 
-        print(f"✅ [제품 캐시] 총 {len(product_cache)}개 적재 완료")
+    if current.data_version is None:
+        print("ℹ️ [증분 갱신] 기준 시점 없음 → 전체 재적재")
+        load_products()
+        return
 
+    try:
+        docs = db.collection("products").where("updated_at", ">", parse_version(current.data_version)).stream()
+        changed = [to_product(doc) for doc in docs]
     except Exception as e:
-        print(f"❌ [제품 캐시 오류] {e}")
-
-def jamo_text(text: str) -> str:
-    # 자모 단위로 변환 후 공백 제거
-    return ''.join(list(hangul_to_jamo(text))).replace(' ', '')
-
-def is_jamo_similar(keyword: str, target: str, threshold: int = 80) -> bool:
-    keyword_jamo = jamo_text(keyword)
-    target_jamo = jamo_text(target)
-    return fuzz.ratio(keyword_jamo, target_jamo) >= threshold
+        print(f"❌ [증분 갱신] 변경 문서 조회 실패: {e}")
+        return
+
+    products = merge_products(current.store, changed)
+    total_count = metadata.get("total_count")
+    if total_count is not None and len(products) != total_count:
+        print(f"ℹ️ [증분 갱신] 제품 수 불일치 ({len(products)} ≠ {total_count}) → 전체 재적재")
+        load_products()
+        return
+
+    store = build_product_store(products)
+    indexes = install_product_store(store, last_updated)
+    print(f"✅ [증분 갱신] 변경 {len(changed)}개 반영, 총 {len(store)}개")
+    with snapshot_lock(SNAPSHOT_DIR):
+        snapshot_id = save_snapshot(store, last_updated, indexes=indexes)
+    if snapshot_id:
+        indexes.mark_saved(snapshot_path(), snapshot_id)
 
 @router.get("/search")
-def search_products(keyword: str = Query(..., min_length=1)):
+async def search_products(
+    request: Request,
+    keyword: str = Query(..., min_length=1),
+    limit: int = Query(100, ge=1, le=1000, description="최대 반환 개수 (기본: 100)"),
+    offset: int = Query(0, ge=0, description="건너뛸 개수 (기본: 0)"),
+    profile: str | None = Query(None, description="응답 필드 묶음: list(목록용) / detail(전체, 기본)"),
+    fields: str | None = Query(None, description="쉼표로 구분한 반환 필드 (profile 보다 우선)"),
+    stream: bool = Query(False, description="true 면 NDJSON 스트리밍 (Accept: application/x-ndjson 과 동일)")
+):
     try:
         keyword_clean = get_clean_text(keyword)
-        keywords = expand_brand_keywords(keyword_clean)
-        results = []
-
-        for product in product_cache:
-            product_name = get_clean_text(product.get("product_name", ""))
-            brand_kor = get_clean_text(product.get("brand_name_kor", ""))
-            brand_eng = get_clean_text(product.get("brand_name_eng", ""))
-            manufacturer = get_clean_text(product.get("manufacturer", ""))
-
-            # 1단계: 정확 일치 (브랜드 한글/영어, 제조사 포함)
-            if any(k == brand_kor or k == brand_eng or k == manufacturer for k in keywords):
-                results.append(product)
-                continue
-
-            # 2단계: 제품명 or 제조사에 키워드 포함
-            if any(k in product_name or k in manufacturer for k in keywords):
-                results.append(product)
-                continue
-
-            # 3단계: fuzzy match (제품명 or 제조사) 기준 85 이상
-            if any(
-                fuzz.partial_ratio(k, product_name) >= 85 or
-                fuzz.partial_ratio(k, manufacturer) >= 85
-                for k in keywords
-            ):
-                results.append(product)
-
-        if results:
-            print(f"[검색] '{keyword}' → 결과 {len(results)}개")
-            return JSONResponse(content=results, media_type="application/json; charset=utf-8")
-
-        # 🔁 Fallback 단계: 완화된 조건 (fuzzy 70 + manufacturer/brand도 포함 + 자모 유사도)
-        print(f"[검색-FALLBACK] '{keyword}' 포함 조건으로 재검색")
-        fallback_matches = []
-        for product in product_cache:
-            product_name_clean = get_clean_text(product.get("product_name", ""))
-            manufacturer_clean = get_clean_text(product.get("manufacturer", ""))
-            brand_kor_clean = get_clean_text(product.get("brand_name_kor", ""))
-
-            # manufacturer 매핑 확장
-            manufacturer_expanded = {manufacturer_clean}
-            if manufacturer_clean in brand_label_map_kor_to_eng:
-                eng = brand_label_map_kor_to_eng[manufacturer_clean]
-                if isinstance(eng, list):
-                    manufacturer_expanded.update([get_clean_text(e) for e in eng])
-                else:
-                    manufacturer_expanded.add(get_clean_text(eng))
-            if manufacturer_clean in brand_label_map_eng_to_kor:
-                manufacturer_expanded.add(get_clean_text(brand_label_map_eng_to_kor[manufacturer_clean]))
-
-            for k in keywords:
-                if (
-                    fuzz.partial_ratio(k, product_name_clean) >= 70
-                    or any(fuzz.partial_ratio(k, m) >= 70 for m in manufacturer_expanded)
-                    or fuzz.partial_ratio(k, brand_kor_clean) >= 70
-                    or is_jamo_similar(k, product_name_clean)
-                    or any(is_jamo_similar(k, m) for m in manufacturer_expanded)
-                    or is_jamo_similar(k, brand_kor_clean)
-                ):
-                    fallback_matches.append(product)
-                    break  # ✅ 중복 방지
-
-        print(f"[검색] '{keyword}' → 결과 {len(fallback_matches)}개 (Fallback)")
-        return JSONResponse(content=fallback_matches, media_type="application/json; charset=utf-8")
+        streaming = wants_ndjson(request, stream)
+
+        current = current_indexes()
+        try:
+            view_key, view = resolve_view(current, profile, fields)
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"error": str(e)})
+
+        # 동일한 정제 키워드의 응답 바디 재사용
+        cache_key = (current.generation, "search", keyword_clean, limit, offset, view_key)
+        body = None if streaming else response_cache.get(cache_key)
+        if body is not None:
+            return json_bytes_response(body)
+
+        # 브랜드 확장 + 검색어에 포함된 브랜드 ("비비고 만두" → 비비고) 도 키워드로 사용
+        keywords, brands = search_keywords(keyword_clean)
+
+        # 1~3단계 (정확 일치 → 부분 포함 → fuzzy 85 이상) 순위 상위 limit 개: 인덱스 후보만 검사
+        # 결과가 없으면 🔁 Fallback 단계: 완화된 조건 (fuzzy 70 + manufacturer/brand도 포함 + 자모 유사도)
+        # 점수 계산은 이벤트 루프 밖 (프로세스 풀 또는 스레드 풀) 에서 수행
+        # 같은 키워드 묶음의 순위 결과 재사용 (검색어 표기 / limit / offset / profile 이 달라도 공유)
+        key = memo_key(current.generation, keywords)
+        memoized = search_memo.lookup(key, limit, offset)
+        if memoized is not None:
+            results, is_fallback = memoized
+        else:
+            k = offset + limit
+            ranked, is_fallback = await run_compute(current, search_rows, keywords, k)
+            search_memo.put(key, (ranked, is_fallback, k))
+            results = ranked[offset:offset + limit]
+
+        brand_note = f" (브랜드: {', '.join(brands)})" if brands else ""
+        if is_fallback:
+            print(f"[검색-FALLBACK] '{keyword}' 포함 조건으로 재검색")
+            print(f"[검색] '{keyword}'{brand_note} → 결과 {len(results)}개 (Fallback)")
+        else:
+            print(f"[검색] '{keyword}'{brand_note} → 결과 {len(results)}개")
+
+        if streaming:
+            return ndjson_response(view, results)
+
+        body = join_rows(view, results)
+        response_cache.put(cache_key, body)
+        return json_bytes_response(body)
 
     except Exception as e:
         import traceback
@@ -190,26 +263,27 @@ def search_products(keyword: str = Query(..., min_length=1)):
         traceback.print_exc()
         return JSONResponse(status_code=500, content={"error": str(e)})
 
-# 캐시 용량 정보 API
+# 캐시 용량 정보 API (컬럼형 저장소 실제 사용량)
 @router.get("/cache-info")
-def get_cache_info():
+async def get_cache_info():
     try:
-        est_avg_kb = 10
-        estimated_total_mb = round((len(product_cache) * est_avg_kb) / 1024, 2)
+        current = current_indexes()
+        store = current.store
+        footprint = store.footprint()
+        fragments = current.product_fragments
 
-        try:
-            sample = product_cache[:50]
-            sample_size = asizeof.asizeof(sample)
-            per_item_kb = sample_size / 50 / 1024
-            refined_estimate_mb = round((per_item_kb * len(product_cache)) / 1024, 2)
-        except:
-            refined_estimate_mb = "Not available"
+        def to_mb(n):
+            return round(n / 1024 / 1024, 2)
 
         return JSONResponse(content={
-            "cached_products": len(product_cache),
-            "estimated_memory_mb_simple": estimated_total_mb,
-            "estimated_memory_mb_refined": refined_estimate_mb
+            "cached_products": len(store),
+            "product_store_mb": to_mb(footprint["total"]),
+            "product_store_breakdown_mb": {k: to_mb(v) for k, v in footprint.items() if k != "total"},
+            "response_fragments_mb": to_mb(sum(len(b) for b in fragments)),
+            "response_cache_mb": to_mb(response_cache.total_bytes),
+            "response_cache_entries": len(response_cache),
+            "search_memo": search_memo.stats()
         })
 
     except Exception as e:
-        return JSONResponse(status_code=500, content={"error": str(e)})
\ No newline at end of file
+        return JSONResponse(status_code=500, content={"error": str(e)})
@@ -0,0 +1,10 @@
+import os
+import sys
+import types
+
+# 배포 시 API 디렉터리가 app 패키지로 올라가므로, 테스트에서도 같은 이름으로 import
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if "app" not in sys.modules:
+    app = types.ModuleType("app")
+    app.__path__ = [API_DIR]
+    sys.modules["app"] = app
@@ -0,0 +1,35 @@
+from app.utils.brand_matcher import BrandMatcher, brand_matcher, expand_brand_keywords, search_keywords
+from app.utils.compute import search_rows
+from app.utils.indexes import build_product_indexes
+from app.utils.product_store import build_product_store
+
+
+def test_longest_and_tag_prefer_longer_brand():
+    matcher = BrandMatcher(["비비드", "비비드키친", "비비고"])
+    assert matcher.longest("비비드키친 샐러드") == "비비드키친"
+    assert matcher.tag("비비드키친 비비고 만두") == ["비비드키친", "비비고"]
+    assert matcher.longest(None) is None
+
+
+def test_search_keywords_add_tagged_brands():
+    keywords, brands = search_keywords("비비고 만두")
+    assert brands == ["비비고"]
+    assert set(keywords) == {"비비고 만두", *expand_brand_keywords("비비고")}
+
+    # 브랜드가 없거나 검색어 자체가 브랜드면 기존 확장과 같음
+    assert search_keywords("coke") == (expand_brand_keywords("coke"), [])
+    assert sorted(search_keywords("코카콜라")[0]) == sorted(expand_brand_keywords("코카콜라"))
+
+
+def test_multi_word_query_gets_brand_hits():
+    names = ["비비고 왕교자", "비비고 김치 만두", "풀무원 물만두", "칠성사이다"]
+    products = [
+        {"product_id": f"product_{i}", "product_name": name, "brand_name_kor": brand_matcher.longest(name) or ""}
+        for i, name in enumerate(names)
+    ]
+    current = build_product_indexes(build_product_store(products))
+
+    rows, is_fallback = search_rows(current, search_keywords("비비고 만두")[0], 10)
+    assert not is_fallback
+    assert {names[r] for r in rows} >= {"비비고 왕교자", "비비고 김치 만두"}
+    assert "칠성사이다" not in {names[r] for r in rows}
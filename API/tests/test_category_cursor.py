@@ -0,0 +1,62 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes.categorical import router
+from app.utils.indexes import install_product_store
+from app.utils.product_store import build_product_store
+
+
+def sample_products(n: int, name: str = "제품") -> list[dict]:
+    categories = [("음료류", "탄산음료"), ("과자류", "스낵")]
+    return [
+        {"product_id": f"product_{i}", "product_name": f"{name} {i}", "big_category": big, "category": category}
+        for i, (big, category) in ((i, categories[i % 2]) for i in range(n))
+    ]
+
+
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_cursor_pages_through_category():
+    install_product_store(build_product_store(sample_products(25)), "2025-01-01T00:00:00+00:00")
+    api = client()
+
+    names, cursor = [], None
+    while True:
+        params = {"big_category": "음료류", "limit": 4, **({"cursor": cursor} if cursor else {})}
+        body = api.get("/category/page", params=params).json()
+        names += [item["product_name"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert names == [f"제품 {i}" for i in range(0, 25, 2)]
+
+
+def test_cursor_rejected_for_other_filter():
+    install_product_store(build_product_store(sample_products(25)), "2025-01-01T00:00:00+00:00")
+    api = client()
+
+    cursor = api.get("/category/page", params={"big_category": "음료류", "limit": 4}).json()["next_cursor"]
+    assert api.get("/category/page", params={"big_category": "과자류", "cursor": cursor}).status_code == 400
+    assert api.get("/category/page", params={"big_category": "음료류", "category": "탄산", "cursor": cursor}).status_code == 400
+    assert api.get("/category/page", params={"big_category": "음료류", "cursor": "bm90LWpzb24="}).status_code == 400
+    assert api.get("/category/page", params={"big_category": "음료류", "cursor": cursor}).status_code == 200
+
+
+def test_cursor_expires_after_store_swap():
+    install_product_store(build_product_store(sample_products(25)), "2025-01-01T00:00:00+00:00")
+    api = client()
+    cursor = api.get("/category/page", params={"big_category": "음료류", "limit": 4}).json()["next_cursor"]
+
+    install_product_store(build_product_store(sample_products(30, "새제품")), "2025-01-02T00:00:00+00:00")
+    response = api.get("/category/page", params={"big_category": "음료류", "cursor": cursor})
+    assert response.status_code == 410
+
+    # 기준 시점이 없는 저장소는 세대가 바뀌면 만료
+    install_product_store(build_product_store(sample_products(25)))
+    cursor = api.get("/category/page", params={"big_category": "음료류", "limit": 4}).json()["next_cursor"]
+    install_product_store(build_product_store(sample_products(25)))
+    assert api.get("/category/page", params={"big_category": "음료류", "cursor": cursor}).status_code == 410
@@ -0,0 +1,111 @@
+import threading
+
+import pytest
+
+from app.utils.firestore_loader import (
+    fetch_partition, load_partitioned, load_all_products, plan_partitions, product_order_key
+)
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id: str, data):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class FakeRef:
+    def __init__(self, doc_id: str):
+        self.id = doc_id
+
+
+class FakeCollection:
+    def __init__(self, name: str):
+        self.name = name
+
+    def document(self, doc_id: str) -> FakeRef:
+        return FakeRef(doc_id)
+
+
+# collection().document() + get_all() 만 흉내 내는 가짜 Firestore 클라이언트
+class FakeDB:
+    def __init__(self, docs: dict, fail_on: str = None):
+        self.docs = docs
+        self.fail_on = fail_on
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(name)
+
+    def get_all(self, refs):
+        refs = list(refs)
+        with self.lock:
+            self.calls.append([ref.id for ref in refs])
+        if self.fail_on is not None and any(ref.id == self.fail_on for ref in refs):
+            raise RuntimeError("partition failed")
+        # 실제 get_all 처럼 요청 순서를 보장하지 않음
+        return [FakeSnapshot(ref.id, self.docs.get(ref.id)) for ref in reversed(refs)]
+
+
+def to_product(doc) -> dict:
+    return {**doc.to_dict(), "product_id": doc.id}
+
+
+def catalog(ids) -> dict:
+    names = ["콜라", "사이다", "라면", "과자", "콜라"]
+    return {f"product_{i}": {"product_name": names[i % len(names)]} for i in ids}
+
+
+def test_plan_partitions_covers_all_ids():
+    assert plan_partitions(0, 4) == []
+    assert plan_partitions(10, 4) == [range(0, 4), range(4, 8), range(8, 10)]
+
+
+def test_fetch_partition_skips_missing_ids_in_order():
+    db = FakeDB(catalog([0, 1, 3, 5]))
+    docs = fetch_partition(db, range(0, 6))
+    assert [doc.id for doc in docs] == ["product_0", "product_1", "product_3", "product_5"]
+    assert db.calls == [[f"product_{i}" for i in range(6)]]
+
+
+def test_load_partitioned_collects_every_partition():
+    db = FakeDB(catalog(range(10)))
+    products, timings = load_partitioned(db, 10, to_product, partition_size=3, workers=4)
+    assert sorted(p["product_id"] for p in products) == sorted(f"product_{i}" for i in range(10))
+    assert [(t["start"], t["end"], t["docs"]) for t in timings] == [(0, 3, 3), (3, 6, 3), (6, 9, 3), (9, 10, 1)]
+
+
+def test_load_all_products_uses_product_order():
+    db = FakeDB(catalog(range(12)))
+    products = load_all_products(db, 12, to_product, fallback=pytest.fail, partition_size=5, workers=3)
+    # 제품명 → 문서 ID (문자열) 순, 순차 조회 order_by("product_name") 와 같은 순서
+    assert [p["product_id"] for p in products] == [
+        "product_3", "product_8",
+        "product_2", "product_7",
+        "product_1", "product_11", "product_6",
+        "product_0", "product_10", "product_4", "product_5", "product_9",
+    ]
+
+
+def test_load_all_products_falls_back_when_ids_are_missing():
+    db = FakeDB(catalog([0, 1, 2, 4, 5, 7, 11, 12]))
+    fallback_calls = []
+
+    def fallback(total_count):
+        fallback_calls.append(total_count)
+        return ["sequential"]
+
+    assert load_all_products(db, 8, to_product, fallback, partition_size=4) == ["sequential"]
+    assert fallback_calls == [8]
+
+
+def test_failing_partition_raises():
+    db = FakeDB(catalog(range(10)), fail_on="product_7")
+    with pytest.raises(RuntimeError, match="partition failed"):
+        load_partitioned(db, 10, to_product, partition_size=3, workers=4)
+    with pytest.raises(RuntimeError):
+        load_all_products(db, 10, to_product, fallback=pytest.fail, partition_size=3)
@@ -0,0 +1,70 @@
+from app.utils.product_store import build_product_store, ProductStore
+from app.utils.response_cache import dumps
+
+
+def sample_products() -> list[dict]:
+    return [
+        {
+            "product_name": "콜라",
+            "manufacturer": "코카콜라음료",
+            "energy_kcal": 1234.5678,
+            "sodium_mg": 100,
+            "sugar_g": None,
+            "raw_materials": {"ingredients_raw": "정제수, 설탕", "safe": "정제수", "warning": "설탕"},
+            "product_id": "product_0",
+        },
+        {
+            # 다른 키 순서 + 하위 키 순서 + 일부 필드 없음
+            "product_id": "product_1",
+            "sodium_mg": 0.1,
+            "product_name": "사이다",
+            "raw_materials": {"warning": "", "ingredients_raw": "정제수", "etc": "향료"},
+            "zero_certification": 1,
+            "gi_point": {"min": 40.0, "max": 55.0},
+            "big_category": "음료류",
+        },
+        {
+            "product_id": "product_2",
+            "energy_kcal": 0,
+            "sodium_mg": 3.3,
+            "sugar_g": 12.3,
+            "gi_point": "70",
+            "tags": ["a", "b"],
+            "big_category": None,
+        },
+    ]
+
+
+def typed(value):
+    if isinstance(value, dict):
+        return [(k, typed(v)) for k, v in value.items()]
+    if isinstance(value, list):
+        return [typed(v) for v in value]
+    return (type(value).__name__, value)
+
+
+def assert_round_trip(store, products):
+    for i, product in enumerate(products):
+        row = store.row(i)
+        # 값 / 타입 / 키 순서 (중첩 dict 포함) 까지 원본과 같아야 함
+        assert typed(row) == typed(product)
+        assert dumps(row) == dumps(product)
+
+
+def test_row_round_trip():
+    products = sample_products()
+    assert_round_trip(build_product_store(products), products)
+
+
+def test_row_round_trip_after_save(tmp_path):
+    products = sample_products()
+    build_product_store(products).save(str(tmp_path))
+    assert_round_trip(ProductStore.load(str(tmp_path), mmap=True), products)
+
+
+def test_projection_keeps_requested_order():
+    store = build_product_store(sample_products())
+    assert list(store.row(1, ("product_name", "product_id"))) == ["product_name", "product_id"]
+    assert store.get(0, "energy_kcal") == 1234.5678
+    assert store.get(2, "energy_kcal") == 0 and isinstance(store.get(2, "energy_kcal"), int)
+    assert store.get(1, "energy_kcal", "없음") == "없음"
@@ -0,0 +1,137 @@
+import random
+
+from rapidfuzz import fuzz
+
+from app.utils.brandlabel import brand_label_map_kor_to_eng, brand_label_map_eng_to_kor
+from app.utils.fallback_matcher import FallbackMatcher, build_fallback_matcher
+from app.utils.product_store import build_product_store
+from app.utils.search_index import SearchIndex, build_search_index
+from app.utils.text import get_clean_text, is_jamo_similar
+
+NAMES = ["코카콜라 제로", "펩시 콜라 라임", "칠성사이다", "신라면", "진라면 매운맛", "새우깡", "비비고 왕교자", "초코파이", "바나나우유", "포카칩 오리지널"]
+MANUFACTURERS = ["코카콜라음료", "롯데칠성음료", "농심", "오뚜기", "씨제이제일제당", "오리온", "빙그레", "Pepsi Co", ""]
+
+
+def sample_products(n: int = 300, seed: int = 0) -> list[dict]:
+    rnd = random.Random(seed)
+    products = []
+    for i in range(n):
+        name = rnd.choice(NAMES) + rnd.choice(["", " 500ml", " (대)", f" {i}"])
+        brand_kor = next((b for b in brand_label_map_kor_to_eng if b in name), "")
+        brand_eng = brand_label_map_kor_to_eng.get(brand_kor, "")
+        if isinstance(brand_eng, list):
+            brand_eng = brand_eng[0]
+        products.append({
+            "product_id": f"product_{i}",
+            "product_name": name,
+            "manufacturer": rnd.choice(MANUFACTURERS),
+            "brand_name_kor": brand_kor,
+            "brand_name_eng": brand_eng,
+        })
+    return products
+
+
+# 기존 /search 의 1~3단계 선형 탐색 (저장소 순서)
+def legacy_match(products, keywords):
+    rows = []
+    for row, product in enumerate(products):
+        product_name = get_clean_text(product.get("product_name", ""))
+        brand_kor = get_clean_text(product.get("brand_name_kor", ""))
+        brand_eng = get_clean_text(product.get("brand_name_eng", ""))
+        manufacturer = get_clean_text(product.get("manufacturer", ""))
+        if (
+            any(k == brand_kor or k == brand_eng or k == manufacturer for k in keywords)
+            or any(k in product_name or k in manufacturer for k in keywords)
+            or any(fuzz.partial_ratio(k, product_name) >= 85 or fuzz.partial_ratio(k, manufacturer) >= 85 for k in keywords)
+        ):
+            rows.append(row)
+    return rows
+
+
+# 기존 /search 의 Fallback 선형 탐색 (저장소 순서)
+def legacy_fallback(products, keywords):
+    rows = []
+    for row, product in enumerate(products):
+        product_name = get_clean_text(product.get("product_name", ""))
+        manufacturer = get_clean_text(product.get("manufacturer", ""))
+        brand_kor = get_clean_text(product.get("brand_name_kor", ""))
+
+        expanded = {manufacturer}
+        if manufacturer in brand_label_map_kor_to_eng:
+            eng = brand_label_map_kor_to_eng[manufacturer]
+            if isinstance(eng, list):
+                expanded.update(get_clean_text(e) for e in eng)
+            else:
+                expanded.add(get_clean_text(eng))
+        if manufacturer in brand_label_map_eng_to_kor:
+            expanded.add(get_clean_text(brand_label_map_eng_to_kor[manufacturer]))
+
+        for k in keywords:
+            if (
+                fuzz.partial_ratio(k, product_name) >= 70
+                or any(fuzz.partial_ratio(k, m) >= 70 for m in expanded)
+                or fuzz.partial_ratio(k, brand_kor) >= 70
+                or is_jamo_similar(k, product_name)
+                or any(is_jamo_similar(k, m) for m in expanded)
+                or is_jamo_similar(k, brand_kor)
+            ):
+                rows.append(row)
+                break
+    return rows
+
+
+# 정확 일치 / 부분 포함 / fuzzy / 결과 없음 (Fallback 대상) 을 모두 포함
+QUERIES = [
+    ["농심"], ["pepsico"], ["코카콜라", "cocacola"], ["콜라"], ["라면"], ["500ml"], ["새"], ["칠성사이디"],
+    ["진라면매운"], ["포카칩오리지날"], ["바나나우유맛"], ["오리옹"], ["코카콜"], ["쵸코파이"], ["zzz"], ["라묜"],
+    ["신라묜"], ["포카찝"], ["빙그래"],
+]
+
+
+def test_match_and_top_equal_legacy_scan():
+    products = sample_products()
+    index = build_search_index(build_product_store(products))
+
+    for keywords in QUERIES:
+        expected = legacy_match(products, keywords)
+        assert index.match(keywords) == expected, keywords
+        assert sorted(index.top(keywords, len(products))) == expected, keywords
+
+    # 각 단계가 실제로 결과를 내는지 (테스트 질의가 한 단계에 몰리지 않도록)
+    assert len(index.exact_rows("농심"))
+    assert len(index.substring_rows("콜라"))
+    assert index.fuzzy_scores("칠성사이디", exclude=set())
+    assert not legacy_match(products, ["신라묜"])
+
+
+def test_top_ranks_exact_then_substring():
+    products = sample_products()
+    index = build_search_index(build_product_store(products))
+
+    exact = index.exact_rows("농심").tolist()
+    ranked = index.top(["농심"], len(exact) + 5)
+    assert ranked[:len(exact)] == exact
+    assert set(ranked[len(exact):]).isdisjoint(exact)
+
+
+def test_fallback_equals_legacy_scan():
+    products = sample_products()
+    matcher = build_fallback_matcher(build_product_store(products))
+
+    for keywords in QUERIES:
+        assert matcher.match(keywords) == legacy_fallback(products, keywords), keywords
+    assert matcher.match(["신라묜"])
+
+
+# 스냅샷에 저장 후 mmap 으로 연 인덱스도 같은 결과
+def test_snapshot_indexes_equal_legacy_scan(tmp_path):
+    products = sample_products()
+    store = build_product_store(products)
+    build_search_index(store).save(str(tmp_path))
+    build_fallback_matcher(store).save(str(tmp_path))
+    index = SearchIndex.load(store, str(tmp_path))
+    matcher = FallbackMatcher.load(store, str(tmp_path))
+
+    for keywords in QUERIES:
+        assert index.match(keywords) == legacy_match(products, keywords), keywords
+        assert matcher.match(keywords) == legacy_fallback(products, keywords), keywords
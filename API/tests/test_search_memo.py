@@ -0,0 +1,40 @@
+from app.utils.brand_matcher import brand_matcher, expand_brand_keywords
+from app.utils.compute import search_rows
+from app.utils.indexes import build_product_indexes
+from app.utils.product_store import build_product_store
+from app.utils.search_memo import memo_key
+
+
+def brand_products(names: list[str]) -> list[dict]:
+    return [
+        {"product_id": f"product_{i}", "product_name": name, "brand_name_kor": brand_matcher.longest(name) or ""}
+        for i, name in enumerate(names)
+    ]
+
+
+def test_expansion_is_one_step():
+    assert sorted(expand_brand_keywords("coke")) == ["coke", "코카콜라"]
+    assert sorted(expand_brand_keywords("Coke ")) == ["coke", "코카콜라"]
+    assert sorted(expand_brand_keywords("코카콜라")) == ["cocacola", "coke", "cola", "코카콜라"]
+    # "씨유" → "비지에프" 까지만 (비지에프 → 시유 로 이어지지 않음)
+    assert "시유" not in expand_brand_keywords("씨유")
+
+
+def test_coke_results_unchanged():
+    products = brand_products(["코카콜라 제로", "펩시 cola 라임", "칠성사이다"])
+    current = build_product_indexes(build_product_store(products))
+
+    rows, is_fallback = search_rows(current, expand_brand_keywords("coke"), 10)
+    assert [products[r]["product_name"] for r in rows] == ["코카콜라 제로"]
+    assert not is_fallback
+
+    # "코카콜라" 는 cola 까지 확장되므로 다른 결과
+    rows, _ = search_rows(current, expand_brand_keywords("코카콜라"), 10)
+    assert sorted(products[r]["product_name"] for r in rows) == ["코카콜라 제로", "펩시 cola 라임"]
+
+
+def test_memo_key_shared_only_for_same_keywords():
+    assert memo_key(1, expand_brand_keywords("Coke")) == memo_key(1, expand_brand_keywords("coke "))
+    assert memo_key(1, ["coke", "코카콜라", "coke"]) == memo_key(1, ["코카콜라", "coke"])
+    assert memo_key(1, expand_brand_keywords("coke")) != memo_key(1, expand_brand_keywords("코카콜라"))
+    assert memo_key(1, expand_brand_keywords("coke")) != memo_key(2, expand_brand_keywords("coke"))
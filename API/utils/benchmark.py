@@ -0,0 +1,280 @@
+# app/utils/benchmark.py
+import argparse
+import json
+import os
+import platform
+import random
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.utils.brandlabel import brand_label_map_kor_to_eng
+from app.utils.brand_matcher import brand_matcher, search_keywords
+from app.utils.compute import search_rows, recommend_rows
+from app.utils.indexes import install_product_store
+from app.utils.product_store import build_product_store
+from app.utils.response_cache import dumps, join_rows
+from app.utils.text import get_clean_text
+
+# ---------------------------------------------------------------
+# 📌 검색 / 추천 / 카테고리 지연 시간 벤치마크
+# Firestore 없이 합성 한글 제품 카탈로그를 만들어 제품 저장소에 바로 적재하고,
+# 질의 묶음별 p50 / p95 / p99 지연 시간과 처리량을 측정해 JSON 으로 저장합니다.
+#
+# 실행: python -m app.utils.benchmark --sizes 10000,25000,100000,500000 --out ./benchmark_results
+#
+# - 라우트와 같은 계산 경로 (브랜드 확장 → 순위 검색 / Fallback, 실시간 추천, 카테고리 인덱스 + 조각 결합)
+# - 응답 캐시와 검색 메모는 거치지 않으므로 매 요청이 실제 계산 비용입니다.
+# - 질의 묶음: 브랜드(한글·영어), 제품명 일부, 한 글자, 제조사, Fallback 을 유발하는 오타, 결과 없음
+# ---------------------------------------------------------------
+
+BIG_CATEGORIES = {
+    "음료류": ["탄산음료", "과채음료", "커피", "차류", "두유류"],
+    "과자류": ["스낵", "비스킷", "초콜릿", "캔디"],
+    "면류": ["유탕면", "건면", "생면"],
+    "빵류": ["식빵", "케이크", "도넛"],
+    "유가공품": ["우유", "발효유", "치즈"],
+    "소스류": ["케첩", "드레싱", "간장"],
+}
+MANUFACTURERS = [
+    "농심", "오뚜기", "롯데칠성음료", "코카콜라음료", "삼양식품", "씨제이제일제당", "빙그레", "해태제과식품",
+    "(주)동원F&B", "풀무원식품", "매일유업", "남양유업", "크라운제과", "오리온", "비지에프리테일", "Pepsi Co",
+]
+WORDS = [
+    "제로", "콜라", "사이다", "오렌지", "포도", "초코", "바나나맛", "우유", "라면", "짜장", "만두", "김치",
+    "쿠키", "크래커", "감자칩", "아몬드", "녹차", "보리", "옥수수", "탄산수", "레몬", "자몽", "복숭아",
+    "딸기", "요거트", "그래놀라", "떡볶이", "치즈", "카레", "참깨", "고구마", "흑당", "밀크티", "에너지",
+]
+SUFFIXES = ["", "", "", " 500ml", " 1.5L", " (대)", " 멀티팩", " 355ml"]
+SAFE = ["정제수", "설탕", "밀가루", "정제소금", "옥수수전분", "대두유", "구연산", "비타민C", "탄산가스", "천연향료"]
+CAUTION = ["액상과당", "팜유", "말토덱스트린", "합성향료", "카라멜색소"]
+WARNING = ["아스파탐", "수크랄로스", "아세설팜칼륨", "소르빈산칼륨", "안식향산나트륨", "사카린나트륨"]
+
+QUERY_MIX = {
+    "brand": 0.30,
+    "name": 0.30,
+    "short": 0.10,
+    "manufacturer": 0.10,
+    "typo": 0.15,
+    "none": 0.05,
+}
+
+
+def _join(items) -> str:
+    return ", ".join(items)
+
+
+# 합성 제품 dict 목록 (to_product 결과와 같은 형태)
+def make_catalog(size: int, seed: int = 0) -> list[dict]:
+    rnd = random.Random(seed)
+    brands = list(brand_label_map_kor_to_eng)
+    products = []
+    for i in range(size):
+        brand = rnd.choice(brands) if rnd.random() < 0.4 else ""
+        words = rnd.sample(WORDS, rnd.randint(1, 3))
+        product_name = (brand + " " if brand else "") + "".join(words) + rnd.choice(SUFFIXES)
+        big_category = rnd.choice(list(BIG_CATEGORIES))
+
+        safe = rnd.sample(SAFE, rnd.randint(2, 6))
+        caution = rnd.sample(CAUTION, rnd.randint(0, 2))
+        warning = rnd.sample(WARNING, rnd.randint(0, 2))
+        ingredients = safe + caution + warning
+        rnd.shuffle(ingredients)
+
+        brand_kor = brand_matcher.longest(product_name) or ""
+        brand_eng = brand_label_map_kor_to_eng.get(brand_kor, "")
+        if isinstance(brand_eng, list):
+            brand_eng = brand_eng[0]
+
+        products.append({
+            "product_name": product_name,
+            "manufacturer": rnd.choice(MANUFACTURERS),
+            "big_category": big_category,
+            "category": rnd.choice(BIG_CATEGORIES[big_category]),
+            "image_url": f"https://example.com/images/{i}.png",
+            "energy_kcal": round(rnd.uniform(0, 600), 1),
+            "protein_g": round(rnd.uniform(0, 30), 1),
+            "fat_g": round(rnd.uniform(0, 40), 1),
+            "carbs_g": round(rnd.uniform(0, 90), 1),
+            "sugar_g": rnd.choice([None, 0.0, round(rnd.uniform(0, 50), 1)]),
+            "sodium_mg": round(rnd.uniform(0, 2000), 1),
+            "gi_point": rnd.choice([None, rnd.randint(10, 100)]),
+            "zero_certification": float(rnd.random() < 0.2),
+            "safety_message": "주의" if warning else "안전",
+            "report_date": f"20{rnd.randint(10, 24):02d}{rnd.randint(1, 12):02d}{rnd.randint(1, 28):02d}",
+            "raw_materials": {
+                "ingredients_raw": _join(ingredients),
+                "safe": _join(safe),
+                "caution": _join(caution),
+                "warning": _join(warning),
+                "etc": "",
+            },
+            "product_id": f"product_{i}",
+            "brand_name_kor": brand_kor,
+            "brand_name_eng": brand_eng,
+        })
+    return products
+
+
+# 한글 음절의 받침을 바꿔 오타 생성 (예: 콜라 → 콜락)
+def _typo(text: str, rnd: random.Random) -> str:
+    positions = [i for i, ch in enumerate(text) if "가" <= ch <= "힣"]
+    if not positions:
+        return text + "ㅋ"
+    i = rnd.choice(positions)
+    code = ord(text[i]) - 0xAC00
+    jong = code % 28
+    new_jong = rnd.choice([j for j in range(1, 28) if j != jong])
+    return text[:i] + chr(0xAC00 + code - jong + new_jong) + text[i + 1:]
+
+
+def make_queries(products: list[dict], count: int, seed: int = 0) -> list[tuple[str, str]]:
+    rnd = random.Random(seed)
+    brand_terms = []
+    for kor, eng in brand_label_map_kor_to_eng.items():
+        brand_terms.append(kor)
+        brand_terms.extend(eng if isinstance(eng, list) else [eng])
+    kinds = list(QUERY_MIX)
+    weights = [QUERY_MIX[k] for k in kinds]
+
+    queries = []
+    for kind in rnd.choices(kinds, weights=weights, k=count):
+        name = get_clean_text(rnd.choice(products)["product_name"]).replace(" ", "")
+        if kind == "brand":
+            query = rnd.choice(brand_terms)
+        elif kind == "name":
+            length = min(len(name), rnd.randint(2, 4))
+            start = rnd.randint(0, len(name) - length)
+            query = name[start:start + length]
+        elif kind == "short":
+            query = rnd.choice(name)
+        elif kind == "manufacturer":
+            query = rnd.choice(MANUFACTURERS)
+        elif kind == "typo":
+            query = _typo(rnd.choice(WORDS + list(brand_label_map_kor_to_eng)), rnd)
+        else:
+            query = "".join(rnd.choice("퀘퓌뷁쀍") for _ in range(3))
+        queries.append((kind, query))
+    return queries
+
+
+def summarize(samples: list[float]) -> dict:
+    if not samples:
+        return {"count": 0}
+    ms = np.array(samples) * 1000
+    total = float(np.sum(samples))
+    return {
+        "count": len(samples),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "mean_ms": round(float(np.mean(ms)), 3),
+        "throughput_per_sec": round(len(samples) / total, 1) if total else None,
+    }
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def bench_size(size: int, queries: int, recommends: int, categories: int, limit: int, seed: int) -> dict:
+    started = time.perf_counter()
+    products = make_catalog(size, seed)
+    generated_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    current = install_product_store(build_product_store(products))
+    install_sec = time.perf_counter() - started
+    fragments = current.product_fragments
+
+    # 검색: 라우트와 같은 정제 → 브랜드 확장 (검색어에 포함된 브랜드 포함) → 순위 검색(결과 없으면 Fallback) → 조각 결합
+    def search(query):
+        keywords = search_keywords(query)[0]
+        rows, _ = search_rows(current, keywords, limit)
+        join_rows(fragments, rows)
+
+    search_samples = {}
+    fallback_hits = 0
+    for kind, query in make_queries(products, queries, seed):
+        search_samples.setdefault(kind, []).append(_timed(search, query))
+        if kind == "typo":
+            _, is_fallback = search_rows(current, search_keywords(query)[0], limit)
+            fallback_hits += is_fallback
+
+    # 추천: 실시간 TF-IDF (그룹별 첫 요청은 학습 포함)
+    rnd = random.Random(seed)
+    store = current.store
+
+    def recommend(product_id):
+        rows = recommend_rows(current, product_id, 4) or []
+        dumps([store.row(r, ("product_id", "manufacturer", "product_name", "image_url")) for r in rows])
+
+    recommend_samples = [_timed(recommend, f"product_{rnd.randrange(size)}") for _ in range(recommends)]
+
+    # 카테고리: 부분 일치 인덱스 + 페이지 조각 결합
+    def category(keyword, offset):
+        rows = current.category_index.rows("big_category", keyword)
+        join_rows(fragments, rows[offset:offset + 500])
+
+    category_samples = [
+        _timed(category, rnd.choice(list(BIG_CATEGORIES)), rnd.randrange(0, max(1, size // len(BIG_CATEGORIES)), 500))
+        for _ in range(categories)
+    ]
+
+    all_search = [s for samples in search_samples.values() for s in samples]
+    return {
+        "size": size,
+        "catalog_generation_sec": round(generated_sec, 2),
+        "install_sec": round(install_sec, 2),
+        "store_mb": round(store.footprint()["total"] / 1024 / 1024, 2),
+        "search": summarize(all_search),
+        "search_by_kind": {kind: summarize(samples) for kind, samples in search_samples.items()},
+        "typo_fallback_ratio": round(fallback_hits / max(1, len(search_samples.get("typo", []))), 3),
+        "recommend": summarize(recommend_samples),
+        "category": summarize(category_samples),
+    }
+
+
+def run(sizes: list[int], queries: int, recommends: int, categories: int, limit: int, seed: int) -> dict:
+    results = []
+    for size in sizes:
+        print(f"⏱️ [벤치마크] {size}개 제품 측정 시작")
+        result = bench_size(size, queries, recommends, categories, limit, seed)
+        print(
+            f"✅ [벤치마크] {size}개: 검색 p50 {result['search']['p50_ms']}ms / p99 {result['search']['p99_ms']}ms, "
+            f"추천 p50 {result['recommend']['p50_ms']}ms, 카테고리 p50 {result['category']['p50_ms']}ms"
+        )
+        results.append(result)
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": {"queries": queries, "recommends": recommends, "categories": categories, "limit": limit, "seed": seed},
+        "query_mix": QUERY_MIX,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="검색 / 추천 / 카테고리 지연 시간 벤치마크")
+    parser.add_argument("--sizes", default="10000,25000", help="쉼표로 구분한 카탈로그 크기 (예: 10000,25000,100000,500000)")
+    parser.add_argument("--queries", type=int, default=2000, help="크기별 검색 질의 수")
+    parser.add_argument("--recommends", type=int, default=300, help="크기별 추천 요청 수")
+    parser.add_argument("--categories", type=int, default=300, help="크기별 카테고리 요청 수")
+    parser.add_argument("--limit", type=int, default=100, help="검색 limit")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="benchmark_results", help="결과 JSON 저장 디렉터리")
+    args = parser.parse_args()
+
+    report = run([int(s) for s in args.sizes.split(",")], args.queries, args.recommends, args.categories, args.limit, args.seed)
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"bench-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✅ [벤치마크] 결과 저장: {path}")
@@ -0,0 +1,114 @@
+# app/utils/brand_matcher.py
+from collections import deque
+
+from app.utils.brandlabel import brand_label_map_kor_to_eng, brand_label_map_eng_to_kor
+from app.utils.text import get_clean_text
+
+# ---------------------------------------------------------------
+# 📌 브랜드 다중 패턴 매칭 (Aho-Corasick)
+# 제품명마다 브랜드 목록을 순서대로 훑어 처음 포함된 브랜드를 고르면
+# 브랜드 수에 비례해 느려지고, 목록 순서에 따라 "비비드" 가 "비비드키친" 보다 먼저 잡힙니다.
+#
+# brandlabel.py 의 브랜드명으로 오토마타를 한 번 구성해 두고,
+# 제품명 / 검색어를 한 번만 훑어 포함된 브랜드를 모두 찾습니다.
+# - longest(): 가장 긴 브랜드 (길이가 같으면 앞에 나온 것)
+# - tag(): 왼쪽부터 겹치지 않게 가장 긴 브랜드들
+#
+# expand_brand_keywords(): 검색어에 직접 매핑된 브랜드 한글/영어 표기를 추가
+# search_keywords(): 검색어 확장 + 검색어에 포함된 브랜드 ("비비고 만두" → 비비고) 의 확장
+# ---------------------------------------------------------------
+
+
+class BrandMatcher:
+    def __init__(self, brands):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for brand in brands:
+            if not brand:
+                continue
+            node = 0
+            for ch in brand:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                node = nxt
+            self.output[node].append(brand)
+
+        # 실패 링크 (BFS), 출력은 실패 링크의 출력까지 합쳐 둠
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+                queue.append(nxt)
+
+    # (시작 위치, 브랜드) 전체
+    def matches(self, text: str) -> list[tuple[int, str]]:
+        found = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for brand in self.output[node]:
+                found.append((i - len(brand) + 1, brand))
+        return found
+
+    def longest(self, text) -> str | None:
+        if not isinstance(text, str):
+            return None
+        found = self.matches(text)
+        if not found:
+            return None
+        return min(found, key=lambda m: (-len(m[1]), m[0]))[1]
+
+    def tag(self, text: str) -> list[str]:
+        tags = []
+        end = 0
+        for start, brand in sorted(self.matches(text), key=lambda m: (m[0], -len(m[1]))):
+            if start >= end:
+                tags.append(brand)
+                end = start + len(brand)
+        return tags
+
+
+brand_matcher = BrandMatcher(brand_label_map_kor_to_eng)
+
+
+# 브랜드 확장 키워드 (직접 매핑된 한글/영어 표기만, 한 단계)
+def expand_brand_keywords(keyword: str) -> list[str]:
+    keyword = get_clean_text(keyword)
+    expanded = {keyword}
+
+    if keyword in brand_label_map_kor_to_eng:
+        eng = brand_label_map_kor_to_eng[keyword]
+        if isinstance(eng, list):
+            expanded.update(get_clean_text(e) for e in eng)
+        else:
+            expanded.add(get_clean_text(eng))
+
+    if keyword in brand_label_map_eng_to_kor:
+        expanded.add(get_clean_text(brand_label_map_eng_to_kor[keyword]))
+
+    return list(expanded)
+
+
+# /search 키워드 묶음 → (키워드 목록, 검색어에서 찾은 브랜드)
+# 여러 단어 검색어도 포함된 브랜드로 정확 일치 / 브랜드 확장이 되도록 태깅된 브랜드를 키워드에 추가
+def search_keywords(keyword: str) -> tuple[list[str], list[str]]:
+    keyword = get_clean_text(keyword)
+    brands = brand_matcher.tag(keyword)
+    keywords = set(expand_brand_keywords(keyword))
+    for brand in brands:
+        keywords.update(expand_brand_keywords(brand))
+    return list(keywords), brands
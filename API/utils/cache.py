@@ -1,4 +1,12 @@
 # app/utils/cache.py
 
-# 모든 모듈에서 공유할 전역 제품 캐시 리스트
-product_cache = []
\ No newline at end of file
+# 모든 모듈에서 공유할 제품 저장소 + 파생 인덱스 묶음 (app.utils.indexes.ProductIndexes)
+# - store: 컬럼형 제품 저장소 (app.utils.product_store.ProductStore)
+# - search_index / fallback_matcher: 검색 인덱스, 1차 결과가 없을 때의 일괄 fuzzy 엔진
+# - category_index: 소문자 카테고리 → 행 번호 인덱스
+# - recommend_model / recommend_table: 그룹별 TF-IDF 추천 모델, 오프라인 추천 테이블 (RECOMMEND_TABLE_DIR 설정 시)
+# - product_fragments: 제품별 미리 직렬화된 JSON 바이트
+#
+# install_product_store() 가 모두 구성한 뒤 통째로 교체하므로,
+# 요청 처리 중에는 app.utils.indexes.current_indexes() 로 한 번만 읽어 사용합니다.
+current = None
@@ -0,0 +1,72 @@
+# app/utils/category_index.py
+import base64
+import json
+from collections import defaultdict
+
+import numpy as np
+
+# ---------------------------------------------------------------
+# 📌 카테고리 인덱스
+# /category 요청마다 전체 제품에 대해 부분 문자열 비교를 하지 않도록
+# 소문자 big_category / category 값 → 행 번호 배열을 캐시 적재 시 한 번만 구성합니다.
+#
+# 부분 일치 의미(keyword in big_category.lower())는 그대로 유지하되,
+# 비교 대상은 제품 전체가 아니라 수십 개 수준의 고유 카테고리 키입니다.
+# ---------------------------------------------------------------
+
+CATEGORY_FIELDS = ("big_category", "category")
+
+
+class CategoryIndex:
+    def __init__(self, store):
+        self.store = store
+        self.size = len(store)
+
+        keys = {field: defaultdict(list) for field in CATEGORY_FIELDS}
+        for field in CATEGORY_FIELDS:
+            for row, value in enumerate(store.column(field, "")):
+                if isinstance(value, str):
+                    keys[field][value.lower()].append(row)
+
+        self.keys = {
+            field: {key: np.array(rows, dtype=np.int32) for key, rows in table.items()}
+            for field, table in keys.items()
+        }
+
+    # keyword 를 포함하는 카테고리 키들의 행 번호 (저장소 순서)
+    def rows(self, field: str, keyword: str) -> np.ndarray:
+        keyword = keyword.lower()
+        matched = [rows for key, rows in self.keys[field].items() if keyword in key]
+        if not matched:
+            return np.empty(0, dtype=np.int32)
+        if len(matched) == 1:
+            return matched[0]
+        return np.sort(np.concatenate(matched))
+
+
+def build_category_index(store) -> CategoryIndex:
+    return CategoryIndex(store)
+
+
+# 저장소가 교체된 뒤의 커서 (처음 페이지부터 다시 조회해야 함)
+class CursorExpired(ValueError):
+    pass
+
+
+# 페이지 커서 (다음 offset + 발급 당시 데이터 버전 / 필터를 감싼 불투명 문자열)
+# 다른 필터의 커서나 저장소가 교체되기 전의 커서로 행을 건너뛰거나 반복하지 않도록 함께 검사합니다.
+def encode_cursor(offset: int, version: str, filters: tuple) -> str:
+    payload = json.dumps([offset, version, list(filters)], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+# 커서 → offset (형식 / 필터 불일치: ValueError, 데이터 버전 불일치: CursorExpired)
+def decode_cursor(cursor: str, version: str, filters: tuple) -> int:
+    offset, cursor_version, cursor_filters = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError("invalid offset")
+    if tuple(cursor_filters) != tuple(filters):
+        raise ValueError("cursor filter mismatch")
+    if cursor_version != version:
+        raise CursorExpired(cursor_version)
+    return offset
@@ -0,0 +1,162 @@
+# app/utils/compute.py
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from starlette.concurrency import run_in_threadpool
+
+from app.utils import cache
+from app.utils.recommend_model import score_candidates, name_filtered, select_top
+
+# ---------------------------------------------------------------
+# 📌 CPU 연산 실행기
+# 검색(fuzzy)·추천(TF-IDF) 점수 계산은 GIL 때문에 스레드 풀에서 서로를 막으므로,
+# COMPUTE_WORKERS > 0 이면 프로세스 풀에서 실행하여 컨테이너의 모든 코어를 사용합니다.
+#
+# - 워커는 forkserver 로 만들고, 초기화 시 현재 세대의 스냅샷 (PRODUCT_SNAPSHOT_DIR) 을 mmap 으로 엽니다.
+#   (요청마다 카탈로그 전송 X, 여러 워커가 같은 페이지 캐시를 공유)
+#   요청에는 세대 번호와 키워드 / product_id 만 전달하고, 결과는 행 번호만 돌려받습니다.
+# - fork 는 쓰지 않습니다: 저장소 교체는 gRPC / Firestore 스레드가 도는 프로세스의 스레드 풀에서 일어나므로
+#   fork 한 자식이 다른 스레드가 잡고 있던 잠금을 물려받아 멈출 수 있습니다.
+# - 스냅샷에 저장된 세대만 풀을 사용합니다. 스냅샷이 없거나 (PRODUCT_SNAPSHOT_DIR 미설정 / 저장 전)
+#   워커가 연 스냅샷이 다른 세대면 기존처럼 스레드 풀에서 실행합니다.
+# - 저장소가 교체되면 다음 요청에서 새 세대로 풀을 다시 만들고, 이전 풀은 진행 중인 작업만 마치고 종료합니다.
+# - COMPUTE_WORKERS = 0 (기본) 이면 기존처럼 스레드 풀에서 실행합니다.
+# ---------------------------------------------------------------
+
+COMPUTE_WORKERS = int(os.environ.get("COMPUTE_WORKERS", 0))
+
+if COMPUTE_WORKERS > 0 and not os.environ.get("PRODUCT_SNAPSHOT_DIR"):
+    print("⚠️ [연산 풀] PRODUCT_SNAPSHOT_DIR 미설정 → 워커가 열 스냅샷이 없어 스레드 풀에서 계산")
+
+
+class StaleIndexes(Exception):
+    pass
+
+
+# 검색 1~3단계 순위 상위 k 개 행, 결과가 하나도 없으면 Fallback 결과 앞 k 개 행
+# → (행 목록, Fallback 여부)
+def search_rows(current, keywords: list[str], k: int) -> tuple[list[int], bool]:
+    results = current.search_index.top(keywords, k)
+    if results:
+        return results, False
+    return current.fallback_matcher.match(keywords)[:k], True
+
+
+# 실시간 추천 결과 행 (그룹에 없는 제품이면 None)
+def recommend_rows(current, product_id: str, limit: int):
+    model = current.recommend_model
+    located = model.locate(product_id)
+    if located is None:
+        return None
+
+    base_name = current.store.get(model.id_to_row[product_id], "product_name", "")
+    group, idx = located
+    cosine_scores = model.cosine_scores(group, idx)
+
+    scored_candidates = score_candidates(idx, cosine_scores, group["penalty"])
+    primary = name_filtered(group["names"], scored_candidates, base_name)
+    final_top = select_top(primary, scored_candidates, limit)
+    return [int(group["rows"][i]) for i in final_top]
+
+
+# --- 워커 프로세스 ---
+
+# 워커가 연 스냅샷의 부모 세대 번호
+_worker_generation = None
+
+
+def _snapshot_id(path: str):
+    with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+        return json.load(f).get("snapshot_id")
+
+
+# 부모 세대가 저장한 스냅샷을 mmap 으로 열어 같은 저장소·인덱스 구성
+def _init_worker(path: str, snapshot_id: str, generation: int):
+    global _worker_generation
+    from app.utils.indexes import build_product_indexes
+    from app.utils.product_store import ProductStore
+
+    # 여는 도중 스냅샷이 교체되지 않았는지 앞뒤로 확인 (다른 세대면 풀을 쓰지 않음)
+    current = None
+    if _snapshot_id(path) == snapshot_id:
+        current = build_product_indexes(ProductStore.load(path, mmap=True), None, path)
+    if current is None or _snapshot_id(path) != snapshot_id:
+        print(f"⚠️ [연산 풀] 세대 {generation} 스냅샷이 이미 교체됨 → 스레드 풀에서 계산")
+        raise StaleIndexes(generation)
+
+    cache.current = current
+    _worker_generation = generation
+
+
+def _warmup():
+    return os.getpid()
+
+
+def _run(fn, generation: int, *args):
+    current = cache.current
+    if current is None or _worker_generation != generation:
+        raise StaleIndexes(generation)
+    return fn(current, *args)
+
+
+# --- 부모 프로세스 ---
+
+_pool = None
+_pool_generation = None
+_pool_lock = threading.Lock()
+
+
+# 현재 세대 스냅샷을 연 프로세스 풀 (비활성 / 스냅샷 없음 / 이미 교체된 세대면 None)
+def _pool_for(current):
+    global _pool, _pool_generation
+    if COMPUTE_WORKERS <= 0:
+        return None
+
+    with _pool_lock:
+        if _pool is not None and _pool_generation == current.generation:
+            return _pool
+        if cache.current is not current:
+            return None
+
+        old, _pool, _pool_generation = _pool, None, current.generation
+        if old is not None:
+            old.shutdown(wait=False)
+        if current.snapshot_id is None:
+            return None
+
+        context = multiprocessing.get_context("forkserver")
+        # 워커마다 다시 import 하지 않도록 forkserver 에서 미리 적재
+        context.set_forkserver_preload(["app.utils.indexes"])
+        _pool = ProcessPoolExecutor(
+            max_workers=COMPUTE_WORKERS,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(current.snapshot_path, current.snapshot_id, current.generation),
+        )
+        # 워커를 미리 띄워 첫 요청에서 스냅샷을 여는 비용이 들지 않도록 함
+        for _ in range(COMPUTE_WORKERS):
+            _pool.submit(_warmup)
+        print(f"✅ [연산 풀] 워커 {COMPUTE_WORKERS}개 준비 (세대 {current.generation})")
+        return _pool
+
+
+# 현재 세대로 프로세스 풀을 미리 구성 (startup / 저장소 교체 직후 호출)
+def warm_compute_pool(current):
+    _pool_for(current)
+
+
+# fn(current, *args) 를 프로세스 풀에서 실행, 풀을 쓸 수 없으면 스레드 풀에서 실행
+async def run_compute(current, fn, *args):
+    pool = _pool_for(current)
+    if pool is not None:
+        try:
+            return await asyncio.wrap_future(pool.submit(_run, fn, current.generation, *args))
+        except (StaleIndexes, BrokenProcessPool, RuntimeError):
+            # 세대 불일치 / 워커 비정상 종료 / 교체 중 종료된 풀 → 스레드 풀에서 계산
+            pass
+    return await run_in_threadpool(fn, current, *args)
@@ -0,0 +1,19 @@
+# app/utils/detail_cache.py
+import os
+
+from app.utils.ttl_cache import TTLCache
+
+# ---------------------------------------------------------------
+# 📌 제품 상세 read-through 캐시
+# 메모리 저장소에 없는 제품(마지막 적재 이후 추가된 문서 등)만 Firestore 에서 조회하고,
+# 조회 결과(없는 문서 포함)를 TTL 동안 LRU 로 보관하여 같은 ID 의 반복 조회를 막습니다.
+#
+# - 최대 항목 수: DETAIL_CACHE_SIZE (기본 2,048)
+# - 유효 시간: DETAIL_CACHE_TTL 초 (기본 300)
+# - 제품 캐시가 다시 적재되면 전체 비웁니다.
+# ---------------------------------------------------------------
+
+DETAIL_CACHE_SIZE = int(os.environ.get("DETAIL_CACHE_SIZE", 2048))
+DETAIL_CACHE_TTL = float(os.environ.get("DETAIL_CACHE_TTL", 300))
+
+detail_cache = TTLCache(DETAIL_CACHE_SIZE, DETAIL_CACHE_TTL)
@@ -0,0 +1,122 @@
+# app/utils/fallback_matcher.py
+import os
+from collections import defaultdict
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from app.utils.mapped_index import RowGroups, TextList
+from app.utils.brandlabel import brand_label_map_kor_to_eng, brand_label_map_eng_to_kor
+from app.utils.text import get_clean_text, jamo_text
+
+# ---------------------------------------------------------------
+# 📌 Fallback 검색 엔진
+# 1차 검색 결과가 없을 때 사용하는 완화 조건 (fuzzy 70 + 자모 유사도 80) 을
+# 제품마다 fuzz 를 반복 호출하는 대신, 고유 문자열 목록에 대해
+# rapidfuzz.process.cdist 한 번으로 일괄 계산합니다.
+#
+# - 제품명 / 제조사(한·영 확장 포함) / 브랜드(한글) 를 고유 문자열로 모아 행 번호에 매핑
+# - 자모 문자열은 캐시 적재 시 한 번만 변환
+# - cdist 는 workers 로 멀티스레드 실행 (SEARCH_FUZZY_WORKERS, 기본 -1 = 전체 코어)
+# - 고유 문자열 / 자모 문자열 / 행 번호는 numpy 배열로 보관 (save() → 스냅샷, 다른 워커는 load() 로 mmap)
+#   cdist 에 넘길 문자열 list 는 match() 호출 시점에만 복원합니다.
+# ---------------------------------------------------------------
+
+PARTIAL_THRESHOLD = 70
+JAMO_THRESHOLD = 80
+FUZZY_WORKERS = int(os.environ.get("SEARCH_FUZZY_WORKERS", -1))
+
+
+# manufacturer 매핑 확장 (한글 ↔ 영어)
+def _expand_manufacturer(manufacturer_clean: str) -> set[str]:
+    expanded = {manufacturer_clean}
+    if manufacturer_clean in brand_label_map_kor_to_eng:
+        eng = brand_label_map_kor_to_eng[manufacturer_clean]
+        if isinstance(eng, list):
+            expanded.update([get_clean_text(e) for e in eng])
+        else:
+            expanded.add(get_clean_text(eng))
+    if manufacturer_clean in brand_label_map_eng_to_kor:
+        expanded.add(get_clean_text(brand_label_map_eng_to_kor[manufacturer_clean]))
+    return expanded
+
+
+class FallbackMatcher:
+    def __init__(self, store):
+        self.store = store
+        self.size = len(store)
+
+        owners = defaultdict(set)
+        expanded_cache = {}
+        columns = zip(
+            store.column("product_name", ""),
+            store.column("manufacturer", ""),
+            store.column("brand_name_kor", ""),
+        )
+        for row, (product_name, manufacturer, brand_kor) in enumerate(columns):
+            manufacturer_clean = get_clean_text(manufacturer)
+            if manufacturer_clean not in expanded_cache:
+                expanded_cache[manufacturer_clean] = _expand_manufacturer(manufacturer_clean)
+
+            owners[get_clean_text(product_name)].add(row)
+            owners[get_clean_text(brand_kor)].add(row)
+            for m in expanded_cache[manufacturer_clean]:
+                owners[m].add(row)
+
+        # 고유 문자열 → 해당 문자열을 가진 행 번호
+        texts = list(owners)
+        self.texts = TextList.from_list(texts)
+        self.jamo_texts = TextList.from_list([jamo_text(t) for t in texts])
+        self.owners = RowGroups.from_lists([sorted(owners[t]) for t in texts])
+
+    def save(self, path: str):
+        self.texts.save(path, "fallback_texts")
+        self.jamo_texts.save(path, "fallback_jamo")
+        self.owners.save(path, "fallback_owners")
+
+    # save() 로 저장한 매처 (mmap, 없으면 None)
+    @classmethod
+    def load(cls, store, path: str):
+        texts = TextList.load(path, "fallback_texts")
+        jamo_texts = TextList.load(path, "fallback_jamo")
+        owners = RowGroups.load(path, "fallback_owners")
+        if texts is None or jamo_texts is None or owners is None:
+            return None
+        matcher = cls.__new__(cls)
+        matcher.store = store
+        matcher.size = len(store)
+        matcher.texts = texts
+        matcher.jamo_texts = jamo_texts
+        matcher.owners = owners
+        return matcher
+
+    def _matched_columns(self, keywords: list[str]) -> np.ndarray:
+        partial = process.cdist(
+            keywords, self.texts.to_list(),
+            scorer=fuzz.partial_ratio,
+            score_cutoff=PARTIAL_THRESHOLD,
+            workers=FUZZY_WORKERS,
+        )
+        jamo = process.cdist(
+            [jamo_text(k) for k in keywords], self.jamo_texts.to_list(),
+            scorer=fuzz.ratio,
+            score_cutoff=JAMO_THRESHOLD,
+            workers=FUZZY_WORKERS,
+        )
+        hit = (partial >= PARTIAL_THRESHOLD).any(axis=0) | (jamo >= JAMO_THRESHOLD).any(axis=0)
+        return np.flatnonzero(hit)
+
+    # 완화 조건에 해당하는 행 번호 목록 (저장소 순서)
+    def match(self, keywords: list[str]) -> list[int]:
+        if not keywords or not self.texts:
+            return []
+
+        columns = self._matched_columns(keywords)
+        if not len(columns):
+            return []
+        rows = np.unique(self.owners.take(columns))
+        return rows.tolist()
+
+
+def build_fallback_matcher(store) -> FallbackMatcher:
+    return FallbackMatcher(store)
@@ -0,0 +1,86 @@
+# app/utils/firestore_loader.py
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ---------------------------------------------------------------
+# 📌 Firestore 분할 병렬 적재
+# start_after(last_doc) 로 1,000개씩 이어 받는 순차 조회는 앞 페이지가 끝나야 다음 페이지를 요청할 수 있어
+# 제품 수에 비례해 부팅 시간이 늘어납니다.
+#
+# DB_upload 스크립트가 문서 ID 를 product_0 … product_{N-1} 로 부여하므로
+# ID 구간을 미리 나누어 구간별 get_all() 을 스레드 풀에서 동시에 실행합니다.
+#
+# - 구간 크기: FIRESTORE_PARTITION_SIZE (기본 1,000)
+# - 동시 실행 수: FIRESTORE_LOAD_WORKERS (기본 8)
+# - db 는 collection().document() 와 get_all() 만 사용하므로 에뮬레이터나 가짜 클라이언트로 대체할 수 있습니다.
+# - ID 가 연속되지 않아 구간 조회로 total_count 개를 다 찾지 못하면 순차 조회(fallback)로 전체를 다시 적재합니다.
+# ---------------------------------------------------------------
+
+PARTITION_SIZE = int(os.environ.get("FIRESTORE_PARTITION_SIZE", 1000))
+LOAD_WORKERS = int(os.environ.get("FIRESTORE_LOAD_WORKERS", 8))
+ID_PREFIX = "product_"
+
+
+# 순차 조회(order_by("product_name"))와 같은 제품 순서: 제품명 → 문서 ID
+def product_order_key(product: dict):
+    return (str(product.get("product_name", "")), product["product_id"])
+
+
+# 0 … total_count-1 을 partition_size 단위 구간으로 분할
+def plan_partitions(total_count: int, partition_size: int = PARTITION_SIZE) -> list[range]:
+    return [range(start, min(start + partition_size, total_count)) for start in range(0, total_count, partition_size)]
+
+
+# 한 구간의 문서 조회 (존재하는 문서만, 구간 내 ID 순서)
+def fetch_partition(db, id_range: range, collection: str = "products") -> list:
+    col = db.collection(collection)
+    refs = [col.document(f"{ID_PREFIX}{i}") for i in id_range]
+    docs = {doc.id: doc for doc in db.get_all(refs) if doc.exists}
+    return [docs[ref.id] for ref in refs if ref.id in docs]
+
+
+# 전체 구간을 병렬로 조회하여 (변환된 제품 목록, 구간별 소요 시간) 반환
+# 한 구간이라도 실패하면 예외를 그대로 전달합니다.
+def load_partitioned(db, total_count: int, convert, partition_size: int = PARTITION_SIZE,
+                     workers: int = LOAD_WORKERS, collection: str = "products"):
+    partitions = plan_partitions(total_count, partition_size)
+
+    def run(index, id_range):
+        started = time.perf_counter()
+        products = [convert(doc) for doc in fetch_partition(db, id_range, collection)]
+        return products, {
+            "partition": index,
+            "start": id_range.start,
+            "end": id_range.stop,
+            "docs": len(products),
+            "sec": round(time.perf_counter() - started, 3),
+        }
+
+    products = []
+    timings = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(run, i, r) for i, r in enumerate(partitions)]
+        for future in futures:
+            part, timing = future.result()
+            products.extend(part)
+            timings.append(timing)
+    return products, timings
+
+
+# 구간 병렬 조회 후 순차 조회와 같은 순서로 정렬한 제품 목록
+# 구간 조회 결과가 total_count 보다 적으면 fallback(total_count) (기존 순차 조회) 결과를 그대로 반환
+def load_all_products(db, total_count: int, convert, fallback, partition_size: int = PARTITION_SIZE,
+                      workers: int = LOAD_WORKERS, collection: str = "products") -> list:
+    started = time.perf_counter()
+    products, timings = load_partitioned(db, total_count, convert, partition_size, workers, collection)
+    for t in timings:
+        print(f"ℹ️ [제품 캐시] 구간 {t['partition']} ({t['start']}~{t['end'] - 1}): {t['docs']}개, {t['sec']}초")
+    print(f"ℹ️ [제품 캐시] {len(timings)}개 구간 병렬 조회 {time.perf_counter() - started:.2f}초")
+
+    if len(products) < total_count:
+        print(f"⚠️ [제품 캐시] ID 구간 조회 {len(products)}개 < {total_count}개 → 순차 조회로 재적재")
+        return fallback(total_count)
+
+    products.sort(key=product_order_key)
+    return products
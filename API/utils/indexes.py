@@ -0,0 +1,122 @@
+# app/utils/indexes.py
+import itertools
+import os
+
+from app.utils import cache
+from app.utils.product_store import build_product_store
+from app.utils.search_index import SearchIndex, build_search_index
+from app.utils.fallback_matcher import FallbackMatcher, build_fallback_matcher
+from app.utils.category_index import build_category_index
+from app.utils.recommend_model import RecommendModel, build_recommend_model
+from app.utils.recommend_table import load_recommend_table
+from app.utils.response_cache import response_cache, build_product_fragments, save_product_fragments, load_product_fragments
+from app.utils.detail_cache import detail_cache
+from app.utils.search_memo import search_memo
+from app.utils.compute import warm_compute_pool
+from app.utils.projection import build_views, save_views
+
+# ---------------------------------------------------------------
+# 📌 파생 인덱스 일괄 구성
+# 제품 저장소를 교체할 때 검색 / 카테고리 / 추천 / 응답 직렬화 인덱스를 함께 다시 만듭니다.
+#
+# 저장소와 인덱스는 ProductIndexes 하나로 묶어 모두 구성한 뒤 cache.current 에 한 번에 대입하므로,
+# 요청 처리 중에 저장소만 새것이고 인덱스는 이전 것인 상태를 볼 수 없습니다.
+# 라우트는 요청 시작 시 current_indexes() 로 한 번만 읽어 같은 세대를 끝까지 사용합니다.
+#
+# snapshot_path 를 주면 save() 로 스냅샷에 함께 저장된 제품 JSON 조각 / profile 조각 /
+# 검색 · Fallback · 추천 인덱스 배열을 mmap 으로 열어 그대로 사용하고, 없는 것만 저장소에서 다시 구성합니다.
+# (다중 워커에서 leader 만 구성하고 나머지 워커는 같은 페이지 캐시를 공유)
+# ---------------------------------------------------------------
+
+_generations = itertools.count(1)
+
+
+# 스냅샷에 저장된 파생 인덱스 (없거나 읽지 못하면 None → 다시 구성)
+def _attach(label: str, load, store, path: str):
+    if not path:
+        return None
+    try:
+        return load(store, path)
+    except Exception as e:
+        print(f"⚠️ [스냅샷] {label} 적재 실패 → 다시 구성: {e}")
+        return None
+
+
+class ProductIndexes:
+    def __init__(self, store, data_version=None, snapshot_path=None, snapshot_id=None):
+        self.store = store
+        # 적재 기준 metadata/products_metadata.last_updated (증분 갱신 기준점)
+        self.data_version = data_version
+        # 응답 캐시 키에 포함하여 이전 세대로 계산된 응답이 섞이지 않도록 함
+        self.generation = next(_generations)
+        # 이 세대가 저장된 스냅샷 (연산 풀 워커가 같은 스냅샷을 열어 사용, 없으면 None)
+        self.snapshot_path = snapshot_path if snapshot_id else None
+        self.snapshot_id = snapshot_id
+
+        self.search_index = (
+            _attach("검색 인덱스", SearchIndex.load, store, snapshot_path) or build_search_index(store)
+        )
+        self.fallback_matcher = (
+            _attach("Fallback 인덱스", FallbackMatcher.load, store, snapshot_path) or build_fallback_matcher(store)
+        )
+
+        # 카테고리 인덱스
+        self.category_index = build_category_index(store)
+
+        # 추천 모델 (그룹별 TF-IDF 는 첫 요청 시 학습 후 재사용)
+        self.recommend_model = (
+            _attach("추천 인덱스", RecommendModel.load, store, snapshot_path) or build_recommend_model(store)
+        )
+        self.recommend_table = load_recommend_table(os.environ.get("RECOMMEND_TABLE_DIR"), store)
+
+        # product_id → 행 번호 (추천 모델과 공유, 상세 조회에 사용)
+        self.id_to_row = self.recommend_model.id_to_row
+
+        # 제품 JSON 직렬화 (1회, 스냅샷에 저장된 조각이 있으면 그대로 사용)
+        fragments = _attach("제품 JSON 조각", load_product_fragments, store, snapshot_path)
+        self.product_fragments = fragments if fragments is not None else build_product_fragments(store)
+
+        # profile 별 필드 선택 조각 (list / detail)
+        self.views = build_views(store, self.product_fragments, snapshot_path)
+
+    # 스냅샷 디렉터리에 파생 인덱스 저장 (snapshot_path 로 다시 열 수 있는 형태)
+    def save(self, path: str):
+        save_product_fragments(self.product_fragments, path)
+        save_views(self.views, path)
+        self.search_index.save(path)
+        self.fallback_matcher.save(path)
+        self.recommend_model.save(path)
+
+    # save_snapshot() 으로 저장된 뒤 호출: 연산 풀 워커가 이 스냅샷을 열 수 있도록 표시
+    def mark_saved(self, path: str, snapshot_id: str):
+        self.snapshot_path = path
+        self.snapshot_id = snapshot_id
+        warm_compute_pool(self)
+
+
+def build_product_indexes(store, data_version=None, snapshot_path=None, snapshot_id=None) -> ProductIndexes:
+    return ProductIndexes(store, data_version, snapshot_path, snapshot_id)
+
+
+def install_product_store(store, data_version=None, snapshot_path=None, snapshot_id=None) -> ProductIndexes:
+    indexes = build_product_indexes(store, data_version, snapshot_path, snapshot_id)
+    print(f"✅ [검색 인덱스] {indexes.search_index.size}개 제품 색인 완료")
+
+    cache.current = indexes
+
+    # 이전 저장소 기준 응답 / 상세 조회 / 검색 결과 비우기
+    response_cache.clear()
+    detail_cache.clear()
+    search_memo.clear()
+
+    # 프로세스 풀 사용 시 새 세대 스냅샷을 연 워커로 교체 (스냅샷 저장 전이면 mark_saved() 에서)
+    warm_compute_pool(indexes)
+    return indexes
+
+
+# 현재 세대 (아직 적재 전이면 빈 저장소로 구성)
+def current_indexes() -> ProductIndexes:
+    indexes = cache.current
+    if indexes is None:
+        indexes = install_product_store(build_product_store([]))
+    return indexes
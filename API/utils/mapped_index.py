@@ -0,0 +1,192 @@
+# app/utils/mapped_index.py
+import os
+
+import numpy as np
+
+from app.utils.product_store import StringTable
+
+# ---------------------------------------------------------------
+# 📌 스냅샷 공유용 인덱스 배열
+# 검색 / Fallback / 추천 인덱스를 워커마다 파이썬 dict · list 로 다시 만들지 않도록
+# 키 → 행 번호 목록을 numpy 배열로만 보관하고, 스냅샷 디렉터리에 .npy 로 저장해
+# 다른 워커는 읽기 전용 mmap 으로 엽니다. (여러 워커가 같은 페이지 캐시를 공유)
+#
+# - RowGroups : 위치 i → 행 번호 목록 (offsets + rows, CSR)
+# - Postings  : 문자열 키 → 행 번호 목록 (정렬된 고정 길이 유니코드 키 배열 + RowGroups, 이진 탐색)
+# - KeyIndex  : 문자열 키 → 첫 행 번호 (product_id → 행)
+# - TextList  : 문자열 목록 (구분자로 이어 붙인 UTF-16 바이트, 필요할 때 list 로 복원)
+#
+# load_*() 는 파일이 없으면 None 을 반환하며, 호출하는 쪽에서 저장소로부터 다시 구성합니다.
+# ---------------------------------------------------------------
+
+TEXT_SEPARATOR = "\x00"
+TEXT_ENCODING = "utf-16-le"
+
+
+def save_arrays(path: str, name: str, **arrays):
+    for key, array in arrays.items():
+        np.save(os.path.join(path, f"{name}_{key}.npy"), np.ascontiguousarray(array))
+
+
+# save_arrays() 로 저장한 배열 (mmap), 하나라도 없으면 None
+def load_arrays(path: str, name: str, *keys):
+    paths = [os.path.join(path, f"{name}_{key}.npy") for key in keys]
+    if not all(os.path.exists(p) for p in paths):
+        return None
+    return [np.load(p, mmap_mode="r") for p in paths]
+
+
+def save_strings(table: StringTable, path: str, name: str):
+    save_arrays(path, name, data=table.data, offsets=table.offsets)
+
+
+def load_strings(path: str, name: str):
+    arrays = load_arrays(path, name, "data", "offsets")
+    return StringTable.from_arrays(*arrays) if arrays is not None else None
+
+
+class RowGroups:
+    def __init__(self, offsets: np.ndarray, rows: np.ndarray):
+        self.offsets = offsets
+        self.rows = rows
+
+    @classmethod
+    def from_lists(cls, groups: list) -> "RowGroups":
+        offsets = np.zeros(len(groups) + 1, dtype=np.int64)
+        if groups:
+            np.cumsum([len(g) for g in groups], out=offsets[1:])
+        rows = np.fromiter((r for g in groups for r in g), dtype=np.int32, count=int(offsets[-1]))
+        return cls(offsets, rows)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        return self.rows[self.offsets[i]:self.offsets[i + 1]]
+
+    # 여러 위치의 행 번호를 이어 붙인 배열 (위치마다 슬라이스하지 않고 한 번에)
+    def take(self, positions) -> np.ndarray:
+        positions = np.asarray(positions, dtype=np.int64)
+        starts = self.offsets[positions]
+        counts = self.offsets[positions + 1] - starts
+        heads = np.cumsum(counts) - counts
+        return self.rows[np.repeat(starts - heads, counts) + np.arange(int(counts.sum()))]
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + self.rows.nbytes
+
+    def save(self, path: str, name: str):
+        save_arrays(path, name, offsets=self.offsets, rows=self.rows)
+
+    @classmethod
+    def load(cls, path: str, name: str):
+        arrays = load_arrays(path, name, "offsets", "rows")
+        return cls(*arrays) if arrays is not None else None
+
+
+class Postings:
+    def __init__(self, keys: np.ndarray, groups: RowGroups):
+        # 정렬된 고정 길이 유니코드 배열 (np.searchsorted 로 조회)
+        self.keys = keys
+        self.groups = groups
+
+    @classmethod
+    def from_dict(cls, table: dict):
+        keys = sorted(table)
+        width = max((len(k) for k in keys), default=0) or 1
+        return cls(np.array(keys, dtype=f"<U{width}"), RowGroups.from_lists([table[k] for k in keys]))
+
+    def __len__(self):
+        return len(self.keys)
+
+    # 키의 위치 (없거나 문자열이 아니면 -1)
+    def find(self, key) -> int:
+        if not isinstance(key, str) or not len(self.keys):
+            return -1
+        i = int(np.searchsorted(self.keys, key))
+        if i < len(self.keys) and self.keys[i] == key:
+            return i
+        return -1
+
+    def get(self, key, default=None):
+        i = self.find(key)
+        return self.groups[i] if i >= 0 else default
+
+    @property
+    def nbytes(self) -> int:
+        return self.keys.nbytes + self.groups.nbytes
+
+    def save(self, path: str, name: str):
+        save_arrays(path, name, keys=self.keys)
+        self.groups.save(path, name)
+
+    @classmethod
+    def load(cls, path: str, name: str):
+        keys = load_arrays(path, name, "keys")
+        groups = RowGroups.load(path, name)
+        if keys is None or groups is None:
+            return None
+        return cls(keys[0], groups)
+
+
+# 키 → 첫 행 번호 (dict 처럼 get / in / [] / values() 지원)
+class KeyIndex(Postings):
+    @classmethod
+    def from_dict(cls, table: dict):
+        return super().from_dict({key: (row,) for key, row in table.items()})
+
+    def get(self, key, default=None):
+        i = self.find(key)
+        return int(self.groups.rows[i]) if i >= 0 else default
+
+    def __contains__(self, key):
+        return self.find(key) >= 0
+
+    def __getitem__(self, key) -> int:
+        i = self.find(key)
+        if i < 0:
+            raise KeyError(key)
+        return int(self.groups.rows[i])
+
+    # 행 번호 (저장소 순서)
+    def values(self) -> list[int]:
+        return np.sort(self.groups.rows).tolist()
+
+
+class TextList:
+    def __init__(self, data: np.ndarray, count: int):
+        self.data = data
+        self.count = count
+
+    # UTF-16 으로 저장 (한글 / 자모 문자열은 UTF-8 보다 작고 list 복원 시 디코딩이 빠름)
+    @classmethod
+    def from_list(cls, texts: list[str]) -> "TextList":
+        joined = TEXT_SEPARATOR.join(texts)
+        if texts and joined.count(TEXT_SEPARATOR) != len(texts) - 1:
+            raise ValueError("구분자가 포함된 문자열은 저장할 수 없습니다.")
+        return cls(np.frombuffer(joined.encode(TEXT_ENCODING), dtype=np.uint8), len(texts))
+
+    def __len__(self):
+        return self.count
+
+    # 전체 문자열 list (rapidfuzz.process.cdist 처럼 list 가 필요한 곳에서 호출 시점에만 복원)
+    def to_list(self) -> list[str]:
+        if not self.count:
+            return []
+        return str(memoryview(self.data), TEXT_ENCODING).split(TEXT_SEPARATOR)
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def save(self, path: str, name: str):
+        save_arrays(path, name, data=self.data, count=np.array([self.count], dtype=np.int64))
+
+    @classmethod
+    def load(cls, path: str, name: str):
+        arrays = load_arrays(path, name, "data", "count")
+        if arrays is None:
+            return None
+        data, count = arrays
+        return cls(data, int(count[0]))
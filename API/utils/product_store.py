@@ -0,0 +1,387 @@
+# app/utils/product_store.py
+import json
+import os
+import pickle
+import sys
+
+import numpy as np
+from pympler import asizeof
+
+# ---------------------------------------------------------------
+# 📌 컬럼형 제품 저장소
+# Firestore 문서를 그대로 담은 dict 리스트 대신, 필드별 컬럼으로 보관해 메모리를 줄입니다.
+#
+# - 영양성분 등 숫자 필드    : NumPy float64 배열 (None → NaN) + 정수였던 값 표시 (int 로 되돌림)
+# - big_category / category / manufacturer : 필드별 고유값 목록 + int32 코드
+# - 그 밖의 문자열 필드      : 전체 공유 문자열 테이블 (UTF-8 바이트 + 오프셋) + int32 코드
+# - raw_materials 같은 dict  : 하위 키별 문자열 컬럼으로 펼쳐 저장 ("raw_materials.safe")
+# - 위에 해당하지 않는 값    : 파이썬 객체 리스트
+#
+# 행 dict 는 응답에 필요한 행에 대해서만 row() / rows() 로 만들어 반환합니다.
+# 숫자는 원본과 같은 값 / 타입 (1234.5678 → 1234.5678, 100 → 100) 으로,
+# 키 순서는 문서마다의 원래 순서 (중첩 dict 의 하위 키 포함, 고유 순서 목록 + 행별 코드) 로 되돌립니다.
+#
+# save() / load() 로 배열을 .npy 파일 묶음으로 저장하고, 읽을 때는 mmap 으로 엽니다.
+# ---------------------------------------------------------------
+
+NUMERIC_FIELDS = {
+    "energy_kcal", "protein_g", "fat_g", "carbs_g", "sugar_g", "fiber_g",
+    "calcium_mg", "iron_mg", "phosphorus_mg", "potassium_mg", "sodium_mg",
+    "vitamin_a", "beta_carotene", "thiamine", "riboflavin", "niacin",
+    "vitamin_c", "vitamin_d", "biotin", "vitamin_b6", "vitamin_b12", "folate",
+    "pantothenic_acid", "vitamin_d3", "cholesterol", "saturated_fatty_acid",
+    "trans_fat", "vitamin_e", "vitamin_k", "vitamin_k1", "sugar_alcohol",
+    "allulose", "erythritol", "unsaturated_fat", "epa_dha", "linoleic_acid",
+    "alpha_linolenic_acid", "omega3", "omega6", "oleic_acid", "copper",
+    "magnesium", "manganese", "molybdenum", "selenium", "zinc", "chloride",
+    "iodine", "chromium", "lysine", "leucine", "methionine", "valine",
+    "arginine", "isoleucine", "taurine", "threonine", "tryptophan",
+    "phenylalanine", "histidine", "zero_certification"
+}
+CATEGORICAL_FIELDS = {"big_category", "category", "manufacturer"}
+
+ABSENT = -1      # 해당 행에 필드 자체가 없음
+NONE_CODE = -2   # 필드 값이 None
+
+_MISSING = object()
+MAX_EXACT_INT = 2 ** 53   # float64 로 정확히 표현되는 정수 범위
+
+
+class StringTable:
+    def __init__(self, strings: list[str]):
+        encoded = [s.encode("utf-8") for s in strings]
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            np.cumsum([len(b) for b in encoded], out=self.offsets[1:])
+        self.data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def get(self, code: int) -> str:
+        return self.get_bytes(code).decode("utf-8")
+
+    def __getitem__(self, code: int) -> str:
+        return self.get(code)
+
+    # 여러 코드를 한 번에 디코딩 (코드마다 get() 하는 것보다 빠름)
+    def take(self, codes) -> list[str]:
+        codes = np.asarray(codes, dtype=np.int64)
+        data = memoryview(self.data)
+        starts = self.offsets[codes].tolist()
+        ends = self.offsets[codes + 1].tolist()
+        return [str(data[s:e], "utf-8") for s, e in zip(starts, ends)]
+
+    def get_bytes(self, code: int) -> bytes:
+        return self.data[self.offsets[code]:self.offsets[code + 1]].tobytes()
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + self.offsets.nbytes
+
+    @classmethod
+    def from_arrays(cls, data: np.ndarray, offsets: np.ndarray) -> "StringTable":
+        table = cls.__new__(cls)
+        table.data = data
+        table.offsets = offsets
+        return table
+
+
+def _is_number(value) -> bool:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return abs(value) <= MAX_EXACT_INT
+    return value is None or isinstance(value, float)
+
+
+def _kind(values: list) -> str:
+    present = [v for v in values if v is not _MISSING]
+    if all(isinstance(v, dict) and all(isinstance(x, str) for x in v.values()) for v in present) and present:
+        return "nested"
+    if all(_is_number(v) for v in present):
+        return "numeric"
+    if all(v is None or isinstance(v, str) for v in present):
+        return "text"
+    return "object"
+
+
+class ProductStore:
+    def __init__(self, products: list[dict]):
+        self.size = len(products)
+
+        # 필드 순서 (처음 등장한 순서) + 중첩 dict 하위 키 순서
+        self.fields = []
+        seen = set()
+        for p in products:
+            for field in p:
+                if field not in seen:
+                    seen.add(field)
+                    self.fields.append(field)
+
+        self.kinds = {}
+        self.numeric = {}
+        self.numeric_present = {}
+        self.numeric_int = {}
+        self.categorical = {}
+        self.text = {}
+        self.objects = {}
+        self.nested = {}
+
+        strings = {}
+
+        def intern(value) -> int:
+            if value is None:
+                return NONE_CODE
+            code = strings.get(value)
+            if code is None:
+                code = strings[value] = len(strings)
+            return code
+
+        for field in self.fields:
+            values = [p.get(field, _MISSING) for p in products]
+            kind = _kind(values)
+            if kind == "numeric" and field not in NUMERIC_FIELDS:
+                kind = "text" if all(v is _MISSING or v is None for v in values) else "object"
+            if kind == "text" and field in CATEGORICAL_FIELDS:
+                kind = "categorical"
+            self.kinds[field] = kind
+
+            if kind == "numeric":
+                self.numeric[field] = np.array(
+                    [np.nan if v is None or v is _MISSING else v for v in values], dtype=np.float64
+                )
+                present = np.array([v is not _MISSING for v in values], dtype=bool)
+                self.numeric_present[field] = None if present.all() else present
+                ints = np.array([isinstance(v, int) for v in values], dtype=bool)
+                self.numeric_int[field] = ints if ints.any() else None
+            elif kind == "categorical":
+                categories = {}
+                codes = np.empty(self.size, dtype=np.int32)
+                for i, v in enumerate(values):
+                    if v is _MISSING:
+                        codes[i] = ABSENT
+                    else:
+                        codes[i] = categories.setdefault(v, len(categories))
+                self.categorical[field] = (list(categories), codes)
+            elif kind == "text":
+                self.text[field] = np.array(
+                    [ABSENT if v is _MISSING else intern(v) for v in values], dtype=np.int32
+                )
+            elif kind == "nested":
+                keys = []
+                for v in values:
+                    if v is not _MISSING:
+                        keys.extend(k for k in v if k not in keys)
+                present = np.array([v is not _MISSING for v in values], dtype=bool)
+                self.nested[field] = (keys, present)
+                for key in keys:
+                    self.text[f"{field}.{key}"] = np.array(
+                        [ABSENT if v is _MISSING or key not in v else intern(v[key]) for v in values],
+                        dtype=np.int32
+                    )
+            else:
+                self.objects[field] = values
+
+        self.strings = StringTable(list(strings))
+
+        # 행별 키 순서: (필드, 중첩 dict 하위 키 순서) 목록을 고유하게 모아 두고 행마다 코드로 참조
+        layouts = {}
+        self.layout_codes = np.empty(self.size, dtype=np.int32)
+        for i, p in enumerate(products):
+            layout = tuple(
+                (field, tuple(value) if self.kinds[field] == "nested" else None)
+                for field, value in p.items()
+            )
+            self.layout_codes[i] = layouts.setdefault(layout, len(layouts))
+        self.layouts = [dict(layout) for layout in layouts]
+
+    def __len__(self):
+        return self.size
+
+    # 단일 값 조회 (필드가 없으면 default)
+    def get(self, row: int, field: str, default=None):
+        kind = self.kinds.get(field)
+        if kind is None:
+            if field in self.text:
+                return self._text_value(self.text[field][row], default)
+            return default
+
+        if kind == "numeric":
+            present = self.numeric_present[field]
+            if present is not None and not present[row]:
+                return default
+            value = self.numeric[field][row]
+            if np.isnan(value):
+                return None
+            ints = self.numeric_int[field]
+            return int(value) if ints is not None and ints[row] else float(value)
+        if kind == "categorical":
+            categories, codes = self.categorical[field]
+            code = codes[row]
+            return default if code == ABSENT else categories[code]
+        if kind == "text":
+            return self._text_value(self.text[field][row], default)
+        if kind == "nested":
+            keys, present = self.nested[field]
+            if not present[row]:
+                return default
+            out = {}
+            for key in self.layouts[self.layout_codes[row]][field]:
+                code = self.text[f"{field}.{key}"][row]
+                if code != ABSENT:
+                    out[key] = self._text_value(code, None)
+            return out
+        value = self.objects[field][row]
+        return default if value is _MISSING else value
+
+    def _text_value(self, code, default):
+        if code == ABSENT:
+            return default
+        if code == NONE_CODE:
+            return None
+        return self.strings.get(code)
+
+    # 필드 전체 값 목록 (인덱스 구성용). "raw_materials.safe" 처럼 하위 키도 지정 가능
+    def column(self, field: str, default=None) -> list:
+        kind = self.kinds.get(field)
+        if kind == "categorical":
+            categories, codes = self.categorical[field]
+            return [default if c == ABSENT else categories[c] for c in codes.tolist()]
+        if kind == "text" or (kind is None and field in self.text):
+            decoded = {}
+            out = []
+            for code in self.text[field].tolist():
+                if code not in decoded:
+                    decoded[code] = self._text_value(code, default)
+                out.append(decoded[code])
+            return out
+        return [self.get(row, field, default) for row in range(self.size)]
+
+    # 행 dict 생성 (fields 를 주면 해당 필드만)
+    def row(self, row: int, fields=None) -> dict:
+        out = {}
+        for field in (self.layouts[self.layout_codes[row]] if fields is None else fields):
+            value = self.get(row, field, _MISSING)
+            if value is not _MISSING:
+                out[field] = value
+        return out
+
+    def rows(self, indices, fields=None) -> list[dict]:
+        return [self.row(int(i), fields) for i in indices]
+
+    def __getitem__(self, row: int) -> dict:
+        return self.row(row)
+
+    def __iter__(self):
+        for row in range(self.size):
+            yield self.row(row)
+
+    # 실제 메모리 사용량 (바이트)
+    def footprint(self) -> dict:
+        numeric = sum(a.nbytes for a in self.numeric.values())
+        numeric += sum(m.nbytes for m in self.numeric_present.values() if m is not None)
+        numeric += sum(m.nbytes for m in self.numeric_int.values() if m is not None)
+        numeric += sum(present.nbytes for _, present in self.nested.values())
+        categorical = sum(codes.nbytes + asizeof.asizeof(categories) for categories, codes in self.categorical.values())
+        text = sum(codes.nbytes for codes in self.text.values()) + self.strings.nbytes
+        objects = asizeof.asizeof(self.objects) if self.objects else 0
+        layout = self.layout_codes.nbytes + asizeof.asizeof(self.layouts)
+        return {
+            "numeric": numeric,
+            "categorical": categorical,
+            "text": text,
+            "objects": objects,
+            "layout": layout,
+            "total": numeric + categorical + text + objects + layout + sys.getsizeof(self.fields),
+        }
+
+
+    # 디렉터리에 저장: 배열은 .npy, 구조 정보는 store.json, 기타 객체 컬럼은 objects.pkl
+    def save(self, path: str):
+        arrays = {"strings_data": self.strings.data, "strings_offsets": self.strings.offsets}
+        columns = {"numeric": {}, "numeric_present": {}, "numeric_int": {}, "categorical": {}, "text": {}, "nested": {}}
+
+        def add(array) -> str:
+            name = f"a{len(arrays)}"
+            arrays[name] = array
+            return name
+
+        for field, array in self.numeric.items():
+            columns["numeric"][field] = add(array)
+            present = self.numeric_present[field]
+            columns["numeric_present"][field] = None if present is None else add(present)
+            ints = self.numeric_int[field]
+            columns["numeric_int"][field] = None if ints is None else add(ints)
+        for field, (categories, codes) in self.categorical.items():
+            columns["categorical"][field] = {"categories": categories, "codes": add(codes)}
+        for field, codes in self.text.items():
+            columns["text"][field] = add(codes)
+        for field, (keys, present) in self.nested.items():
+            columns["nested"][field] = {"keys": keys, "present": add(present)}
+        columns["layout_codes"] = add(self.layout_codes)
+
+        for name, array in arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(array))
+
+        with open(os.path.join(path, "objects.pkl"), "wb") as f:
+            pickle.dump(
+                {field: [None if v is _MISSING else (v,) for v in values] for field, values in self.objects.items()},
+                f
+            )
+        with open(os.path.join(path, "store.json"), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "size": self.size,
+                    "fields": self.fields,
+                    "kinds": self.kinds,
+                    "layouts": [list(layout.items()) for layout in self.layouts],
+                    "columns": columns,
+                },
+                f, ensure_ascii=False
+            )
+
+    # save() 로 저장한 디렉터리 적재 (mmap=True 면 배열을 읽기 전용 메모리 맵으로 열기)
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "ProductStore":
+        with open(os.path.join(path, "store.json"), encoding="utf-8") as f:
+            layout = json.load(f)
+        with open(os.path.join(path, "objects.pkl"), "rb") as f:
+            objects = pickle.load(f)
+
+        def array(name):
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None)
+
+        columns = layout["columns"]
+        store = cls.__new__(cls)
+        store.size = layout["size"]
+        store.fields = layout["fields"]
+        store.kinds = layout["kinds"]
+        store.numeric = {field: array(name) for field, name in columns["numeric"].items()}
+        store.numeric_present = {
+            field: None if name is None else array(name)
+            for field, name in columns["numeric_present"].items()
+        }
+        store.numeric_int = {
+            field: None if name is None else array(name)
+            for field, name in columns["numeric_int"].items()
+        }
+        store.categorical = {
+            field: (column["categories"], array(column["codes"]))
+            for field, column in columns["categorical"].items()
+        }
+        store.text = {field: array(name) for field, name in columns["text"].items()}
+        store.nested = {
+            field: (column["keys"], array(column["present"]))
+            for field, column in columns["nested"].items()
+        }
+        store.objects = {
+            field: [_MISSING if v is None else v[0] for v in values]
+            for field, values in objects.items()
+        }
+        store.strings = StringTable.from_arrays(array("strings_data"), array("strings_offsets"))
+        store.layouts = [dict(entry) for entry in layout["layouts"]]
+        store.layout_codes = array(columns["layout_codes"])
+        return store
+
+
+def build_product_store(products: list[dict]) -> ProductStore:
+    return ProductStore(products)
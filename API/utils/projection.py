@@ -0,0 +1,67 @@
+# app/utils/projection.py
+from app.utils.response_cache import dumps, build_product_fragments, save_product_fragments, load_product_fragments
+
+# ---------------------------------------------------------------
+# 📌 응답 필드 선택 (projection)
+# 목록 화면은 제품명 / 제조사 / 이미지 / 안전성 배지만 쓰므로, 영양성분 70여 개와
+# 원재료 전문이 포함된 전체 문서를 매번 보내지 않도록 profile / fields 파라미터를 제공합니다.
+#
+# - profile=list   : LIST_FIELDS 만 담은 조각을 캐시 적재 시 미리 직렬화 (ProductIndexes.views, 스냅샷에 저장 → 다른 워커는 mmap)
+# - profile=detail : 전체 문서 (기존 응답과 동일)
+# - fields=a,b,c   : 임의 필드 조합은 요청된 행만 그때그때 직렬화
+# ---------------------------------------------------------------
+
+LIST_FIELDS = ("product_id", "product_name", "manufacturer", "image_url", "safety_message")
+
+PROFILES = {
+    "list": LIST_FIELDS,
+    "detail": None,
+}
+
+
+# 요청한 행만 지정 필드로 직렬화 (미리 만든 조각과 같은 방식으로 join_rows / ndjson_response 에 사용)
+class RowProjection:
+    def __init__(self, store, fields: tuple[str, ...]):
+        self.store = store
+        self.fields = fields
+
+    def __len__(self):
+        return len(self.store)
+
+    def __getitem__(self, row: int) -> bytes:
+        return dumps(self.store.row(int(row), self.fields))
+
+
+# profile 별로 미리 직렬화한 조각 (detail 은 전체 문서 조각을 그대로 사용)
+# path 를 주면 save_views() 로 스냅샷에 저장된 조각을 mmap 으로 열고, 없을 때만 직렬화
+def build_views(store, fragments, path: str = None) -> dict:
+    views = {}
+    for name, fields in PROFILES.items():
+        if fields is None:
+            views[name] = fragments
+            continue
+        mapped = load_product_fragments(store, path, f"view_{name}") if path else None
+        views[name] = mapped if mapped is not None else build_product_fragments(store, fields)
+    return views
+
+
+def save_views(views: dict, path: str):
+    for name, fields in PROFILES.items():
+        if fields is not None:
+            save_product_fragments(views[name], path, f"view_{name}")
+
+
+# profile / fields 파라미터 → (응답 캐시 키에 넣을 값, 조각)
+# 알 수 없는 profile 이나 필드면 ValueError
+def resolve_view(current, profile: str | None, fields: str | None, default: str = "detail"):
+    if fields:
+        selected = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = [f for f in selected if f not in current.store.fields]
+        if not selected or unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return ("fields", selected), RowProjection(current.store, selected)
+
+    profile = profile or default
+    if profile not in current.views:
+        raise ValueError(f"Unknown profile: {profile}")
+    return ("profile", profile), current.views[profile]
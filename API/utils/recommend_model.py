@@ -0,0 +1,214 @@
+# app/utils/recommend_model.py
+import threading
+from collections import defaultdict
+
+import numpy as np
+from rapidfuzz import fuzz
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import linear_kernel
+
+from app.utils.mapped_index import KeyIndex, Postings, save_arrays, load_arrays
+
+# ---------------------------------------------------------------
+# 📌 추천 모델
+# /recommend 요청마다 DataFrame 생성 + TfidfVectorizer 학습을 반복하지 않도록
+# 그룹(category, 부족 시 big_category)별 TF-IDF 행렬을 한 번만 학습해 메모이즈합니다.
+#
+# - product_id → 제품 저장소 행 번호
+# - category / big_category → 그룹에 속한 행 번호 (저장소 순서)
+# - 그룹별 학습 결과: 희소 TF-IDF 행렬 + 행 번호 → 그룹 내 위치 + 위치 가감점
+#
+# TF-IDF 행은 L2 정규화되어 있으므로 코사인 유사도는 행 × 행렬 내적 한 번으로 계산됩니다.
+# product_id / 그룹 인덱스와 위치 가감점은 numpy 배열로 보관하여 스냅샷에 저장하고 (save / load, mmap),
+# 그룹별 TF-IDF 는 각 프로세스에서 첫 요청 시 학습합니다. (전체 추천 결과 공유는 RECOMMEND_TABLE_DIR)
+# ---------------------------------------------------------------
+
+MIN_CATEGORY_SIZE = 5
+COMBINED_FIELDS = ("product_name", "category", "raw_materials")
+NAME_FILTER_POOL = 200
+NAME_FILTER_THRESHOLD = 40
+
+
+def _text(value) -> str:
+    return value if isinstance(value, str) else ""
+
+
+# 추천용 결합 텍스트 (제품명 + 소분류 + 원재료 분류)
+def get_combined(product: dict) -> str:
+    rm = product.get("raw_materials")
+    if not isinstance(rm, dict):
+        rm = {}
+    return " ".join([
+        _text(product.get("product_name", "")),
+        _text(product.get("category", "")),
+        _text(rm.get("safe", "")),
+        _text(rm.get("caution", "")),
+        _text(rm.get("warning", "")),
+        _text(rm.get("etc", ""))
+    ])
+
+
+class RecommendModel:
+    def __init__(self, store):
+        self.store = store
+        self.size = len(store)
+        id_to_row = {}
+        group_rows = {"category": defaultdict(list), "big_category": defaultdict(list)}
+        categories = store.column("category")
+        big_categories = store.column("big_category")
+
+        for row, product_id in enumerate(store.column("product_id")):
+            if product_id is None:
+                continue
+            id_to_row.setdefault(str(product_id), row)
+            for field, values in (("category", categories), ("big_category", big_categories)):
+                if isinstance(values[row], str):
+                    group_rows[field][values[row]].append(row)
+
+        self.id_to_row = KeyIndex.from_dict(id_to_row)
+        self.group_rows = {field: Postings.from_dict(rows) for field, rows in group_rows.items()}
+
+        # 저장소 행 순서와 정렬된 위치 가감점 배열
+        self.penalty = np.array(
+            [position_penalty(p) for p in store.rows(range(self.size), fields=("raw_materials",))],
+            dtype=np.float64
+        )
+
+        self._groups = {}
+        self._lock = threading.Lock()
+
+    def save(self, path: str):
+        self.id_to_row.save(path, "recommend_ids")
+        for field, rows in self.group_rows.items():
+            rows.save(path, f"recommend_{field}")
+        save_arrays(path, "recommend", penalty=self.penalty)
+
+    # save() 로 저장한 모델 (mmap, 없거나 저장소와 크기가 다르면 None)
+    @classmethod
+    def load(cls, store, path: str):
+        id_to_row = KeyIndex.load(path, "recommend_ids")
+        group_rows = {field: Postings.load(path, f"recommend_{field}") for field in ("category", "big_category")}
+        penalty = load_arrays(path, "recommend", "penalty")
+        if id_to_row is None or None in group_rows.values() or penalty is None or len(penalty[0]) != len(store):
+            return None
+
+        model = cls.__new__(cls)
+        model.store = store
+        model.size = len(store)
+        model.id_to_row = id_to_row
+        model.group_rows = group_rows
+        model.penalty = penalty[0]
+        model._groups = {}
+        model._lock = threading.Lock()
+        return model
+
+    # 기준 제품이 속할 그룹 키: category 그룹이 너무 작으면 big_category 로 확장
+    def group_key(self, row: int) -> tuple[str, str]:
+        category = self.store.get(row, "category")
+        if len(self.group_rows["category"].get(category, ())) >= MIN_CATEGORY_SIZE:
+            return ("category", category)
+        return ("big_category", self.store.get(row, "big_category"))
+
+    # 그룹별 TF-IDF 학습 (최초 요청 시 한 번만 수행)
+    def get_group(self, key: tuple[str, str]) -> dict:
+        group = self._groups.get(key)
+        if group is not None:
+            return group
+
+        with self._lock:
+            group = self._groups.get(key)
+            if group is not None:
+                return group
+
+            field, value = key
+            rows = np.array(self.group_rows[field].get(value, []), dtype=np.int32)
+            matrix = None
+            if len(rows):
+                vectorizer = TfidfVectorizer()
+                matrix = vectorizer.fit_transform(
+                    [get_combined(p) for p in self.store.rows(rows, fields=COMBINED_FIELDS)]
+                )
+
+            group = {
+                "rows": rows,
+                "names": [self.store.get(int(r), "product_name", "") for r in rows],
+                "matrix": matrix,
+                "penalty": self.penalty[rows],
+                "position": {int(r): i for i, r in enumerate(rows)},
+            }
+            self._groups[key] = group
+            return group
+
+    # product_id → (그룹, 그룹 내 위치), 없으면 None
+    def locate(self, product_id: str):
+        row = self.id_to_row.get(product_id)
+        if row is None:
+            return None
+        group = self.get_group(self.group_key(row))
+        idx = group["position"].get(row)
+        if idx is None:
+            return None
+        return group, idx
+
+    # 그룹 내 모든 제품과의 코사인 유사도
+    def cosine_scores(self, group: dict, idx: int) -> np.ndarray:
+        return linear_kernel(group["matrix"][idx], group["matrix"]).ravel()
+
+
+# 원재료 표 상 위험 성분 위치에 따른 가감점 (상위 감점, 하위 가점)
+# 제품에만 의존하므로 모델 구성 시 전체 제품에 대해 한 번만 계산합니다.
+def position_penalty(row) -> float:
+    rm = row.get("raw_materials")
+    if not isinstance(rm, dict):
+        rm = {}
+    warning_list = [w.strip() for w in _text(rm.get("warning", "")).split(",") if w.strip()]
+    ingredients_list = [i.strip() for i in _text(rm.get("ingredients_raw", "")).split(",") if i.strip()]
+    total_len = len(ingredients_list)
+    if total_len == 0:
+        return 0.0
+
+    # 성분별 첫 등장 위치
+    first_index = {}
+    for i, ingredient in enumerate(ingredients_list):
+        first_index.setdefault(ingredient, i)
+
+    score = 0.0
+    for warning in warning_list:
+        i = first_index.get(warning)
+        if i is not None:
+            ratio = i / total_len
+            if ratio <= 0.5:
+                score -= 0.5
+            elif ratio >= 0.9:
+                score += 0.5
+    return score
+
+
+# 코사인 내림차순 후보 (자기 자신 제외) + 위치 가감점 반영 점수
+def score_candidates(idx: int, cosine_scores: np.ndarray, penalty: np.ndarray) -> list[tuple[int, float]]:
+    top_indices = cosine_scores.argsort()[::-1]
+    top_indices = top_indices[top_indices != idx]
+    final_scores = cosine_scores[top_indices] + penalty[top_indices]
+    return list(zip(top_indices.tolist(), final_scores.tolist()))
+
+
+# 1차 필터링: 상위 후보 중 제품명 유사도 기준 통과 후보
+def name_filtered(group_names: list[str], scored_candidates: list, base_name: str) -> list[tuple[int, float]]:
+    primary = []
+    for i, score in scored_candidates[:NAME_FILTER_POOL]:
+        if fuzz.partial_ratio(base_name, group_names[i]) >= NAME_FILTER_THRESHOLD:
+            primary.append((i, score))
+    return primary
+
+
+# 부족 시 보충 후 점수 순 상위 limit 개
+def select_top(primary: list, scored_candidates: list, limit: int) -> list[int]:
+    selected = set(i for i, _ in primary)
+    if len(primary) < limit:
+        additional = [(i, score) for i, score in scored_candidates if i not in selected][:limit - len(primary)]
+        primary = primary + additional
+    return [i for i, _ in sorted(primary, key=lambda x: x[1], reverse=True)[:limit]]
+
+
+def build_recommend_model(store) -> RecommendModel:
+    return RecommendModel(store)
@@ -0,0 +1,202 @@
+# app/utils/recommend_table.py
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+from sklearn.metrics.pairwise import linear_kernel
+
+from app.utils.recommend_model import build_recommend_model, score_candidates, name_filtered, COMBINED_FIELDS
+
+# ---------------------------------------------------------------
+# 📌 오프라인 추천 테이블
+# 제품 데이터는 DB_upload 스크립트 실행 시에만 바뀌므로, product_id 별 추천 결과도 그때만 바뀝니다.
+# 업로드 후 이 배치 작업으로 전체 제품의 추천 후보를 미리 계산해 두면
+# /recommend/{product_id} 는 배열 조회 한 번으로 응답할 수 있습니다.
+#
+# 실행: python -m app.utils.recommend_table --out ./recommend_table
+# 적용: 서버 환경변수 RECOMMEND_TABLE_DIR=./recommend_table
+#
+# limit(1~10) 별 결과가 서로의 앞부분이 아니므로 (보충 후보가 재정렬됨),
+# 최종 결과 대신 /recommend 와 같은 순위 계산의 중간 결과를 저장하고 조회 시 조합합니다.
+# - primary      : 제품명 유사도 통과 후보를 점수 순으로 정렬한 상위 TOP_K (int32, -1 패딩)
+# - primary_count: 통과 후보 전체 개수
+# - supplement   : 통과하지 못한 후보를 코사인 순으로 TOP_K 개
+# - *_scores     : 각 후보의 최종 점수 (코사인 + 위치 가감점)
+# - ids          : 위 행 번호가 가리키는 product_id 테이블
+#
+# product_id 는 행 위치(product_N)이므로 제품 수가 같아도 내용이 바뀔 수 있습니다.
+# meta.json 에 추천 계산에 쓰이는 필드(product_id / 제품명 / 분류 / 원재료)의 지문을 기록하고,
+# 적재 시 현재 저장소의 지문과 다르면 테이블을 사용하지 않습니다.
+# ---------------------------------------------------------------
+
+TOP_K = 10
+CHUNK_SIZE = 256
+ARRAYS = ("ids", "primary", "primary_scores", "primary_count", "supplement", "supplement_scores")
+
+FINGERPRINT_FIELDS = ("product_id", "big_category") + COMBINED_FIELDS
+
+_job_model = None
+
+
+# 추천 결과에 영향을 주는 필드의 해시 (행 순서 포함)
+def store_fingerprint(store) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for field in FINGERPRINT_FIELDS:
+        digest.update(field.encode("utf-8"))
+        digest.update(json.dumps(store.column(field), sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# 한 그룹의 청크: (그룹 내 위치 목록) → 행별 후보
+def _rank_chunk(task):
+    key, positions = task
+    group = _job_model.get_group(key)
+    rows = group["rows"]
+
+    scores = linear_kernel(group["matrix"][positions], group["matrix"])
+    out = []
+    for idx, cosine_scores in zip(positions, scores):
+        base_name = group["names"][idx]
+        scored_candidates = score_candidates(idx, cosine_scores, group["penalty"])
+        primary = name_filtered(group["names"], scored_candidates, base_name)
+
+        selected = set(i for i, _ in primary)
+        ranked = sorted(primary, key=lambda x: x[1], reverse=True)[:TOP_K]
+        supplement = [(i, s) for i, s in scored_candidates if i not in selected][:TOP_K]
+        out.append((
+            int(rows[idx]),
+            [(int(rows[i]), float(s)) for i, s in ranked],
+            len(primary),
+            [(int(rows[i]), float(s)) for i, s in supplement],
+        ))
+    return out
+
+
+def _tasks(model):
+    positions = {}
+    for row in model.id_to_row.values():
+        key = model.group_key(row)
+        idx = model.get_group(key)["position"].get(row)
+        if idx is not None:
+            positions.setdefault(key, []).append(idx)
+
+    for key, idxs in positions.items():
+        for start in range(0, len(idxs), CHUNK_SIZE):
+            yield key, idxs[start:start + CHUNK_SIZE]
+
+
+# 전체 제품 추천 테이블 계산 후 out_dir 에 저장
+def build_recommend_table(store, out_dir: str, workers: int = None, data_version=None) -> dict:
+    global _job_model
+    started = time.time()
+
+    _job_model = build_recommend_model(store)
+    tasks = list(_tasks(_job_model))
+    n = len(store)
+
+    primary = np.full((n, TOP_K), -1, dtype=np.int32)
+    primary_scores = np.zeros((n, TOP_K), dtype=np.float64)
+    primary_count = np.full(n, -1, dtype=np.int32)
+    supplement = np.full((n, TOP_K), -1, dtype=np.int32)
+    supplement_scores = np.zeros((n, TOP_K), dtype=np.float64)
+
+    # fork 로 띄운 워커는 부모의 _job_model (그룹별 TF-IDF 포함) 을 그대로 공유합니다.
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=context) as pool:
+        for chunk in pool.map(_rank_chunk, tasks):
+            for row, ranked, count, extra in chunk:
+                primary_count[row] = count
+                for j, (i, s) in enumerate(ranked):
+                    primary[row, j], primary_scores[row, j] = i, s
+                for j, (i, s) in enumerate(extra):
+                    supplement[row, j], supplement_scores[row, j] = i, s
+
+    ids = np.array([str(pid) for pid in store.column("product_id", "")])
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name, array in zip(ARRAYS, (ids, primary, primary_scores, primary_count, supplement, supplement_scores)):
+        np.save(os.path.join(out_dir, f"{name}.npy"), array)
+
+    meta = {
+        "product_count": n,
+        "fingerprint": store_fingerprint(store),
+        "data_version": str(data_version) if data_version is not None else None,
+        "top_k": TOP_K,
+        "groups": len({key for key, _ in tasks}),
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "elapsed_sec": round(time.time() - started, 2),
+    }
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    _job_model = None
+    return meta
+
+
+class RecommendTable:
+    def __init__(self, table_dir: str):
+        with open(os.path.join(table_dir, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        for name in ARRAYS:
+            setattr(self, name, np.load(os.path.join(table_dir, f"{name}.npy"), mmap_mode="r"))
+        self.size = len(self.ids)
+        self.id_to_row = {str(pid): row for row, pid in enumerate(self.ids)}
+
+    # /recommend 와 동일한 순서의 추천 product_id 목록, 테이블에 없으면 None
+    def lookup(self, product_id: str, limit: int):
+        row = self.id_to_row.get(product_id)
+        if row is None or self.primary_count[row] < 0 or limit > TOP_K:
+            return None
+
+        count = int(self.primary_count[row])
+        picked = [(int(i), float(s)) for i, s in zip(self.primary[row], self.primary_scores[row]) if i >= 0]
+        if count >= limit:
+            top = picked[:limit]
+        else:
+            extra = [(int(i), float(s)) for i, s in zip(self.supplement[row], self.supplement_scores[row]) if i >= 0]
+            top = sorted(picked + extra[:limit - count], key=lambda x: x[1], reverse=True)[:limit]
+        return [str(self.ids[i]) for i, _ in top]
+
+
+# 테이블 디렉터리가 있으면 mmap 으로 적재, 현재 저장소와 내용이 다르면 (업로드 / 갱신 후 미재생성) 사용하지 않음
+def load_recommend_table(table_dir: str, store):
+    if not table_dir or not os.path.exists(os.path.join(table_dir, "meta.json")):
+        return None
+    try:
+        table = RecommendTable(table_dir)
+    except Exception as e:
+        print(f"❌ [추천 테이블] 적재 실패 → 실시간 계산 사용: {e}")
+        return None
+    if table.size != len(store):
+        print(f"⚠️ [추천 테이블] 제품 수 불일치 ({table.size} ≠ {len(store)}) → 실시간 계산 사용")
+        return None
+    fingerprint = table.meta.get("fingerprint")
+    if fingerprint is None or fingerprint != store_fingerprint(store):
+        print(
+            f"⚠️ [추천 테이블] 제품 데이터 불일치 (table data_version={table.meta.get('data_version')}) "
+            f"→ 실시간 계산 사용, 테이블을 다시 생성하세요."
+        )
+        return None
+    print(f"✅ [추천 테이블] {table.size}개 제품 적재 완료 (built_at={table.meta.get('built_at')})")
+    return table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="전체 제품 추천 테이블 생성")
+    parser.add_argument("--out", default="recommend_table", help="저장 디렉터리")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    args = parser.parse_args()
+
+    from app.utils.indexes import current_indexes
+    from app.routes.search import load_products
+
+    load_products()
+    current = current_indexes()
+    meta = build_recommend_table(current.store, args.out, workers=args.workers, data_version=current.data_version)
+    print(f"✅ 추천 테이블 생성 완료: {meta}")
@@ -0,0 +1,35 @@
+# app/utils/refresh.py
+import os
+
+from app.utils.snapshot import parse_version
+from app.utils.firestore_loader import product_order_key
+
+# ---------------------------------------------------------------
+# 📌 제품 캐시 증분 갱신
+# 업로드 스크립트가 metadata/products_metadata 의 last_updated 를 갱신하면,
+# 서버 재시작 없이 그 이후 수정된 문서(updated_at > 직전 last_updated)만 조회하여 병합합니다.
+#
+# - 주기: PRODUCT_REFRESH_SECONDS (기본 300초, 0 이면 사용 안 함)
+# - 병합 결과로 저장소와 파생 인덱스를 새로 만든 뒤 한 번에 교체 (install_product_store)
+# - 삭제된 문서는 증분 조회로 알 수 없으므로 total_count 와 개수가 다르면 전체 재적재
+# ---------------------------------------------------------------
+
+REFRESH_SECONDS = float(os.environ.get("PRODUCT_REFRESH_SECONDS", 300))
+
+
+# Firestore 의 last_updated 가 현재 적재 기준보다 새로운지
+def is_newer(last_updated, data_version) -> bool:
+    remote = parse_version(last_updated)
+    if remote is None:
+        return False
+    local = parse_version(data_version)
+    return local is None or remote > local
+
+
+# 현재 저장소 제품에 수정된 제품을 product_id 기준으로 덮어쓰고 새 제품은 추가
+# 전체 적재와 같은 순서(product_name → 문서 ID)로 정렬하여 반환
+def merge_products(store, changed: list[dict]) -> list[dict]:
+    merged = {p["product_id"]: p for p in store}
+    for product in changed:
+        merged[product["product_id"]] = product
+    return sorted(merged.values(), key=product_order_key)
@@ -0,0 +1,158 @@
+# app/utils/response_cache.py
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+from app.utils.product_store import StringTable
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경에서는 표준 json 으로 동작
+    orjson = None
+
+# ---------------------------------------------------------------
+# 📌 응답 직렬화 캐시
+# - 제품별 JSON 바이트를 캐시 적재 시 한 번만 만들어 두고,
+#   목록 응답은 해당 조각들을 이어 붙여 구성합니다. (요청마다 제품 dict 재인코딩 X)
+# - 완성된 응답 바디는 (엔드포인트, 정규화된 파라미터) 키로 LRU 캐시에 보관하며
+#   총 바이트 수 기준으로 오래된 항목부터 제거합니다. (RESPONSE_CACHE_MB, 기본 64MB)
+# - 제품 캐시가 다시 적재되면 전체 비우고, 키에 세대 번호를 포함하여 교체 직전에 계산된 응답은 다시 쓰이지 않습니다.
+# - stream=true 또는 Accept: application/x-ndjson 요청은 응답 바디를 만들지 않고
+#   제품 조각을 한 줄씩 (STREAM_CHUNK_ROWS 개 단위로) 흘려보냅니다.
+# ---------------------------------------------------------------
+
+JSON_MEDIA_TYPE = "application/json; charset=utf-8"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_CHUNK_ROWS = 64
+RESPONSE_CACHE_MB = float(os.environ.get("RESPONSE_CACHE_MB", 64))
+
+
+# JSONResponse 와 같은 형식 (UTF-8, 공백 없는 구분자) 의 바이트 직렬화
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+# 미리 직렬화된 제품 조각들로 JSON 배열 바이트 구성
+def join_rows(fragments: list[bytes], rows) -> bytes:
+    return b"[" + b",".join(fragments[i] for i in rows) + b"]"
+
+
+# 저장소 행 순서와 같은 제품별 JSON 바이트 목록 (fields 지정 시 해당 필드만)
+class ProductFragments(list):
+    def __init__(self, store, fields=None):
+        super().__init__(dumps(store.row(r, fields)) for r in range(len(store)))
+        self.store = store
+        self.fields = fields
+
+
+def build_product_fragments(store, fields=None) -> ProductFragments:
+    return ProductFragments(store, fields)
+
+
+# 스냅샷에 저장된 제품별 JSON 바이트 (mmap, 여러 워커가 같은 페이지 캐시를 공유)
+class MappedFragments:
+    def __init__(self, store, table: StringTable):
+        self.store = store
+        self.table = table
+
+    def __len__(self):
+        return len(self.table)
+
+    def __getitem__(self, row: int) -> bytes:
+        return self.table.get_bytes(row)
+
+    def __iter__(self):
+        return (self.table.get_bytes(i) for i in range(len(self.table)))
+
+
+def save_product_fragments(fragments, path: str, name: str = "fragments"):
+    offsets = np.zeros(len(fragments) + 1, dtype=np.int64)
+    if len(fragments):
+        np.cumsum([len(b) for b in fragments], out=offsets[1:])
+    np.save(os.path.join(path, f"{name}_data.npy"), np.frombuffer(b"".join(fragments), dtype=np.uint8))
+    np.save(os.path.join(path, f"{name}_offsets.npy"), offsets)
+
+
+# save_product_fragments() 로 저장한 조각 (없으면 None → 저장소에서 다시 직렬화)
+def load_product_fragments(store, path: str, name: str = "fragments"):
+    data_path = os.path.join(path, f"{name}_data.npy")
+    if not os.path.exists(data_path):
+        return None
+    table = StringTable.from_arrays(
+        np.load(data_path, mmap_mode="r"),
+        np.load(os.path.join(path, f"{name}_offsets.npy"), mmap_mode="r"),
+    )
+    if len(table) != len(store):
+        return None
+    return MappedFragments(store, table)
+
+
+def json_bytes_response(body: bytes, status_code: int = 200) -> Response:
+    return Response(content=body, status_code=status_code, media_type=JSON_MEDIA_TYPE)
+
+
+# NDJSON 스트리밍 요청인지 (stream=true 파라미터 또는 Accept 헤더)
+def wants_ndjson(request: Request, stream: bool) -> bool:
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+# 제품 조각을 한 줄에 하나씩 스트리밍 (요청당 메모리는 청크 크기만큼만 사용)
+def ndjson_response(fragments, rows) -> StreamingResponse:
+    def lines():
+        for start in range(0, len(rows), STREAM_CHUNK_ROWS):
+            yield b"".join(fragments[i] + b"\n" for i in rows[start:start + STREAM_CHUNK_ROWS])
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._items.get(key)
+            if body is not None:
+                self._items.move_to_end(key)
+            return body
+
+    def put(self, key, body: bytes):
+        # 한 항목이 전체 한도를 넘으면 보관하지 않음
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.total_bytes -= len(old)
+            self._items[key] = body
+            self.total_bytes += len(body)
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._items)
+
+
+response_cache = ResponseCache(int(RESPONSE_CACHE_MB * 1024 * 1024))
@@ -0,0 +1,213 @@
+# app/utils/search_index.py
+import heapq
+from collections import Counter, defaultdict
+
+import numpy as np
+from rapidfuzz import fuzz
+
+from app.utils.mapped_index import Postings, save_arrays, load_arrays, save_strings, load_strings
+from app.utils.product_store import StringTable
+from app.utils.text import get_clean_text
+
+# ---------------------------------------------------------------
+# 📌 검색 인덱스
+# load_products() 가 끝난 뒤 한 번만 구성하여 /search 요청마다
+# 전체 제품을 정규식 + fuzzy 로 훑지 않도록 합니다.
+#
+# - 정제된 제품명 / 제조사 / 브랜드(한글·영문) 필드
+# - 브랜드·제조사 정확 일치용 해시 (값 → 행 번호)
+# - 제품명·제조사 문자 n-gram 역색인 (부분 문자열 후보 추출)
+# - 문자 단위 역색인 (fuzzy 후보 가지치기)
+#
+# 각 단계는 후보 행만 검사하고, match() 는 제품 저장소 순서를 그대로 유지하므로
+# 기존 선형 탐색과 동일한 결과를 반환합니다.
+#
+# 정제된 문자열과 역색인은 numpy 배열 (app.utils.mapped_index) 로만 보관하며,
+# save() 로 스냅샷에 저장해 두면 다른 워커는 load() 로 mmap 하여 다시 구성하지 않습니다.
+#
+# top() 은 정확 일치 → 부분 포함 → fuzzy 점수 순으로 순위를 매겨 상위 k 개만 반환하며,
+# 앞 단계에서 k 개가 채워지면 이후 단계(특히 fuzzy)는 계산하지 않습니다.
+# ---------------------------------------------------------------
+
+NGRAM_SIZE = 2
+FUZZY_THRESHOLD = 85
+
+
+def _ngrams(text: str, n: int = NGRAM_SIZE) -> set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class SearchIndex:
+    def __init__(self, store):
+        self.store = store
+        self.size = len(store)
+
+        names = [get_clean_text(v) for v in store.column("product_name", "")]
+        manufacturers = [get_clean_text(v) for v in store.column("manufacturer", "")]
+        brands_kor = [get_clean_text(v) for v in store.column("brand_name_kor", "")]
+        brands_eng = [get_clean_text(v) for v in store.column("brand_name_eng", "")]
+
+        # 1단계: 정확 일치 해시 (브랜드 한글/영어, 제조사)
+        exact = defaultdict(set)
+        for field in (brands_kor, brands_eng, manufacturers):
+            for row, value in enumerate(field):
+                exact[value].add(row)
+        self.exact = Postings.from_dict({value: sorted(rows) for value, rows in exact.items()})
+
+        # 2·3단계: 필드별 n-gram / 문자 역색인
+        self.fields = []
+        for texts in (names, manufacturers):
+            grams = defaultdict(list)
+            chars = defaultdict(list)
+            for row, text in enumerate(texts):
+                for g in _ngrams(text):
+                    grams[g].append(row)
+                for c in set(text):
+                    chars[c].append(row)
+            self.fields.append({
+                "texts": StringTable(texts),
+                "lengths": np.array([len(t) for t in texts], dtype=np.int32),
+                "grams": Postings.from_dict(grams),
+                "chars": Postings.from_dict(chars),
+            })
+
+    def save(self, path: str):
+        self.exact.save(path, "search_exact")
+        for i, field in enumerate(self.fields):
+            save_strings(field["texts"], path, f"search_texts{i}")
+            save_arrays(path, f"search_fields{i}", lengths=field["lengths"])
+            field["grams"].save(path, f"search_grams{i}")
+            field["chars"].save(path, f"search_chars{i}")
+
+    # save() 로 저장한 인덱스 (mmap, 없거나 저장소와 크기가 다르면 None)
+    @classmethod
+    def load(cls, store, path: str):
+        exact = Postings.load(path, "search_exact")
+        if exact is None:
+            return None
+        fields = []
+        for i in range(2):
+            texts = load_strings(path, f"search_texts{i}")
+            lengths = load_arrays(path, f"search_fields{i}", "lengths")
+            grams = Postings.load(path, f"search_grams{i}")
+            chars = Postings.load(path, f"search_chars{i}")
+            if texts is None or lengths is None or grams is None or chars is None or len(texts) != len(store):
+                return None
+            fields.append({"texts": texts, "lengths": lengths[0], "grams": grams, "chars": chars})
+
+        index = cls.__new__(cls)
+        index.store = store
+        index.size = len(store)
+        index.exact = exact
+        index.fields = fields
+        return index
+
+    # 1단계: 브랜드 한글/영어 또는 제조사와 정확히 일치하는 행
+    def exact_rows(self, keyword: str) -> np.ndarray:
+        return self.exact.get(keyword, np.empty(0, dtype=np.int32))
+
+    # 2단계: 제품명 또는 제조사에 키워드가 포함된 행
+    def substring_rows(self, keyword: str) -> np.ndarray:
+        if not keyword:
+            return np.arange(self.size, dtype=np.int32)
+
+        matched = []
+        for field in self.fields:
+            if len(keyword) < NGRAM_SIZE:
+                matched.append(field["chars"].get(keyword, np.empty(0, dtype=np.int32)))
+                continue
+
+            candidates = None
+            for g in _ngrams(keyword):
+                postings = field["grams"].get(g)
+                if postings is None:
+                    candidates = None
+                    break
+                candidates = postings if candidates is None else np.intersect1d(candidates, postings, assume_unique=True)
+                if not len(candidates):
+                    break
+            if candidates is None or not len(candidates):
+                continue
+            # 키워드가 n-gram 하나와 같으면 후보가 곧 포함 행 (문자열 확인 생략)
+            if len(keyword) == NGRAM_SIZE:
+                matched.append(np.asarray(candidates))
+                continue
+
+            texts = field["texts"].take(candidates)
+            matched.append(np.array([r for r, text in zip(candidates, texts) if keyword in text], dtype=np.int32))
+
+        if not matched:
+            return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate(matched))
+
+    # 3단계: 제품명 또는 제조사와 partial_ratio >= threshold 인 행
+    # partial_ratio = 200 * LCS / (짧은 문자열 길이 + 비교 구간 길이) 이므로
+    # 공유 문자 수로 LCS 상한을 구해 기준에 못 미치는 행은 fuzz 호출 없이 제외합니다.
+    def fuzzy_rows(self, keyword: str, exclude: set[int], threshold: int = FUZZY_THRESHOLD) -> np.ndarray:
+        return np.array(sorted(self.fuzzy_scores(keyword, exclude, threshold)), dtype=np.int32)
+
+    # fuzzy_rows 와 같은 조건의 행 → 점수 (제품명·제조사 중 높은 쪽)
+    def fuzzy_scores(self, keyword: str, exclude: set[int], threshold: int = FUZZY_THRESHOLD) -> dict[int, float]:
+        if not keyword or not self.size:
+            return {}
+
+        counts = Counter(keyword)
+        matched = {}
+        for field in self.fields:
+            shared = np.zeros(self.size, dtype=np.int32)
+            for c, cnt in counts.items():
+                postings = field["chars"].get(c)
+                if postings is not None:
+                    shared[postings] += cnt
+
+            shorter = np.minimum(field["lengths"], len(keyword))
+            upper = np.minimum(shared, shorter)
+            possible = (upper > 0) & (200 * upper >= threshold * (shorter + upper))
+
+            rows = [row for row in np.flatnonzero(possible).tolist() if row not in exclude]
+            for row, text in zip(rows, field["texts"].take(rows)):
+                score = fuzz.partial_ratio(keyword, text)
+                if score >= threshold and score > matched.get(row, 0):
+                    matched[row] = score
+
+        return matched
+
+    # 기존 3단계 매칭 결과와 동일한 행 번호 목록 (저장소 순서)
+    def match(self, keywords: list[str]) -> list[int]:
+        hits = set()
+        for k in keywords:
+            hits.update(self.exact_rows(k).tolist())
+            hits.update(self.substring_rows(k).tolist())
+        for k in keywords:
+            hits.update(self.fuzzy_rows(k, exclude=hits).tolist())
+        return sorted(hits)
+
+    # 순위 상위 k 개 행: 정확 일치(저장소 순) → 부분 포함(저장소 순) → fuzzy(점수 높은 순)
+    def top(self, keywords: list[str], k: int) -> list[int]:
+        exact = set()
+        for kw in keywords:
+            exact.update(self.exact_rows(kw).tolist())
+        ranked = heapq.nsmallest(k, exact)
+        if len(ranked) >= k:
+            return ranked
+
+        substring = set()
+        for kw in keywords:
+            substring.update(self.substring_rows(kw).tolist())
+        substring -= exact
+        ranked += heapq.nsmallest(k - len(ranked), substring)
+        if len(ranked) >= k:
+            return ranked
+
+        seen = exact | substring
+        scores = {}
+        for kw in keywords:
+            for row, score in self.fuzzy_scores(kw, exclude=seen).items():
+                if score > scores.get(row, 0):
+                    scores[row] = score
+        ranked += [row for row, _ in heapq.nsmallest(k - len(ranked), scores.items(), key=lambda x: (-x[1], x[0]))]
+        return ranked
+
+
+def build_search_index(store) -> SearchIndex:
+    return SearchIndex(store)
@@ -0,0 +1,48 @@
+# app/utils/search_memo.py
+import os
+
+from app.utils.ttl_cache import TTLCache, MISS
+
+# ---------------------------------------------------------------
+# 📌 검색 결과 메모
+# 검색어는 코카콜라 / 농심 / 비비고 같은 브랜드에 몰리므로, 정제 + 브랜드 확장이 끝난 키워드 묶음을 키로
+# 순위가 매겨진 결과 행을 보관합니다. ("Coke", "coke " → 같은 키워드 묶음 → 같은 항목)
+# 키는 키워드 묶음 그대로 (중복 제거 + 정렬) 입니다. 같은 브랜드라도 확장 결과가 다른 검색어는
+# ("coke" → coke/코카콜라, "코카콜라" → 코카콜라/cocacola/cola/coke) 결과가 다르므로 항목을 공유하지 않습니다.
+#
+# - 값: (순위 상위 k 개 행, Fallback 여부, k) → k 이하의 limit/offset 요청은 다시 계산하지 않음
+# - 최대 항목 수: SEARCH_MEMO_SIZE (기본 1,024), 유효 시간: SEARCH_MEMO_TTL 초 (기본 600)
+# - 키에 세대 번호를 포함하고, 제품 캐시가 다시 적재되면 전체 비웁니다.
+# ---------------------------------------------------------------
+
+SEARCH_MEMO_SIZE = int(os.environ.get("SEARCH_MEMO_SIZE", 1024))
+SEARCH_MEMO_TTL = float(os.environ.get("SEARCH_MEMO_TTL", 600))
+
+def memo_key(generation: int, keywords: list[str]) -> tuple:
+    return (generation, tuple(sorted(set(keywords))))
+
+
+# 메모된 결과로 offset ~ offset+limit 을 답할 수 있으면 (행 목록, Fallback 여부), 아니면 None
+def memo_rows(entry, limit: int, offset: int):
+    rows, is_fallback, k = entry
+    # k 개를 다 채우지 못했으면 전체 결과이므로 어떤 범위든 답할 수 있음
+    if offset + limit <= k or len(rows) < k:
+        return rows[offset:offset + limit], is_fallback
+    return None
+
+
+class SearchMemo(TTLCache):
+    # 요청 범위를 답할 수 있을 때만 적중으로 집계 (더 많은 행이 필요하면 실패)
+    def lookup(self, key, limit: int, offset: int):
+        entry = self.get(key)
+        if entry is MISS:
+            return None
+        memoized = memo_rows(entry, limit, offset)
+        if memoized is None:
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+        return memoized
+
+
+search_memo = SearchMemo(SEARCH_MEMO_SIZE, SEARCH_MEMO_TTL)
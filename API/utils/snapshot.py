@@ -0,0 +1,134 @@
+# app/utils/snapshot.py
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import datetime, timezone
+
+from app.utils.product_store import ProductStore
+
+# ---------------------------------------------------------------
+# 📌 제품 저장소 로컬 스냅샷
+# 부팅할 때마다 Firestore 를 1,000개씩 25번 넘게 순차 조회하지 않도록,
+# 적재에 성공한 저장소를 로컬 디렉터리에 저장해 두고 다음 부팅 시 mmap 으로 엽니다.
+#
+# - 위치: PRODUCT_SNAPSHOT_DIR (미설정 시 스냅샷 사용 안 함)
+# - manifest.json 에 형식 버전과 데이터 버전(metadata/products_metadata.last_updated)을 기록
+# - last_updated 가 스냅샷보다 새로울 때만 Firestore 에서 다시 적재
+# - 새 스냅샷은 임시 디렉터리에 모두 쓴 뒤 교체하므로 중간에 실패해도 기존 스냅샷은 유지됩니다.
+# - 저장소와 함께 파생 인덱스 (ProductIndexes.save: 제품 JSON 조각 / profile 조각 / 검색 · Fallback · 추천 인덱스 배열) 도
+#   저장하며, snapshot_path() 를 install_product_store() 에 넘기면 다시 구성하지 않고 mmap 으로 엽니다.
+# - 스냅샷마다 snapshot_id 를 기록하고 save_snapshot() 이 반환합니다. (연산 풀 워커가 같은 스냅샷인지 확인)
+# ---------------------------------------------------------------
+
+# 2: 파생 인덱스 배열 추가, 3: 숫자 float64 + 정수 표시, 행별 키 순서
+SNAPSHOT_FORMAT_VERSION = 3
+SNAPSHOT_DIR = os.environ.get("PRODUCT_SNAPSHOT_DIR")
+CURRENT = "current"
+
+
+def _to_iso(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    return str(value)
+
+
+# last_updated (Firestore Timestamp / ISO 문자열) → tz-aware datetime
+def parse_version(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+# 스냅샷 manifest (없거나 형식 버전이 다르면 None)
+def read_manifest(snapshot_dir: str = SNAPSHOT_DIR):
+    if not snapshot_dir:
+        return None
+    path = os.path.join(snapshot_dir, CURRENT, "manifest.json")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except Exception as e:
+        print(f"⚠️ [스냅샷] manifest 읽기 실패: {e}")
+        return None
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        print(f"⚠️ [스냅샷] 형식 버전 불일치 ({manifest.get('format_version')}) → 무시")
+        return None
+    return manifest
+
+
+# Firestore 의 last_updated 보다 스냅샷이 오래되지 않았는지
+def is_fresh(manifest: dict, last_updated) -> bool:
+    remote = parse_version(last_updated)
+    if remote is None:
+        # 비교할 기준이 없으면 스냅샷을 그대로 사용
+        return True
+    local = parse_version(manifest.get("data_version"))
+    return local is not None and local >= remote
+
+
+# 현재 스냅샷 경로 (저장소 / 파생 인덱스 배열 위치)
+def snapshot_path(snapshot_dir: str = SNAPSHOT_DIR) -> str:
+    return os.path.join(snapshot_dir, CURRENT)
+
+
+def load_snapshot(snapshot_dir: str = SNAPSHOT_DIR):
+    path = snapshot_path(snapshot_dir)
+    try:
+        store = ProductStore.load(path, mmap=True)
+    except Exception as e:
+        print(f"❌ [스냅샷] 적재 실패: {e}")
+        return None
+    print(f"✅ [스냅샷] {len(store)}개 제품 적재 완료 ({path})")
+    return store
+
+
+def save_snapshot(store: ProductStore, last_updated, snapshot_dir: str = SNAPSHOT_DIR, indexes=None):
+    if not snapshot_dir:
+        return None
+    staging = None
+    snapshot_id = uuid.uuid4().hex
+    try:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=snapshot_dir)
+        store.save(staging)
+        if indexes is not None:
+            indexes.save(staging)
+        with open(os.path.join(staging, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "format_version": SNAPSHOT_FORMAT_VERSION,
+                "data_version": _to_iso(last_updated),
+                "snapshot_id": snapshot_id,
+                "product_count": len(store),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }, f, ensure_ascii=False, indent=2)
+
+        current = snapshot_path(snapshot_dir)
+        retired = None
+        if os.path.exists(current):
+            retired = tempfile.mkdtemp(prefix=".retired-", dir=snapshot_dir)
+            os.rmdir(retired)
+            os.rename(current, retired)
+        os.rename(staging, current)
+        if retired:
+            shutil.rmtree(retired, ignore_errors=True)
+        print(f"✅ [스냅샷] {len(store)}개 제품 저장 완료 ({current})")
+        return snapshot_id
+    except Exception as e:
+        print(f"❌ [스냅샷] 저장 실패: {e}")
+        if staging and os.path.exists(staging):
+            shutil.rmtree(staging, ignore_errors=True)
+        return None
@@ -0,0 +1,21 @@
+# app/utils/text.py
+import re
+from rapidfuzz import fuzz
+from jamo import hangul_to_jamo
+
+# 문자열 정제 (리스트 및 기타 타입 대응)
+def get_clean_text(text) -> str:
+    if isinstance(text, list):
+        text = " ".join(map(str, text))
+    elif not isinstance(text, str):
+        text = str(text)
+    return re.sub(r"[^\w\s\uAC00-\uD7A3]", "", text).lower().strip()
+
+def jamo_text(text: str) -> str:
+    # 자모 단위로 변환 후 공백 제거
+    return ''.join(list(hangul_to_jamo(text))).replace(' ', '')
+
+def is_jamo_similar(keyword: str, target: str, threshold: int = 80) -> bool:
+    keyword_jamo = jamo_text(keyword)
+    target_jamo = jamo_text(target)
+    return fuzz.ratio(keyword_jamo, target_jamo) >= threshold
@@ -0,0 +1,67 @@
+# app/utils/ttl_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+# ---------------------------------------------------------------
+# 📌 TTL + LRU 캐시
+# 항목 수 상한(max_items)을 넘으면 오래 쓰지 않은 항목부터 제거하고,
+# 유효 시간(ttl 초)이 지난 항목은 조회 시점에 버립니다.
+# 적중 / 실패 / 제거 / 만료 횟수를 stats() 로 확인할 수 있습니다.
+# ---------------------------------------------------------------
+
+# 캐시에 없음 (None 도 값으로 저장할 수 있으므로 별도 표식 사용)
+MISS = object()
+
+
+class TTLCache:
+    def __init__(self, max_items: int, ttl: float):
+        self.max_items = max_items
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    # 캐시된 값, 캐시에 없거나 만료되었으면 MISS
+    def get(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISS
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._items[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISS
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._items),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __len__(self):
+        return len(self._items)
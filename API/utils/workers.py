@@ -0,0 +1,52 @@
+# app/utils/workers.py
+import fcntl
+import os
+from contextlib import contextmanager
+
+# ---------------------------------------------------------------
+# 📌 다중 uvicorn 워커 공유 적재
+# --workers N 으로 띄울 때 워커마다 Firestore 전체 적재 + 제품 저장소를 따로 갖지 않도록,
+# PRODUCT_SNAPSHOT_DIR 의 스냅샷을 공유 메모리처럼 사용합니다.
+#
+# - 부팅 시 모든 워커가 스냅샷 잠금(.lock)을 차례로 잡고, 처음 잡은 워커가 leader(.leader 잠금 보유) 가 됩니다.
+# - leader 만 Firestore 에서 적재하여 스냅샷(저장소 + 제품 JSON 조각 · 검색 / 추천 인덱스 배열)을 저장하고,
+#   나머지 워커는 저장된 스냅샷을 읽기 전용 mmap 으로 열어 같은 페이지 캐시를 공유합니다.
+# - 증분 갱신도 leader 만 Firestore 를 조회하고, 나머지는 manifest 의 data_version 이 바뀌면 스냅샷을 다시 엽니다.
+# - leader 프로세스가 종료되면 .leader 잠금이 풀리므로 다음 갱신 주기에 다른 워커가 이어받습니다.
+# - PRODUCT_SNAPSHOT_DIR 미설정 시 항상 leader (단일 프로세스 동작과 동일)
+# ---------------------------------------------------------------
+
+_leader_file = None
+
+
+# 스냅샷 디렉터리 잠금 (쓰기: 배타, 읽기: 공유)
+@contextmanager
+def snapshot_lock(snapshot_dir: str, shared: bool = False):
+    if not snapshot_dir:
+        yield
+        return
+    os.makedirs(snapshot_dir, exist_ok=True)
+    with open(os.path.join(snapshot_dir, ".lock"), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# 이 프로세스가 Firestore 를 조회하는 leader 인지 (잠금은 프로세스 종료 시까지 유지)
+def is_leader(snapshot_dir: str) -> bool:
+    global _leader_file
+    if not snapshot_dir or _leader_file is not None:
+        return True
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    f = open(os.path.join(snapshot_dir, ".leader"), "a")
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return False
+    _leader_file = f
+    print(f"✅ [워커] leader 선출 (pid={os.getpid()})")
+    return True
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+# ---------------------------------------------------------------
+# 📌 변경분만 업로드 (delta sync)
+# 매번 전체 CSV 를 다시 쓰지 않도록, 업로드할 문서(컬럼 매핑 · 타입 변환 · raw_materials 구조화 이후)를
+# 해시해 이전 상태와 비교하고 추가 / 변경 / 삭제된 문서만 골라냅니다.
+#
+# - 이전 상태: 로컬 manifest (upload_manifest.json) → 없으면 Firestore 문서를 읽어 해시
+# - manifest 에는 문서 ID → 해시, 제품명 → image_url 을 함께 저장 (image_url 유지용)
+# - 비교는 dict / set 조회로만 수행 (문서 수 N, CSV 행 수 M 에 대해 O(N + M))
+# - updated_at 처럼 쓰기마다 바뀌는 필드는 해시에서 제외
+#
+# ⚠️ 다른 스크립트에서 Firestore 를 직접 수정했다면 manifest 를 지우고 실행해 Firestore 기준으로 다시 비교하세요.
+# ---------------------------------------------------------------
+
+MANIFEST_PATH = "upload_manifest.json"
+MANIFEST_VERSION = 1
+HASH_EXCLUDED_FIELDS = {"updated_at"}
+
+
+# numpy 스칼라 / datetime 등 JSON 으로 바로 직렬화되지 않는 값
+def _plain(value):
+    if hasattr(value, "item"):
+        return value.item()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def doc_hash(doc: dict) -> str:
+    payload = {k: v for k, v in doc.items() if k not in HASH_EXCLUDED_FIELDS}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=_plain)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# Firestore 문서 {doc_id: data} → (문서 해시, 제품명 → image_url)
+def remote_state(firestore_products: dict) -> tuple[dict, dict]:
+    hashes = {doc_id: doc_hash(data) for doc_id, data in firestore_products.items()}
+    images = {
+        data.get("product_name", ""): data.get("image_url", "")
+        for data in firestore_products.values()
+        if "image_url" in data
+    }
+    return hashes, images
+
+
+def load_manifest(path: str = MANIFEST_PATH, collection: str = "products"):
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except Exception as e:
+        print(f"⚠️ [delta] manifest 읽기 실패 → Firestore 기준으로 비교: {e}")
+        return None
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("collection") != collection:
+        print("⚠️ [delta] manifest 버전 / 컬렉션 불일치 → Firestore 기준으로 비교")
+        return None
+    return manifest
+
+
+def save_manifest(hashes: dict, images: dict, path: str = MANIFEST_PATH, collection: str = "products"):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": MANIFEST_VERSION,
+            "collection": collection,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "hashes": hashes,
+            "images": images,
+        }, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    print(f"✅ [delta] manifest 저장: 문서 {len(hashes)}개 ({path})")
+
+
+# 로컬 / 이전 해시 비교 → (추가, 변경, 삭제) 문서 ID 목록 (추가·변경은 로컬 순서 유지)
+def plan_delta(local_hashes: dict, remote_hashes: dict) -> tuple[list, list, list]:
+    inserts, updates = [], []
+    for doc_id, digest in local_hashes.items():
+        previous = remote_hashes.get(doc_id)
+        if previous is None:
+            inserts.append(doc_id)
+        elif previous != digest:
+            updates.append(doc_id)
+    deletes = [doc_id for doc_id in remote_hashes if doc_id not in local_hashes]
+    return inserts, updates, deletes
+
+
+# 쓸 문서 ID 와 내용 해시가 모두 같을 때만 같은 값 (업로더 체크포인트 작업 키)
+# 행 수만 같고 내용이 바뀐 CSV 를 다시 실행해도 이전 체크포인트의 배치를 건너뛰지 않습니다.
+def content_job(prefix: str, hashes: dict) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    for doc_id, doc_digest in hashes.items():
+        digest.update(f"{doc_id}:{doc_digest}\n".encode("utf-8"))
+    return f"{prefix}:{digest.hexdigest()}"
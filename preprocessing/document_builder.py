@@ -0,0 +1,172 @@
+import pandas as pd
+
+# ---------------------------------------------------------------
+# 📌 CSV → Firestore 문서 변환 (컬럼 단위)
+# 행마다 필드를 돌며 float() / pd.isna() 를 호출하던 convert_fields 대신,
+# DataFrame 전체에 대해 한 번에 변환한 뒤 완성된 문서 dict 를 청크 단위로 내보냅니다.
+#
+# 1. COLUMN_MAP 으로 컬럼명 변경 (없는 컬럼은 그대로)
+# 2. 숫자형 필드: pd.to_numeric(errors="coerce") → 빈 값 / 변환 실패는 None, 0 은 유지
+# 3. gi_point: "min~max" 범위 문자열 → {"min", "max"} (parse_gi=True 일 때, 실패 시 원래 값 유지)
+# 4. 그 외 결측치는 ""
+# 5. 원재료 / 안전성 분류 컬럼 → raw_materials 로 묶기
+#
+# 사용:
+#   frame = convert_frame(df)
+#   for doc in iter_documents(frame):
+#       ...
+# ---------------------------------------------------------------
+
+CHUNK_SIZE = 5000
+
+# 컬럼 매핑 딕셔너리
+COLUMN_MAP = {
+    "제품명": "product_name",
+    "업체명": "manufacturer",
+    "식품대분류명": "big_category",
+    "식품소분류명": "category",
+    "에너지(kcal)": "energy_kcal",
+    "단백질(g)": "protein_g",
+    "지방(g)": "fat_g",
+    "탄수화물(g)": "carbs_g",
+    "당류(g)": "sugar_g",
+    "식이섬유(g)": "fiber_g",
+    "칼슘(mg)": "calcium_mg",
+    "철(mg)": "iron_mg",
+    "인(mg)": "phosphorus_mg",
+    "칼륨(mg)": "potassium_mg",
+    "나트륨(mg)": "sodium_mg",
+    "비타민A(μg RAE)": "vitamin_a",
+    "베타카로틴(μg)": "beta_carotene",
+    "티아민(mg)": "thiamine",
+    "리보플라빈(mg)": "riboflavin",
+    "니아신(mg)": "niacin",
+    "비타민 C(mg)": "vitamin_c",
+    "비타민 D(μg)": "vitamin_d",
+    "비오틴(μg)": "biotin",
+    "비타민 B6 / 피리독신(mg)": "vitamin_b6",
+    "비타민 B12(μg)": "vitamin_b12",
+    "엽산(μg DFE)": "folate",
+    "판토텐산(mg)": "pantothenic_acid",
+    "비타민 D3(μg)": "vitamin_d3",
+    "콜레스테롤(mg)": "cholesterol",
+    "포화지방산(g)": "saturated_fatty_acid",
+    "트랜스지방산(g)": "trans_fat",
+    "비타민 E(mg α-TE)": "vitamin_e",
+    "비타민 K(μg)": "vitamin_k",
+    "비타민 K1(μg)": "vitamin_k1",
+    "당알콜(g)": "sugar_alcohol",
+    "알룰로오스(g)": "allulose",
+    "에리스리톨(g)": "erythritol",
+    "불포화지방산(g)": "unsaturated_fat",
+    "EPA와 DHA의 합(mg)": "epa_dha",
+    "리놀레산(18:2(n-6))(g)": "linoleic_acid",
+    "알파 리놀렌산(18:3(n-3))(g)": "alpha_linolenic_acid",
+    "오메가3 지방산(g)": "omega3",
+    "오메가6 지방산(g)": "omega6",
+    "올레산(18:1(n-9))(mg)": "oleic_acid",
+    "구리(μg)": "copper",
+    "마그네슘(mg)": "magnesium",
+    "망간(mg)": "manganese",
+    "몰리브덴(μg)": "molybdenum",
+    "셀레늄(μg)": "selenium",
+    "아연(mg)": "zinc",
+    "염소(mg)": "chloride",
+    "요오드(μg)": "iodine",
+    "크롬(μg)": "chromium",
+    "라이신(mg)": "lysine",
+    "류신(mg)": "leucine",
+    "메티오닌(mg)": "methionine",
+    "발린(mg)": "valine",
+    "아르기닌(mg)": "arginine",
+    "이소류신(mg)": "isoleucine",
+    "타우린(mg)": "taurine",
+    "트레오닌(mg)": "threonine",
+    "트립토판(mg)": "tryptophan",
+    "페닐알라닌(mg)": "phenylalanine",
+    "히스티딘(mg)": "histidine",
+    "원재료명": "ingredients_raw",
+    "안전": "safe",
+    "유의": "caution",
+    "주의": "warning",
+    "그외": "etc",
+    "유통업체명": "distributor",
+    "허가번호": "license_no",
+    "품목보고일자": "report_date",
+    "당지수(GI)": "gi_point",
+    "안전성": "safety_message",
+    "인증" : "zero_certification"
+}
+
+# 숫자형 필드
+NUMERIC_FIELDS = {
+    "energy_kcal", "protein_g", "fat_g", "carbs_g", "sugar_g", "fiber_g",
+    "calcium_mg", "iron_mg", "phosphorus_mg", "potassium_mg", "sodium_mg",
+    "vitamin_a", "beta_carotene", "thiamine", "riboflavin", "niacin",
+    "vitamin_c", "vitamin_d", "biotin", "vitamin_b6", "vitamin_b12", "folate",
+    "pantothenic_acid", "vitamin_d3", "cholesterol", "saturated_fatty_acid",
+    "trans_fat", "vitamin_e", "vitamin_k", "vitamin_k1", "sugar_alcohol",
+    "allulose", "erythritol", "unsaturated_fat", "epa_dha", "linoleic_acid",
+    "alpha_linolenic_acid", "omega3", "omega6", "oleic_acid", "copper",
+    "magnesium", "manganese", "molybdenum", "selenium", "zinc", "chloride",
+    "iodine", "chromium", "lysine", "leucine", "methionine", "valine",
+    "arginine", "isoleucine", "taurine", "threonine", "tryptophan",
+    "phenylalanine", "histidine", "zero_certification"
+}
+
+# raw_materials 로 묶을 필드 (순서 유지)
+RAW_MATERIAL_FIELDS = ("ingredients_raw", "safe", "caution", "warning", "etc")
+
+GI_RANGE = r"^\s*([^~]+?)\s*~\s*([^~]+?)\s*$"
+
+
+def _numeric(column: pd.Series) -> pd.Series:
+    # 정수만 있는 컬럼도 기존 convert_fields 처럼 float 으로 저장
+    values = pd.to_numeric(column, errors="coerce").astype("float64")
+    return values.astype(object).where(values.notna(), None)
+
+
+def _filled(column: pd.Series) -> pd.Series:
+    return column.astype(object).where(column.notna(), "")
+
+
+# "min~max" → {"min": float, "max": float}, 범위가 아니거나 숫자가 아니면 원래 값
+def _gi_ranges(column: pd.Series) -> pd.Series:
+    column = _filled(column)
+    parts = column.astype(str).str.extract(GI_RANGE)
+    low = pd.to_numeric(parts[0], errors="coerce").astype("float64")
+    high = pd.to_numeric(parts[1], errors="coerce").astype("float64")
+    valid = low.notna() & high.notna()
+    if valid.any():
+        column = column.copy()
+        column[valid] = [{"min": lo, "max": hi} for lo, hi in zip(low[valid].tolist(), high[valid].tolist())]
+    return column
+
+
+def convert_frame(df: pd.DataFrame, parse_gi: bool = False, raw_fields=RAW_MATERIAL_FIELDS) -> pd.DataFrame:
+    frame = df.rename(columns=COLUMN_MAP)
+
+    converted = {}
+    for name in frame.columns:
+        column = frame[name]
+        if name in NUMERIC_FIELDS:
+            converted[name] = _numeric(column)
+        elif name == "gi_point" and parse_gi:
+            converted[name] = _gi_ranges(column)
+        else:
+            converted[name] = _filled(column)
+
+    raw_columns = [converted.pop(name, None) for name in raw_fields]
+    raw_columns = [column.tolist() if column is not None else [""] * len(frame) for column in raw_columns]
+    converted["raw_materials"] = pd.Series(
+        [dict(zip(raw_fields, values)) for values in zip(*raw_columns)],
+        index=frame.index,
+        dtype=object,
+    )
+    return pd.DataFrame(converted, index=frame.index)
+
+
+# 완성된 문서 dict 를 청크 단위로 생성 (한 번에 전체 목록을 만들지 않음)
+def iter_documents(frame: pd.DataFrame, chunk_size: int = CHUNK_SIZE):
+    for start in range(0, len(frame), chunk_size):
+        yield from frame.iloc[start:start + chunk_size].to_dict("records")
@@ -0,0 +1,236 @@
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from google.api_core import exceptions as google_exceptions
+
+# ---------------------------------------------------------------
+# 📌 Firestore 일괄 업로더
+# 제품을 한 건씩 doc_ref.set() / .delete() 하지 않고 500개 단위 WriteBatch 로 묶어
+# 여러 스레드에서 동시에 커밋합니다.
+#
+# - 배치 크기: UPLOAD_BATCH_SIZE (기본 500, Firestore 한 배치 최대치)
+# - 동시 커밋 수: UPLOAD_WORKERS (기본 8)
+# - 초당 쓰기 수 제한: UPLOAD_OPS_PER_SEC (기본 500, 5분마다 50%씩 증가 = 500/50/5 규칙, 0 이면 제한 없음)
+# - 일시적 오류 (Aborted / DeadlineExceeded / ResourceExhausted / Unavailable 등) 는 지수 백오프로 재시도
+# - 그 외 오류는 해당 배치만 실패로 기록하고 나머지는 계속 진행 (첫 오류에서 전체 중단하지 않음)
+# - checkpoint_path 를 주면 커밋이 끝난 배치 번호를 기록해 두고,
+#   같은 작업을 다시 실행하면 이미 반영된 배치는 건너뜁니다. 모두 성공하면 체크포인트는 삭제됩니다.
+#
+# 사용:
+#   with BatchUploader(db, "products", checkpoint_path="upload_checkpoint.json", job="update") as uploader:
+#       uploader.set("product_0", doc, merge=True)
+#       uploader.delete("product_123")
+# ---------------------------------------------------------------
+
+BATCH_SIZE = int(os.environ.get("UPLOAD_BATCH_SIZE", 500))
+UPLOAD_WORKERS = int(os.environ.get("UPLOAD_WORKERS", 8))
+OPS_PER_SEC = float(os.environ.get("UPLOAD_OPS_PER_SEC", 500))
+RAMP_SECONDS = 300
+MAX_RETRIES = 5
+BASE_BACKOFF = 1.0
+MAX_BACKOFF = 32.0
+
+RETRYABLE = (
+    google_exceptions.Aborted,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.TooManyRequests,
+    ConnectionError,
+)
+
+
+# 초당 쓰기 수 제한 (시작 속도에서 RAMP_SECONDS 마다 50% 증가)
+class RateLimiter:
+    def __init__(self, ops_per_sec: float):
+        self.base = ops_per_sec
+        self.started = time.monotonic()
+        self.next_at = self.started
+        self.lock = threading.Lock()
+
+    def rate(self) -> float:
+        return self.base * 1.5 ** int((time.monotonic() - self.started) // RAMP_SECONDS)
+
+    def acquire(self, ops: int):
+        if self.base <= 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_at)
+            self.next_at = start + ops / self.rate()
+        if start > now:
+            time.sleep(start - now)
+
+
+# 커밋이 끝난 배치 번호 기록 (임시 파일에 쓴 뒤 교체)
+class Checkpoint:
+    def __init__(self, path, job):
+        self.path = path
+        self.job = job
+        self.done = set()
+        self.lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"⚠️ [업로드] 체크포인트 읽기 실패 → 처음부터 진행: {e}")
+                return
+            if data.get("job") != job:
+                print(f"⚠️ [업로드] 다른 작업의 체크포인트 ({data.get('job')}) → 처음부터 진행")
+                return
+            self.done = set(data.get("done_batches", []))
+            print(f"🔁 [업로드] 체크포인트에서 재개: 배치 {len(self.done)}개 완료됨")
+
+    def mark(self, batch_no: int):
+        if not self.path:
+            return
+        with self.lock:
+            self.done.add(batch_no)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"job": self.job, "done_batches": sorted(self.done)}, f)
+            os.replace(tmp, self.path)
+
+    def clear(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class BatchUploader:
+    def __init__(
+        self,
+        db,
+        collection: str = "products",
+        batch_size: int = BATCH_SIZE,
+        workers: int = UPLOAD_WORKERS,
+        ops_per_sec: float = OPS_PER_SEC,
+        max_retries: int = MAX_RETRIES,
+        checkpoint_path: str = None,
+        job: str = None,
+    ):
+        self.db = db
+        self.collection = db.collection(collection)
+        self.batch_size = min(batch_size, 500)
+        self.max_retries = max_retries
+        self.limiter = RateLimiter(ops_per_sec)
+        self.checkpoint = Checkpoint(checkpoint_path, job or collection)
+
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        # 대기 중인 배치 수 제한 (문서가 메모리에 계속 쌓이지 않도록)
+        self.slots = threading.BoundedSemaphore(workers * 2)
+        self.futures = []
+        self.pending = []
+        self.batch_no = 0
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.stats = {"written": 0, "deleted": 0, "skipped": 0, "retries": 0, "failed": []}
+
+    def set(self, doc_id: str, doc: dict, merge: bool = False):
+        self._add(("set", doc_id, doc, merge))
+
+    def delete(self, doc_id: str):
+        self._add(("delete", doc_id, None, False))
+
+    def _add(self, op):
+        self.pending.append(op)
+        if len(self.pending) >= self.batch_size:
+            self._submit()
+
+    # 배치 번호는 추가 순서로 정해지므로, 같은 입력을 다시 실행하면 같은 번호가 붙습니다.
+    def _submit(self):
+        ops, self.pending = self.pending, []
+        batch_no = self.batch_no
+        self.batch_no += 1
+        if not ops:
+            return
+        if batch_no in self.checkpoint.done:
+            self.stats["skipped"] += len(ops)
+            return
+
+        self.slots.acquire()
+        future = self.executor.submit(self._commit, batch_no, ops)
+        future.add_done_callback(lambda _: self.slots.release())
+        self.futures.append(future)
+
+    def _commit(self, batch_no: int, ops: list):
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(len(ops))
+            batch = self.db.batch()
+            for kind, doc_id, doc, merge in ops:
+                ref = self.collection.document(doc_id)
+                if kind == "set":
+                    batch.set(ref, doc, merge=merge)
+                else:
+                    batch.delete(ref)
+            try:
+                batch.commit()
+                break
+            except RETRYABLE as e:
+                if attempt == self.max_retries:
+                    self._fail(batch_no, ops, e)
+                    return
+                delay = min(MAX_BACKOFF, BASE_BACKOFF * 2 ** attempt) * random.uniform(0.5, 1.0)
+                with self.lock:
+                    self.stats["retries"] += 1
+                print(f"⚠️ [업로드] 배치 {batch_no} 재시도 {attempt + 1}/{self.max_retries} ({delay:.1f}초 후): {e}")
+                time.sleep(delay)
+            except Exception as e:
+                self._fail(batch_no, ops, e)
+                return
+
+        self.checkpoint.mark(batch_no)
+        deleted = sum(1 for op in ops if op[0] == "delete")
+        with self.lock:
+            self.stats["deleted"] += deleted
+            self.stats["written"] += len(ops) - deleted
+            done = self.stats["written"] + self.stats["deleted"]
+        if (batch_no + 1) % 10 == 0:
+            print(f"📤 [업로드] {done}건 반영 ({time.perf_counter() - self.started:.1f}초)")
+
+    def _fail(self, batch_no: int, ops: list, error: Exception):
+        print(f"❌ [업로드] 배치 {batch_no} 실패 ({ops[0][1]} ~ {ops[-1][1]}): {error}")
+        with self.lock:
+            self.stats["failed"].append({
+                "batch": batch_no,
+                "first": ops[0][1],
+                "last": ops[-1][1],
+                "error": str(error),
+            })
+
+    # 남은 작업을 커밋하고 진행 중인 배치가 끝날 때까지 대기
+    def close(self, interrupted: bool = False):
+        if not interrupted:
+            self._submit()
+        else:
+            # 중단 시 아직 시작하지 않은 배치는 취소 (체크포인트에 없으므로 다음 실행에서 다시 커밋)
+            for future in self.futures:
+                future.cancel()
+        wait(self.futures)
+        self.executor.shutdown()
+
+        stats = self.stats
+        elapsed = time.perf_counter() - self.started
+        print(
+            f"✅ [업로드] 쓰기 {stats['written']}건 / 삭제 {stats['deleted']}건 / 건너뜀 {stats['skipped']}건 / "
+            f"재시도 {stats['retries']}회 / 실패 배치 {len(stats['failed'])}개 ({elapsed:.1f}초)"
+        )
+        if not interrupted and not stats["failed"]:
+            self.checkpoint.clear()
+        elif self.checkpoint.path:
+            print(f"🔁 [업로드] 다시 실행하면 {self.checkpoint.path} 에서 이어서 진행합니다.")
+        return stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is KeyboardInterrupt:
+            print("\n[사용자 중단] 진행 중인 배치를 마무리합니다.")
+        self.close(interrupted=exc_type is not None)
+        return False
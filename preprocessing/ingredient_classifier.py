@@ -0,0 +1,175 @@
+import argparse
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# ---------------------------------------------------------------
+# 📌 원재료 안전성 분류기
+# 노트북의 categorize_ingredients / categorize_with_info 는 행마다 원재료명을 나눈 뒤
+# 원재료 조각마다 any(k in p for k in keywords) 로 키워드 목록 전체를 훑었습니다.
+# 원재료 문자열은 제품 사이에 대부분 반복되므로, 고유 원재료 조각 단위로 한 번만 판정해 기억하고
+# 키워드 목록은 분류(안전 / 유의 / 주의)마다 하나의 정규식(키워드 OR 결합)으로 컴파일합니다.
+#
+# - 라벨 CSV (원재료명 + 혈당영향): 키워드가 원재료 조각에 포함되면 해당 분류 (안전 > 유의 > 주의 순)
+# - ingredients_info.csv (원재료명 + 혈당지수(GI) + 안전성): 원재료 조각과 정확히 같으면 안전성 값(그외 포함) + 정보 문자열
+#   (둘 다 주면 정확히 일치하는 정보가 우선)
+# - 어디에도 해당하지 않으면 그외
+# - 큰 DataFrame 은 청크로 나눠 프로세스 풀에서 분류 (workers=0 이면 현재 프로세스에서 실행)
+#
+# 실행:
+#   python ingredient_classifier.py input.csv output.csv --labels "ingrediant_label(Ver 2.0).csv" --workers 4
+# ---------------------------------------------------------------
+
+LABELS = ("안전", "유의", "주의")
+OTHER = "그외"
+CATEGORIES = LABELS + (OTHER,)
+CHUNK_SIZE = 50000
+CLASSIFY_WORKERS = int(os.environ.get("CLASSIFY_WORKERS", os.cpu_count() or 1))
+
+
+def _keyword_pattern(keywords):
+    keywords = sorted({k.strip() for k in keywords if isinstance(k, str) and k.strip()}, key=len, reverse=True)
+    if not keywords:
+        return None
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+class IngredientClassifier:
+    def __init__(self, keywords: dict = None, info: dict = None):
+        # 분류 → 키워드 목록 (우선순위 순서)
+        self.patterns = [
+            (label, pattern)
+            for label in LABELS
+            if (pattern := _keyword_pattern((keywords or {}).get(label, ()))) is not None
+        ]
+        # 원재료명 → {"혈당지수(GI)", "안전성"}
+        self.info = info
+        self.cache = {}
+
+    # 원재료 조각 하나 → (분류, 정보 문자열), 고유 조각마다 한 번만 계산
+    def label(self, part: str):
+        cached = self.cache.get(part)
+        if cached is not None:
+            return cached
+
+        info = self.info.get(part) if self.info else None
+        if info:
+            # 정보가 있으면 안전성 값 그대로 분류 (그외 포함, 알 수 없는 값은 그외)
+            label = info.get("안전성") if info.get("안전성") in CATEGORIES else OTHER
+            result = (label, f"{part}(GI:{info['혈당지수(GI)']}, 안전성:{info['안전성']})")
+        else:
+            label = next((label for label, pattern in self.patterns if pattern.search(part)), OTHER)
+            result = (label, part)
+        self.cache[part] = result
+        return result
+
+    # 원재료명 문자열 → {"안전": "...", "유의": "...", "주의": "...", "그외": "..."} (+ 정보 컬럼)
+    def classify(self, ingredients) -> dict:
+        grouped = {category: [] for category in CATEGORIES}
+        details = {category: [] for category in CATEGORIES}
+        if isinstance(ingredients, str):
+            for part in ingredients.split(","):
+                part = part.strip()
+                if not part:
+                    continue
+                label, detail = self.label(part)
+                grouped[label].append(part)
+                details[label].append(detail)
+
+        result = {category: ", ".join(parts) for category, parts in grouped.items()}
+        if self.info is not None:
+            result.update({f"{category}_정보": ", ".join(parts) for category, parts in details.items()})
+        return result
+
+    def columns(self) -> list[str]:
+        columns = list(CATEGORIES)
+        if self.info is not None:
+            columns += [f"{category}_정보" for category in CATEGORIES]
+        return columns
+
+    def classify_values(self, values) -> dict:
+        columns = {column: [] for column in self.columns()}
+        for value in values:
+            for column, text in self.classify(value).items():
+                columns[column].append(text)
+        return columns
+
+
+def load_label_keywords(path: str, encoding: str = "cp949") -> dict:
+    label_df = pd.read_csv(path, encoding=encoding).dropna(how="all", axis=0)
+    return {
+        label: label_df.loc[label_df["혈당영향"] == label, "원재료명"].dropna().tolist()
+        for label in LABELS
+    }
+
+
+def load_ingredient_info(path: str, encoding: str = "utf-8-sig") -> dict:
+    info_df = pd.read_csv(path, encoding=encoding)
+    info_df = info_df.drop_duplicates("원재료명", keep="last")
+    return info_df.set_index("원재료명").to_dict(orient="index")
+
+
+# ---------------------------------------------------------------
+# 프로세스 풀 (청크 단위)
+# ---------------------------------------------------------------
+
+_worker_classifier = None
+
+
+def _init_worker(classifier: IngredientClassifier):
+    global _worker_classifier
+    _worker_classifier = classifier
+
+
+def _classify_chunk(values):
+    return _worker_classifier.classify_values(values)
+
+
+def classify_series(
+    classifier: IngredientClassifier,
+    series: pd.Series,
+    workers: int = CLASSIFY_WORKERS,
+    chunk_size: int = CHUNK_SIZE,
+) -> pd.DataFrame:
+    values = series.tolist()
+    chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+
+    if workers <= 1 or len(chunks) <= 1:
+        results = [classifier.classify_values(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(classifier,)) as executor:
+            results = list(executor.map(_classify_chunk, chunks))
+
+    columns = {column: [] for column in classifier.columns()}
+    for result in results:
+        for column, texts in result.items():
+            columns[column].extend(texts)
+    return pd.DataFrame(columns, index=series.index)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="원재료명 → 안전 / 유의 / 주의 / 그외 분류")
+    parser.add_argument("input", help="원재료명 컬럼이 있는 CSV")
+    parser.add_argument("output", help="분류 컬럼을 추가해 저장할 CSV")
+    parser.add_argument("--labels", help="라벨 CSV (원재료명, 혈당영향)")
+    parser.add_argument("--labels-encoding", default="cp949")
+    parser.add_argument("--info", help="ingredients_info.csv (원재료명, 혈당지수(GI), 안전성)")
+    parser.add_argument("--column", default="원재료명")
+    parser.add_argument("--workers", type=int, default=CLASSIFY_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if not args.labels and not args.info:
+        parser.error("--labels 또는 --info 중 하나는 필요합니다.")
+
+    classifier = IngredientClassifier(
+        keywords=load_label_keywords(args.labels, args.labels_encoding) if args.labels else None,
+        info=load_ingredient_info(args.info) if args.info else None,
+    )
+    df = pd.read_csv(args.input, encoding="utf-8-sig")
+    categorized = classify_series(classifier, df[args.column], args.workers, args.chunk_size)
+    df[categorized.columns] = categorized
+    df.to_csv(args.output, index=False, encoding="utf-8-sig")
+    print(f"✅ {len(df)}개 제품 원재료 분류 완료 → {args.output}")
@@ -0,0 +1,253 @@
+import argparse
+import glob
+import json
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------------------
+# 📌 식품안전 원본 CSV 19개 → 정제 · 중복 제거 → 파티션 Parquet
+# 노트북처럼 파일 전체를 메모리에 올리고 pd.concat 을 반복하지 않고,
+# 원본 파일(shard)마다 read_csv(chunksize) 로 나눠 읽어 청크 단위로 정제합니다.
+#
+# 1단계 (shard 단위 병렬, shard 별 재실행 가능)
+#   - 결측 행 제거, 원재료명 쉼표 수 > MIN_COMMAS (원재료 5개 이하 제거)
+#   - 제품명 '액' 포함 제거 (단 '액젓' 은 유지, 액(?!젓))
+#   - 원재료명 '알킬' 포함 제거, 제품명 제외 키워드 (효소 / 베이스 / 향료 ...) 포함 제거
+#   - --strict: 정제 노트북의 추가 제외 키워드 (콜라겐 / 루테인 / 맥주효모 ...) + 동물성가공식품류
+#   - 품목보고일자 숫자 변환 후 청크 안에서 제품명별 최신 행만 유지
+#   → {out}/shards/shard=NN/part-NNNNN.parquet (+ _SUCCESS), 이미 완료된 shard 는 건너뜀 (--force 로 다시 실행)
+#
+# 2단계 (전체 중복 제거)
+#   - 모든 파티션에서 제품명 / 품목보고일자 두 컬럼만 읽어 제품명별 최신 행을 고른 뒤
+#   - 선택된 행만 {out}/dedup/shard=NN/part-NNNNN.parquet 로 다시 씀
+#   - 품목보고일자가 같으면 앞선 shard / 행이 남습니다.
+#
+# 실행:
+#   python shard_ingest.py --input-dir ./output_data --out-dir ./ingested --workers 4 [--shards 3,5] [--csv merged.csv]
+# ---------------------------------------------------------------
+
+SHARD_COUNT = 19
+SHARD_ROWS = 50000
+CHUNK_SIZE = 20000
+MIN_COMMAS = 4
+INGEST_WORKERS = min(os.cpu_count() or 1, 4)
+
+LIQUID_PATTERN = r"액(?!젓)"
+EXCLUDE_KEYWORDS = ["효소", "베이스", "향료", "추출", "분말", "색소", "혼합", "복합"]
+EXCLUDE_INGREDIENTS = ["알킬"]
+STRICT_EXCLUDE_KEYWORDS = [
+    "막걸리향", "새로단", "리포좀", "글루타치온", "환", "병품", "히알루론산", "멜라토닌", "밀크씨슬", "향료", "덴탈",
+    "난각막", "구강", "락토페린", "저분자", "콘드로이친", "글리칸", "이노시톨", "연골", "수출용", "모닝파파", "레티놀",
+    "콜라겐", "아연", "여성유산균", "두피", "엔자임", "루테인", "오메가", "맥주효모", "비오틴",
+]
+STRICT_EXCLUDE_BIG_CATEGORIES = ["동물성가공식품류"]
+
+
+def _union(keywords) -> str:
+    return "|".join(map(re.escape, keywords))
+
+
+def shard_path(input_dir: str, shard: int) -> str:
+    return os.path.join(input_dir, f"식품안전_{shard}_{SHARD_ROWS * shard}.csv")
+
+
+def shard_dir(out_dir: str, stage: str, shard: int) -> str:
+    return os.path.join(out_dir, stage, f"shard={shard:02d}")
+
+
+# 제품명별 품목보고일자가 가장 최신인 행 (같으면 먼저 나온 행, 원래 순서 유지)
+def latest_per_product(df: pd.DataFrame) -> pd.DataFrame:
+    latest = df.sort_values("품목보고일자", ascending=False, kind="mergesort", na_position="last")
+    return latest.drop_duplicates(subset="제품명", keep="first").sort_index()
+
+
+def clean_chunk(chunk: pd.DataFrame, min_commas: int = MIN_COMMAS, strict: bool = False) -> pd.DataFrame:
+    chunk = chunk.dropna()
+    names = chunk["제품명"]
+    ingredients = chunk["원재료명"]
+
+    keep = ingredients.str.count(",") > min_commas
+    keep &= ~names.str.contains(LIQUID_PATTERN, flags=re.IGNORECASE, regex=True, na=False)
+    keep &= ~ingredients.str.contains(_union(EXCLUDE_INGREDIENTS), na=False)
+    keep &= ~names.str.contains(_union(EXCLUDE_KEYWORDS), na=False)
+    if strict:
+        keep &= ~names.str.contains(_union(STRICT_EXCLUDE_KEYWORDS), case=False, na=False)
+        if "식품대분류명" in chunk.columns:
+            keep &= ~chunk["식품대분류명"].str.contains(_union(STRICT_EXCLUDE_BIG_CATEGORIES), na=False)
+
+    chunk = chunk[keep].copy()
+    chunk["품목보고일자"] = pd.to_numeric(chunk["품목보고일자"], errors="coerce").astype("float64")
+    return latest_per_product(chunk)
+
+
+def _replace_dir(staging: str, final: str):
+    if os.path.exists(final):
+        shutil.rmtree(final)
+    os.rename(staging, final)
+
+
+# ---------------------------------------------------------------
+# 1단계: shard 하나 정제
+# ---------------------------------------------------------------
+
+def ingest_shard(shard: int, input_dir: str, out_dir: str, chunk_size: int = CHUNK_SIZE,
+                 min_commas: int = MIN_COMMAS, strict: bool = False, force: bool = False) -> dict:
+    final = shard_dir(out_dir, "shards", shard)
+    marker = os.path.join(final, "_SUCCESS")
+    if os.path.exists(marker) and not force:
+        with open(marker, encoding="utf-8") as f:
+            stats = json.load(f)
+        print(f"⏭️ [shard {shard}] 이미 완료 → 건너뜀 ({stats['rows_out']}행)")
+        return stats
+
+    path = shard_path(input_dir, shard)
+    if not os.path.exists(path):
+        print(f"⚠️ [shard {shard}] 파일 없음: {path}")
+        return {"shard": shard, "rows_in": 0, "rows_out": 0, "parts": 0, "missing": True}
+
+    os.makedirs(os.path.dirname(final), exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".shard={shard:02d}-", dir=os.path.dirname(final))
+    stats = {"shard": shard, "rows_in": 0, "rows_out": 0, "parts": 0}
+    try:
+        reader = pd.read_csv(path, encoding="utf-8-sig", dtype=str, chunksize=chunk_size)
+        for chunk in reader:
+            stats["rows_in"] += len(chunk)
+            cleaned = clean_chunk(chunk, min_commas, strict)
+            if cleaned.empty:
+                continue
+            cleaned.to_parquet(os.path.join(staging, f"part-{stats['parts']:05d}.parquet"), index=False)
+            stats["rows_out"] += len(cleaned)
+            stats["parts"] += 1
+
+        with open(os.path.join(staging, "_SUCCESS"), "w", encoding="utf-8") as f:
+            json.dump(stats, f)
+        _replace_dir(staging, final)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    print(f"✅ [shard {shard}] {stats['rows_in']}행 → {stats['rows_out']}행 ({stats['parts']}개 파티션)")
+    return stats
+
+
+def _ingest_shard_task(args):
+    return ingest_shard(*args)
+
+
+# ---------------------------------------------------------------
+# 2단계: 전체 중복 제거
+# ---------------------------------------------------------------
+
+def _write_selected(args):
+    source, rows, target = args
+    df = pd.read_parquet(source)
+    df.iloc[rows].to_parquet(target, index=False)
+    return len(rows)
+
+
+def dedup_shards(out_dir: str, workers: int = INGEST_WORKERS) -> int:
+    parts = sorted(glob.glob(os.path.join(out_dir, "shards", "shard=*", "part-*.parquet")))
+    if not parts:
+        print("⚠️ [중복 제거] 정제된 파티션 없음")
+        return 0
+
+    # 키 컬럼만 읽어 한 번에 결합
+    keys = []
+    for index, path in enumerate(parts):
+        key = pd.read_parquet(path, columns=["제품명", "품목보고일자"])
+        key["_part"] = index
+        key["_row"] = np.arange(len(key))
+        keys.append(key)
+    keys = pd.concat(keys, ignore_index=True)
+    winners = latest_per_product(keys)
+
+    staging = tempfile.mkdtemp(prefix=".dedup-", dir=out_dir)
+    tasks = []
+    for index, rows in winners.groupby("_part")["_row"]:
+        source = parts[index]
+        target_dir = os.path.join(staging, os.path.basename(os.path.dirname(source)))
+        os.makedirs(target_dir, exist_ok=True)
+        tasks.append((source, np.sort(rows.to_numpy()), os.path.join(target_dir, os.path.basename(source))))
+
+    try:
+        if workers <= 1:
+            total = sum(map(_write_selected, tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                total = sum(executor.map(_write_selected, tasks))
+        _replace_dir(staging, os.path.join(out_dir, "dedup"))
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    print(f"✅ [중복 제거] {len(keys)}행 → {total}행")
+    return total
+
+
+# 중복 제거 결과를 CSV 한 파일로 (파티션 순서대로 이어 쓰기)
+def export_csv(out_dir: str, csv_path: str):
+    parts = sorted(glob.glob(os.path.join(out_dir, "dedup", "shard=*", "part-*.parquet")))
+    rows = 0
+    with open(csv_path, "w", encoding="utf-8-sig", newline="") as f:
+        for index, path in enumerate(parts):
+            df = pd.read_parquet(path)
+            df.to_csv(f, header=index == 0, index=False)
+            rows += len(df)
+    print(f"✅ [CSV] {rows}행 저장 → {csv_path}")
+
+
+def parse_shards(value: str) -> list[int]:
+    shards = set()
+    for token in value.split(","):
+        if "-" in token:
+            start, end = token.split("-")
+            shards.update(range(int(start), int(end) + 1))
+        elif token.strip():
+            shards.add(int(token))
+    return sorted(shards)
+
+
+def run(input_dir: str, out_dir: str, shards: list[int], workers: int = INGEST_WORKERS,
+        chunk_size: int = CHUNK_SIZE, min_commas: int = MIN_COMMAS, strict: bool = False,
+        force: bool = False, dedup: bool = True, csv_path: str = None):
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [(shard, input_dir, out_dir, chunk_size, min_commas, strict, force) for shard in shards]
+    if workers <= 1:
+        stats = [_ingest_shard_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            stats = list(executor.map(_ingest_shard_task, tasks))
+
+    print(f"📦 정제 완료: {sum(s['rows_in'] for s in stats)}행 → {sum(s['rows_out'] for s in stats)}행")
+    if dedup:
+        dedup_shards(out_dir, workers)
+        if csv_path:
+            export_csv(out_dir, csv_path)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="식품안전 원본 CSV 정제 → 파티션 Parquet")
+    parser.add_argument("--input-dir", required=True, help="식품안전_{i}_{50000*i}.csv 가 있는 디렉터리")
+    parser.add_argument("--out-dir", required=True)
+    parser.add_argument("--shards", default=f"1-{SHARD_COUNT}", help="처리할 shard 번호 (예: 1-19, 3,5)")
+    parser.add_argument("--workers", type=int, default=INGEST_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--min-commas", type=int, default=MIN_COMMAS, help="원재료명 쉼표 수가 이 값보다 커야 유지")
+    parser.add_argument("--strict", action="store_true", help="정제 노트북의 추가 제외 키워드 / 대분류 적용")
+    parser.add_argument("--force", action="store_true", help="완료된 shard 도 다시 정제")
+    parser.add_argument("--skip-dedup", action="store_true", help="2단계 전체 중복 제거 생략")
+    parser.add_argument("--csv", help="중복 제거 결과를 CSV 로도 저장할 경로")
+    args = parser.parse_args()
+
+    run(
+        args.input_dir, args.out_dir, parse_shards(args.shards),
+        workers=args.workers, chunk_size=args.chunk_size, min_commas=args.min_commas,
+        strict=args.strict, force=args.force, dedup=not args.skip_dedup, csv_path=args.csv,
+    )
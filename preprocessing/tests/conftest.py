@@ -0,0 +1,5 @@
+import os
+import sys
+
+# preprocessing 스크립트 모듈 (document_builder 등) 을 최상위 모듈로 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
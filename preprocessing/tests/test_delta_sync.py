@@ -0,0 +1,20 @@
+from delta_sync import content_job, doc_hash, plan_delta
+
+
+def test_content_job_changes_with_content_not_only_row_count():
+    before = {"product_0": doc_hash({"product_name": "콜라", "energy_kcal": 100.0})}
+    edited = {"product_0": doc_hash({"product_name": "콜라", "energy_kcal": 90.0})}
+    assert content_job("update", before) == content_job("update", dict(before))
+    assert content_job("update", before) != content_job("update", edited)
+    assert content_job("update", before) != content_job("non_image", before)
+
+
+def test_doc_hash_ignores_updated_at():
+    doc = {"product_name": "콜라", "raw_materials": {"safe": "정제수"}}
+    assert doc_hash(doc) == doc_hash({**doc, "updated_at": "2024-01-01"})
+
+
+def test_plan_delta():
+    local = {"product_0": "a", "product_1": "b", "product_2": "c"}
+    remote = {"product_0": "a", "product_1": "x", "product_9": "z"}
+    assert plan_delta(local, remote) == (["product_2"], ["product_1"], ["product_9"])
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from document_builder import COLUMN_MAP, NUMERIC_FIELDS, RAW_MATERIAL_FIELDS, convert_frame, iter_documents
+
+
+# 기존 DB_upload(update).py 의 행 단위 변환
+def legacy_convert_fields(doc):
+    for field, value in doc.items():
+        if field in NUMERIC_FIELDS:
+            try:
+                if value == "" or pd.isna(value):
+                    doc[field] = None
+                else:
+                    doc[field] = float(value)
+            except (ValueError, TypeError):
+                doc[field] = None
+    return doc
+
+
+def legacy_documents(df):
+    docs = []
+    for _, row in df.iterrows():
+        doc = {COLUMN_MAP.get(k, k): (v if pd.notna(v) else "") for k, v in row.items()}
+        doc = legacy_convert_fields(doc)
+        doc["raw_materials"] = {field: doc.pop(field, "") for field in RAW_MATERIAL_FIELDS}
+        docs.append(doc)
+    return docs
+
+
+# 기존 DB_upload(non_image).py 의 gi_point 범위 파싱
+def legacy_gi(value):
+    if isinstance(value, str) and "~" in value:
+        try:
+            min_val, max_val = value.split("~")
+            return {"min": float(min_val.strip()), "max": float(max_val.strip())}
+        except Exception:
+            return value
+    return value
+
+
+def typed(value):
+    if isinstance(value, dict):
+        return {k: typed(v) for k, v in value.items()}
+    return (type(value).__name__, value)
+
+
+def sample_frame():
+    return pd.DataFrame({
+        "제품명": ["콜라", None, "사이다", "라면"],
+        "에너지(kcal)": [100, 0, 250, 80],
+        "당류(g)": [" 12", "", "abc", "0"],
+        "나트륨(mg)": [1.5, np.nan, 3.0, 0.0],
+        "인증": [1, 0, 1, 0],
+        "원재료명": ["정제수, 설탕", None, "물엿", "밀가루"],
+        "안전": ["정제수", "", None, "밀가루"],
+        "주의": [None, None, "물엿", None],
+        "당지수(GI)": ["40~55", "70", np.nan, "1~2~3"],
+        "품목보고일자": [20200101, 20210101, 20220101, 20230101],
+        "extra": [1.5, np.nan, 2.0, 0.5],
+    })
+
+
+def test_convert_frame_matches_legacy_documents_and_types():
+    df = sample_frame()
+    expected = legacy_documents(df)
+    actual = list(iter_documents(convert_frame(df), chunk_size=3))
+
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected):
+        assert typed(got) == typed(want)
+
+
+def test_integer_numeric_columns_become_floats():
+    doc = next(iter_documents(convert_frame(sample_frame())))
+    assert type(doc["energy_kcal"]) is float and doc["energy_kcal"] == 100.0
+    assert type(doc["zero_certification"]) is float and doc["zero_certification"] == 1.0
+
+
+def test_gi_ranges_match_legacy_parsing():
+    df = sample_frame()
+    docs = list(iter_documents(convert_frame(df, parse_gi=True)))
+    expected = [legacy_gi(v if pd.notna(v) else "") for v in df["당지수(GI)"]]
+    assert [typed(doc["gi_point"]) for doc in docs] == [typed(v) for v in expected]
+
+
+def test_raw_fields_subset_keeps_other_columns_top_level():
+    doc = next(iter_documents(convert_frame(sample_frame(), raw_fields=("safe", "caution", "warning", "etc"))))
+    assert doc["ingredients_raw"] == "정제수, 설탕"
+    assert doc["raw_materials"] == {"safe": "정제수", "caution": "", "warning": "", "etc": ""}
+
+
+def test_gi_ranges_are_floats_when_every_row_is_a_range():
+    df = pd.DataFrame({"당지수(GI)": ["40~55", "10 ~ 20"]})
+    docs = list(iter_documents(convert_frame(df, parse_gi=True)))
+    assert [typed(doc["gi_point"]) for doc in docs] == [
+        typed({"min": 40.0, "max": 55.0}),
+        typed({"min": 10.0, "max": 20.0}),
+    ]
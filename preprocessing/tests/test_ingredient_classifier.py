@@ -0,0 +1,50 @@
+import pandas as pd
+
+from ingredient_classifier import IngredientClassifier, classify_series
+
+INFO = {
+    "정제수": {"혈당지수(GI)": 0, "안전성": "안전"},
+    "백설탕": {"혈당지수(GI)": 65, "안전성": "유의"},
+    "감미료": {"혈당지수(GI)": "", "안전성": "그외"},
+}
+
+
+# 노트북 categorize_with_info 와 같은 정확 일치 분류
+def legacy_categorize_with_info(ingredients, info_dict):
+    parts = [p.strip() for p in str(ingredients).split(",")]
+    categorized = {key: [] for key in ("안전", "유의", "주의", "그외", "안전_정보", "유의_정보", "주의_정보", "그외_정보")}
+    for p in parts:
+        info = info_dict.get(p)
+        label = info["안전성"] if info else "그외"
+        categorized[label].append(p)
+        categorized[f"{label}_정보"].append(f"{p}(GI:{info['혈당지수(GI)']}, 안전성:{info['안전성']})" if info else p)
+    return {key: ", ".join(values) for key, values in categorized.items()}
+
+
+def test_info_rows_keep_label_and_detail_including_other():
+    classifier = IngredientClassifier(info=INFO)
+    value = "정제수, 백설탕, 감미료, 소금"
+    assert classifier.classify(value) == legacy_categorize_with_info(value, INFO)
+
+
+def test_info_other_row_is_not_reclassified_by_keyword():
+    classifier = IngredientClassifier(keywords={"주의": ["감미"]}, info=INFO)
+    result = classifier.classify("감미료, 감미제")
+    assert result["그외"] == "감미료"
+    assert result["그외_정보"] == "감미료(GI:, 안전성:그외)"
+    assert result["주의"] == "감미제"
+
+
+def test_keyword_priority_matches_notebook():
+    classifier = IngredientClassifier(keywords={"안전": ["정제수"], "유의": ["설탕"], "주의": ["설탕", "아스파탐"]})
+    result = classifier.classify("정제수, 백설탕, 아스파탐, 소금, ")
+    assert result == {"안전": "정제수", "유의": "백설탕", "주의": "아스파탐", "그외": "소금"}
+
+
+def test_classify_series_pool_matches_inline():
+    classifier = IngredientClassifier(keywords={"유의": ["설탕"]}, info=INFO)
+    series = pd.Series(["정제수, 백설탕", "감미료", None, "설탕, 소금"] * 50)
+    inline = classify_series(classifier, series, workers=0, chunk_size=30)
+    pooled = classify_series(classifier, series, workers=2, chunk_size=30)
+    assert inline.equals(pooled)
+    assert inline.loc[1, "그외_정보"] == "감미료(GI:, 안전성:그외)"